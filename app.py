@@ -1,28 +1,108 @@
+import mimetypes
 import os
-from datetime import date, datetime, timezone
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Iterator
+from urllib.parse import urlencode
 
-import requests
 from dotenv import load_dotenv
-from flask import Flask, redirect, render_template
-
+from flask import (
+    Flask,
+    Response,
+    abort,
+    g,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    stream_template,
+    stream_with_context,
+)
+
+from src.sitegen import metrics, profiling
+from src.sitegen.assets import IMMUTABLE_CACHE_CONTROL, asset_url_function, collect_assets
 from src.sitegen.cache import get_or_fetch
-from src.sitegen.dates import DayRange, get_day_ranges
+from src.sitegen.dates import DayRange, day_range_for_date, get_day_ranges
+from src.sitegen.image_proxy import DIGEST_LENGTH as IMAGE_DIGEST_LENGTH
+from src.sitegen.image_proxy import ImageProxy, ImageStore, session_fetcher
+from src.sitegen.index import FACETS, MatchIndex
+from src.sitegen.live import LiveFeed, sse_message
 from src.sitegen.normalize import normalize_match
+from src.sitegen.pandascore import PandaScoreClient, build_session, day_cache_key, day_params, is_network_error
+from src.sitegen.prefetch import Prefetcher
+from src.sitegen.schedule import RefreshSchedule
+from src.sitegen.search import build_search_index, dumps_search_index
+from src.sitegen.streaming import coalesce
+
+if TYPE_CHECKING:
+    from src.sitegen.history import HistoryStore
 
 BASE_DIR = Path(__file__).resolve().parent
 load_dotenv(dotenv_path=BASE_DIR / ".env")
+profiling.configure_from_env()
 
-API_BASE = "https://api.pandascore.co"
-API_TIMEOUT_SECONDS = 15
+API_BASE = os.getenv("PANDASCORE_BASE_URL", "https://api.pandascore.co").rstrip("/")
+API_CONNECT_TIMEOUT_SECONDS = float(os.getenv("API_CONNECT_TIMEOUT_SECONDS", "3"))
+API_TIMEOUT_SECONDS = float(os.getenv("API_TIMEOUT_SECONDS", "15"))
 APP_CACHE_TTL_SECONDS = int(os.getenv("APP_CACHE_TTL_SECONDS", "90"))
+# Expired entries younger than TTL + this are served while a background refresh runs.
+APP_STALE_TTL_SECONDS = int(os.getenv("APP_STALE_TTL_SECONDS", "600"))
+APP_HTTP_POOL_SIZE = int(os.getenv("APP_HTTP_POOL_SIZE", "32"))
+APP_PAGE_WORKERS = int(os.getenv("APP_PAGE_WORKERS", "4"))
+APP_REFRESH_WORKERS = int(os.getenv("APP_REFRESH_WORKERS", "4"))
 DAY_MODE = os.getenv("DAY_MODE", "utc")
 TZ_NAME = os.getenv("TZ_NAME", "UTC")
 SITE_URL = os.getenv("SITE_URL", "http://127.0.0.1:5000").rstrip("/")
+APP_PREFETCH = os.getenv("APP_PREFETCH", "0").strip().lower() in {"1", "true", "yes", "y", "on"}
+# Prefetched pages are refreshed this many seconds before their cache TTL runs out.
+APP_PREFETCH_LEAD_SECONDS = int(os.getenv("APP_PREFETCH_LEAD_SECONDS", "15"))
+# The next day's pages are warmed this many seconds before the day boundary.
+APP_PREFETCH_ROLLOVER_SECONDS = int(os.getenv("APP_PREFETCH_ROLLOVER_SECONDS", "300"))
+# One upstream poll of today's matches per interval feeds every live subscriber.
+APP_LIVE_POLL_SECONDS = int(os.getenv("APP_LIVE_POLL_SECONDS", "15"))
+APP_LIVE_HEARTBEAT_SECONDS = int(os.getenv("APP_LIVE_HEARTBEAT_SECONDS", "20"))
+# Each open /today/live stream holds a worker thread (or greenlet): at most this
+# many per process, each closed after APP_LIVE_STREAM_SECONDS so clients reconnect.
+APP_LIVE_MAX_STREAMS = int(os.getenv("APP_LIVE_MAX_STREAMS", "16"))
+APP_LIVE_STREAM_SECONDS = int(os.getenv("APP_LIVE_STREAM_SECONDS", "300"))
+# Clients turned away at the cap try again after this long.
+APP_LIVE_BUSY_RETRY_SECONDS = int(os.getenv("APP_LIVE_BUSY_RETRY_SECONDS", "60"))
+# Team logos are proxied through /img/<digest> from a bounded disk cache.
+APP_IMAGE_PROXY = os.getenv("APP_IMAGE_PROXY", "1").strip().lower() in {"1", "true", "yes", "y", "on"}
+APP_IMAGE_CACHE_DIR = Path(os.getenv("APP_IMAGE_CACHE_DIR", ".cache/img").strip())
+APP_IMAGE_CACHE_MAX_MB = int(os.getenv("APP_IMAGE_CACHE_MAX_MB", "256"))
+APP_IMAGE_MAX_AGE_SECONDS = int(os.getenv("APP_IMAGE_MAX_AGE_SECONDS", str(30 * 24 * 3600)))
+HISTORY_ENABLED = os.getenv("HISTORY_ENABLED", "1").strip().lower() in {"1", "true", "yes", "y", "on"}
+HISTORY_DIR = Path(os.getenv("HISTORY_DIR", ".cache/history").strip())
+APP_ARCHIVE_MAX_AGE_SECONDS = int(os.getenv("APP_ARCHIVE_MAX_AGE_SECONDS", "3600"))
+APP_MINIFY_ASSETS = os.getenv("APP_MINIFY_ASSETS", "1").strip().lower() in {"1", "true", "yes", "y", "on"}
+
+DAY_ENDPOINTS = {
+    "yesterday": "matches/past",
+    "today": "matches",
+    "tomorrow": "matches/upcoming",
+}
+# /matches/past and /matches/upcoming are status subsets of /matches. Filtering
+# the full day locally lets every page (and the static builder) share one
+# cache entry per UTC day instead of one per endpoint.
+ENDPOINT_STATUSES: dict[str, frozenset[str] | None] = {
+    "matches": None,
+    "matches/past": frozenset({"finished", "canceled", "cancelled"}),
+    "matches/upcoming": frozenset({"not_started"}),
+}
 
 app = Flask(__name__)
-HTTP = requests.Session()
+
+# static/ is fingerprinted once at startup; templates link the hashed names
+# through asset_url() and /assets/ serves them as immutable.
+STATIC_ASSETS = collect_assets(Path(app.static_folder or BASE_DIR / "static"), minify=APP_MINIFY_ASSETS)
+_ASSETS_BY_HASHED_NAME = {asset.hashed_name: asset for asset in STATIC_ASSETS.values()}
+_asset_url = asset_url_function({name: asset.hashed_name for name, asset in STATIC_ASSETS.items()}, "/assets")
+# Upstream refreshes run here, off the request threads.
+REFRESH_POOL = ThreadPoolExecutor(max_workers=APP_REFRESH_WORKERS, thread_name_prefix="upstream-refresh")
 
 
 RU_MONTHS_GEN = {
@@ -56,19 +136,89 @@ def get_token() -> str | None:
     return token or None
 
 
-def fetch_matches(endpoint: str, date_utc: datetime) -> dict[str, Any]:
+_CLIENTS: dict[str, PandaScoreClient] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def get_client(token: str) -> PandaScoreClient:
+    """Shared client per token, so all request threads reuse one connection pool."""
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(token)
+        if client is None:
+            _CLIENTS.clear()
+            client = PandaScoreClient(
+                token,
+                base_url=API_BASE,
+                max_workers=APP_PAGE_WORKERS,
+                pool_size=APP_HTTP_POOL_SIZE,
+                timeout=(API_CONNECT_TIMEOUT_SECONDS, API_TIMEOUT_SECONDS),
+            )
+            _CLIENTS[token] = client
+        return client
+
+
+_HISTORY: "HistoryStore | None" = None
+_HISTORY_LOCK = threading.Lock()
+
+
+def get_history() -> "HistoryStore | None":
+    """The match history shared with the static builder, or None when HISTORY_ENABLED is off."""
+    global _HISTORY
+    if not HISTORY_ENABLED:
+        return None
+    with _HISTORY_LOCK:
+        if _HISTORY is None:
+            from src.sitegen.history import HistoryStore
+
+            _HISTORY = HistoryStore(HISTORY_DIR)
+        return _HISTORY
+
+
+def _record_history(day: date, fresh: Any) -> None:
+    """Cache on_refresh hook: keep every fetched UTC day in the match history."""
+    history = get_history()
+    if history is not None and isinstance(fresh, list):
+        from src.sitegen.history import record_fetched_day
+
+        record_fetched_day(history, day, [normalize_match(item if isinstance(item, dict) else {}) for item in fresh])
+
+
+def fetch_matches(
+    endpoint: str,
+    date_utc: datetime,
+    ttl_seconds: int | None = None,
+    stale_ttl_seconds: int = APP_STALE_TTL_SECONDS,
+    executor: Executor | None = REFRESH_POOL,
+) -> dict[str, Any]:
+    """
+    Normalized matches of the UTC day of date_utc for endpoint.
+
+    Request handlers get an expired entry back at once while it refreshes on
+    executor (stale_ttl_seconds); background callers that publish or
+    pre-render the result pass stale_ttl_seconds=0 and executor=None to
+    fetch synchronously instead.
+    """
     token = get_token()
-    date_str = date_utc.strftime("%Y-%m-%d")
-
-    url = f"{API_BASE}/{endpoint}"
-    params = {
-        "filter[begin_at]": date_str,
-        "sort": "begin_at",
-        "page[size]": 50,
-        "page[number]": 1,
-    }
-    req = requests.Request("GET", url, params=params)
-    prepared = req.prepare()
+    day = date_utc.date()
+
+    source_url = f"{API_BASE}/matches?{urlencode(day_params(day))}"
+    statuses = ENDPOINT_STATUSES.get(endpoint)
+
+    # Final days are served from the match history and never refetched.
+    history = get_history()
+    archived = None
+    if history is not None:
+        from src.sitegen.history import may_be_final
+
+        if may_be_final(day):
+            archived = history.final_day(day)
+    if archived is not None:
+        metrics.inc("sitegen_history_requests_total", result="hit")
+        return {
+            "items": [m for m in archived if statuses is None or str(m.get("status") or "").lower() in statuses],
+            "error": None,
+            "source_url": source_url,
+        }
 
     if not token:
         return {
@@ -77,70 +227,99 @@ def fetch_matches(endpoint: str, date_utc: datetime) -> dict[str, Any]:
                 "PANDASCORE_TOKEN не задан. Добавьте токен в переменную среды "
                 "или .env и перезапустите сервер."
             ),
-            "source_url": prepared.url,
+            "source_url": source_url,
         }
 
-    headers = {
-        "Accept": "application/json",
-        "Authorization": f"Bearer {token}",
-    }
-
-    def do_fetch() -> list[dict[str, Any]]:
-        response = HTTP.get(
-            url,
-            params=params,
-            headers=headers,
-            timeout=API_TIMEOUT_SECONDS,
-        )
-        if response.status_code >= 400:
-            raise RuntimeError(f"{response.status_code}: {response.text[:200]}")
-        try:
-            payload = response.json()
-        except ValueError as exc:
-            raise RuntimeError("Invalid JSON in API response") from exc
-        if not isinstance(payload, list):
-            raise RuntimeError("Unexpected response shape, expected list")
-        return payload
-
     try:
         payload, _ = get_or_fetch(
-            url=prepared.url,
-            headers=headers,
-            ttl_seconds=APP_CACHE_TTL_SECONDS,
-            fetcher_callable=do_fetch,
+            url=source_url,
+            headers={"Accept": "application/json"},
+            ttl_seconds=APP_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds,
+            fetcher_callable=lambda: get_client(token).fetch_day(day),
+            stale_ttl_seconds=stale_ttl_seconds,
+            executor=executor,
+            cache_key=day_cache_key(day),
+            stale_if_error=True,
+            on_refresh=lambda _previous, fresh: _record_history(day, fresh),
         )
-    except requests.RequestException as exc:
-        return {
-            "items": [],
-            "error": f"Network error: {exc}",
-            "source_url": prepared.url,
-        }
     except Exception as exc:
         return {
             "items": [],
-            "error": str(exc),
-            "source_url": prepared.url,
+            "error": f"Network error: {exc}" if is_network_error(exc) else str(exc),
+            "source_url": source_url,
         }
 
-    normalized = [normalize_match(item) for item in payload]
+    with metrics.timer("sitegen_app_stage_seconds", stage="normalize"):
+        normalized = [
+            normalize_match(item)
+            for item in payload
+            if statuses is None or str(item.get("status") or "").lower() in statuses
+        ]
+    metrics.inc("sitegen_normalized_matches_total", len(normalized), page=endpoint)
     return {
         "items": normalized,
         "error": None,
-        "source_url": prepared.url,
+        "source_url": source_url,
     }
 
 
-def get_day_range_by_slug(slug: str) -> DayRange:
-    ranges = get_day_ranges(DAY_MODE, TZ_NAME)
+def get_day_range_by_slug(slug: str, now_utc: datetime | None = None) -> DayRange:
+    ranges = get_day_ranges(DAY_MODE, TZ_NAME, now_utc=now_utc)
     for item in ranges:
         if item.slug == slug:
             return item
     raise ValueError(f"Unsupported day slug: {slug}")
 
 
-def build_page_data(slug: str, endpoint: str) -> dict[str, Any]:
-    day_range = get_day_range_by_slug(slug)
-    result = fetch_matches(endpoint, day_range.start_dt_utc)
+def build_page_data(
+    slug: str,
+    endpoint: str,
+    now_utc: datetime | None = None,
+    ttl_seconds: int | None = None,
+    filters: dict[str, str] | None = None,
+) -> dict[str, Any]:
+    day_range = get_day_range_by_slug(slug, now_utc=now_utc)
+    result = fetch_matches(endpoint, day_range.start_dt_utc, ttl_seconds=ttl_seconds)
+    return day_page_data(day_range, result, endpoint, filters)
+
+
+def build_archive_page_data(day_str: str, filters: dict[str, str] | None = None) -> dict[str, Any] | None:
+    """
+    Page data for /archive/<YYYY-MM-DD>/, read from the match history only.
+
+    The day is a DAY_MODE day like the other pages. None when the date is
+    malformed or the history holds none of its UTC days; archive pages never
+    reach the API.
+    """
+    try:
+        day = date.fromisoformat(day_str)
+    except ValueError:
+        return None
+    history = get_history()
+    if history is None or day.isoformat() != day_str:
+        return None
+    day_range = day_range_for_date(day, DAY_MODE, TZ_NAME, slug=f"archive/{day_str}", label_ru="Архив")
+    utc_days = PandaScoreClient.utc_days(day_range.start_dt_utc, day_range.end_dt_utc)
+    if all(history.day(utc_day) is None for utc_day in utc_days):
+        return None
+    metrics.inc("sitegen_history_requests_total", result="archive")
+    result = {
+        "items": history.matches_between(day_range.start_dt_utc, day_range.end_dt_utc),
+        "error": None,
+        "source_url": "",
+    }
+    return day_page_data(day_range, result, "archive", filters)
+
+
+def day_page_data(
+    day_range: DayRange,
+    result: dict[str, Any],
+    endpoint: str,
+    filters: dict[str, str] | None = None,
+) -> dict[str, Any]:
+    """Template context of a day page from fetch_matches()-shaped result."""
+    index = MatchIndex.build(result["items"])
+    filters = filters or {}
 
     return {
         "slug": day_range.slug,
@@ -153,7 +332,12 @@ def build_page_data(slug: str, endpoint: str) -> dict[str, Any]:
         "day_mode": DAY_MODE,
         "tz_name": TZ_NAME,
         "endpoint": endpoint,
-        "matches": result["items"],
+        "matches": index.query(**filters),
+        "filters": filters,
+        "games": [
+            {"key": key, "label": label, "count": count, "url": f"/{day_range.slug}/?game={key}"}
+            for key, label, count in index.facet("game")
+        ],
         "error": result["error"],
         "source_url": result["source_url"],
         "updated_at": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC"),
@@ -168,6 +352,331 @@ def build_page_data(slug: str, endpoint: str) -> dict[str, Any]:
     }
 
 
+# Pages rendered by the prefetcher: (slug, range_start_utc) -> html.
+_RENDERED_PAGES: dict[tuple[str, str], str] = {}
+_RENDERED_LOCK = threading.Lock()
+_PREWARMED_BOUNDARY: dict[str, str] = {}
+PREFETCHER: Prefetcher | None = None
+
+
+def _prefetch_max_age() -> int:
+    return max(1, APP_CACHE_TTL_SECONDS - APP_PREFETCH_LEAD_SECONDS)
+
+
+def prefetch_page(slug: str, now_utc: datetime | None = None) -> None:
+    # Refresh synchronously: a stale payload would be rendered and kept for a whole interval.
+    day_range = get_day_range_by_slug(slug, now_utc=now_utc)
+    endpoint = DAY_ENDPOINTS[slug]
+    result = fetch_matches(
+        endpoint, day_range.start_dt_utc, ttl_seconds=_prefetch_max_age(), stale_ttl_seconds=0, executor=None
+    )
+    page = day_page_data(day_range, result, endpoint)
+    with app.test_request_context(f"/{slug}/", base_url=SITE_URL):
+        html = render_template("day.html", page=page)
+    with _RENDERED_LOCK:
+        _RENDERED_PAGES[(slug, page["range_start_utc"])] = html
+
+
+def _prefetch_tick() -> None:
+    now = datetime.now(timezone.utc)
+    boundary = get_day_range_by_slug("today", now_utc=now).end_dt_utc
+    after_boundary = boundary + timedelta(seconds=1)
+
+    if (boundary - now).total_seconds() <= APP_PREFETCH_ROLLOVER_SECONDS:
+        if _PREWARMED_BOUNDARY.get("last") != boundary.isoformat():
+            for slug in DAY_ENDPOINTS:
+                prefetch_page(slug, now_utc=after_boundary)
+            _PREWARMED_BOUNDARY["last"] = boundary.isoformat()
+
+    live_keys = {
+        (dr.slug, dr.start_dt_utc.isoformat())
+        for moment in (now, after_boundary)
+        for dr in get_day_ranges(DAY_MODE, TZ_NAME, now_utc=moment)
+    }
+    with _RENDERED_LOCK:
+        for key in [k for k in _RENDERED_PAGES if k not in live_keys]:
+            del _RENDERED_PAGES[key]
+
+
+def start_prefetcher() -> Prefetcher:
+    global PREFETCHER
+    if PREFETCHER is None:
+        interval = _prefetch_max_age()
+        PREFETCHER = Prefetcher(
+            RefreshSchedule({slug: interval for slug in DAY_ENDPOINTS}),
+            refresh=prefetch_page,
+            on_tick=_prefetch_tick,
+            name="page-prefetcher",
+        )
+        PREFETCHER.start()
+    return PREFETCHER
+
+
+LIVE_FEED = LiveFeed()
+LIVE_POLLER: Prefetcher | None = None
+_LIVE_POLLER_LOCK = threading.Lock()
+_LIVE_STREAM_SLOTS = threading.BoundedSemaphore(max(1, APP_LIVE_MAX_STREAMS))
+
+
+def poll_live(_key: str = "today") -> None:
+    """Fetch today's matches once and publish running-match changes to every subscriber."""
+    day_range = get_day_range_by_slug("today")
+    # Refresh synchronously, so each poll publishes what it fetched rather than the previous poll's data.
+    result = fetch_matches(
+        DAY_ENDPOINTS["today"],
+        day_range.start_dt_utc,
+        ttl_seconds=max(1, APP_LIVE_POLL_SECONDS - 1),
+        stale_ttl_seconds=0,
+        executor=None,
+    )
+    if result["error"] is None:
+        LIVE_FEED.publish(result["items"])
+
+
+def start_live_poller() -> Prefetcher:
+    """Start the shared upstream poller on first use."""
+    global LIVE_POLLER
+    with _LIVE_POLLER_LOCK:
+        if LIVE_POLLER is None:
+            LIVE_POLLER = Prefetcher(
+                RefreshSchedule({"today": APP_LIVE_POLL_SECONDS}),
+                refresh=poll_live,
+                name="live-poller",
+            )
+            LIVE_POLLER.start()
+    return LIVE_POLLER
+
+
+def _last_seq() -> int | None:
+    raw = request.headers.get("Last-Event-ID") or request.args.get("after") or ""
+    return int(raw) if raw.strip().isdigit() else None
+
+
+@app.route("/today/live")
+def live_events():
+    """
+    Server-sent events with only the changed live fields of running matches.
+
+    A new connection starts with a snapshot; reconnects send Last-Event-ID
+    (or ?after=) and resume from there. Each connection holds a worker for
+    up to APP_LIVE_STREAM_SECONDS, so serve the app from an async worker
+    (e.g. gunicorn -k gevent): with sync or threaded workers every open tab
+    takes a thread away from page requests. Past APP_LIVE_MAX_STREAMS open
+    streams in this process, clients get 503 with a retry hint instead.
+    """
+    start_live_poller()
+    if not _LIVE_STREAM_SLOTS.acquire(blocking=False):
+        metrics.inc("sitegen_live_streams_rejected_total")
+        response = Response(
+            f"retry: {APP_LIVE_BUSY_RETRY_SECONDS * 1000}\n\n", status=503, mimetype="text/event-stream"
+        )
+        response.headers["Retry-After"] = str(APP_LIVE_BUSY_RETRY_SECONDS)
+        response.headers["Cache-Control"] = "no-store"
+        return response
+    after = _last_seq()
+
+    def stream():
+        last = after
+        deadline = time.monotonic() + APP_LIVE_STREAM_SECONDS
+        yield "retry: 5000\n\n"
+        if last is None:
+            snapshot = LIVE_FEED.snapshot()
+            last = snapshot["seq"]
+            yield sse_message(snapshot)
+        # Ends after a bounded lifetime; the client reconnects with Last-Event-ID.
+        while (remaining := deadline - time.monotonic()) > 0:
+            events = LIVE_FEED.wait(last, timeout=min(APP_LIVE_HEARTBEAT_SECONDS, remaining))
+            if not events:
+                yield ": ping\n\n"
+                continue
+            for event in events:
+                last = event["seq"]
+                yield sse_message(event)
+
+    response = Response(stream_with_context(stream()), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    # Released when the server closes the response, even if the stream never started.
+    response.call_on_close(_LIVE_STREAM_SLOTS.release)
+    return response
+
+
+@app.context_processor
+def _live_settings() -> dict[str, Any]:
+    return {"live_busy_retry_seconds": APP_LIVE_BUSY_RETRY_SECONDS}
+
+
+@app.route("/today/live.json")
+def live_poll():
+    """Long-poll fallback: events after ?after=<seq>, waiting up to the heartbeat interval."""
+    start_live_poller()
+    after = _last_seq()
+    if after is None:
+        return jsonify(events=[LIVE_FEED.snapshot()])
+    return jsonify(events=LIVE_FEED.wait(after, timeout=APP_LIVE_HEARTBEAT_SECONDS))
+
+
+def request_filters() -> dict[str, str]:
+    """Index filters from the query string, e.g. /today/?game=cs2&team=navi."""
+    return {facet: value for facet in FACETS if (value := request.args.get(facet, "").strip())}
+
+
+def stream_day_page(page: dict[str, Any]) -> Response:
+    """
+    Stream the rendered day page, flushing the head and first cards before the rest is rendered.
+
+    The render timer covers the whole stream, since rendering happens while
+    the response is being sent.
+    """
+
+    # stream_template binds the request context now; iteration happens later.
+    rendered = stream_template("day.html", page=page)
+
+    def chunks() -> Iterator[str]:
+        with metrics.timer("sitegen_app_stage_seconds", stage="render"):
+            yield from coalesce(rendered)
+
+    return Response(chunks(), mimetype="text/html")
+
+
+def render_day_page(slug: str):
+    filters = request_filters()
+    if filters:
+        return stream_day_page(build_page_data(slug, DAY_ENDPOINTS[slug], filters=filters))
+    if PREFETCHER is not None:
+        day_range = get_day_range_by_slug(slug)
+        with _RENDERED_LOCK:
+            html = _RENDERED_PAGES.get((slug, day_range.start_dt_utc.isoformat()))
+        if html is not None:
+            return html
+    # Cold start (or prefetch disabled): fall back to fetching inline.
+    return stream_day_page(build_page_data(slug, DAY_ENDPOINTS[slug]))
+
+
+@app.before_request
+def _start_request_timer() -> None:
+    g.request_started = time.perf_counter()
+    if profiling.sample_request():
+        section = profiling.section(f"request.{request.endpoint or 'unknown'}")
+        section.__enter__()
+        g.profile_section = section
+
+
+@app.after_request
+def _record_request_metrics(response: Response) -> Response:
+    started = g.pop("request_started", None)
+    if started is None:
+        return response
+    endpoint = request.endpoint or "unknown"
+    status = response.status_code
+
+    # Streamed pages render while the body is sent, after this hook returns,
+    # so latency is taken when the server closes the response.
+    def observe() -> None:
+        metrics.observe("sitegen_app_request_seconds", time.perf_counter() - started, endpoint=endpoint, status=status)
+
+    response.call_on_close(observe)
+    return response
+
+
+@app.teardown_request
+def _finish_request_profile(exc: BaseException | None) -> None:
+    section = g.pop("profile_section", None)
+    if section is not None:
+        section.__exit__(None, None, None)
+
+
+def search_index_response(page: dict[str, Any], max_age: int) -> Response:
+    response = Response(dumps_search_index(build_search_index(page["matches"])), mimetype="application/json")
+    response.headers["Cache-Control"] = f"public, max-age={max_age}"
+    return response
+
+
+@app.route("/<slug>/search.json")
+def search_index(slug: str):
+    if slug not in DAY_ENDPOINTS:
+        abort(404)
+    page = build_page_data(slug, DAY_ENDPOINTS[slug], filters=request_filters())
+    return search_index_response(page, APP_CACHE_TTL_SECONDS)
+
+
+@app.route("/archive/<day>/")
+def archive_page(day: str):
+    page = build_archive_page_data(day, filters=request_filters())
+    if page is None:
+        abort(404)
+    response = stream_day_page(page)
+    response.headers["Cache-Control"] = f"public, max-age={APP_ARCHIVE_MAX_AGE_SECONDS}"
+    return response
+
+
+@app.route("/archive/<day>/search.json")
+def archive_search_index(day: str):
+    page = build_archive_page_data(day, filters=request_filters())
+    if page is None:
+        abort(404)
+    return search_index_response(page, APP_ARCHIVE_MAX_AGE_SECONDS)
+
+
+_IMAGE_PROXY: ImageProxy | None = None
+_IMAGE_PROXY_LOCK = threading.Lock()
+
+
+def get_image_proxy() -> ImageProxy:
+    global _IMAGE_PROXY
+    with _IMAGE_PROXY_LOCK:
+        if _IMAGE_PROXY is None:
+            _IMAGE_PROXY = ImageProxy(
+                ImageStore(APP_IMAGE_CACHE_DIR, APP_IMAGE_CACHE_MAX_MB * 1024 * 1024),
+                session_fetcher(
+                    build_session(APP_HTTP_POOL_SIZE),
+                    timeout=(API_CONNECT_TIMEOUT_SECONDS, API_TIMEOUT_SECONDS),
+                ),
+            )
+        return _IMAGE_PROXY
+
+
+def image_url(url: str | None) -> str:
+    """Template helper: /img/<digest> for an upstream image, registered so the proxy may fetch it."""
+    src = (url or "").strip()
+    if not APP_IMAGE_PROXY or not src.startswith(("https://", "http://")):
+        return src
+    return f"/img/{get_image_proxy().register(src)}"
+
+
+@app.context_processor
+def _asset_helpers() -> dict[str, Any]:
+    return {"asset_url": _asset_url, "image_url": image_url}
+
+
+@app.route("/img/<digest>")
+def proxied_image(digest: str):
+    if not APP_IMAGE_PROXY or len(digest) != IMAGE_DIGEST_LENGTH:
+        abort(404)
+    image = get_image_proxy().get(digest)
+    if image is None:
+        abort(404)
+    response = Response(image.content, mimetype=image.content_type)
+    response.set_etag(image.etag.strip('"'))
+    response.headers["Cache-Control"] = f"public, max-age={APP_IMAGE_MAX_AGE_SECONDS}"
+    return response.make_conditional(request)
+
+
+@app.route("/assets/<path:filename>")
+def hashed_asset(filename: str):
+    asset = _ASSETS_BY_HASHED_NAME.get(filename)
+    if asset is None:
+        abort(404)
+    response = Response(asset.content, mimetype=mimetypes.guess_type(filename)[0] or "application/octet-stream")
+    response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+    return response
+
+
+@app.route("/metrics")
+def metrics_page():
+    return Response(metrics.REGISTRY.render_prometheus(), mimetype="text/plain; version=0.0.4")
+
+
 @app.route("/")
 def home():
     return redirect("/today/", code=302)
@@ -175,20 +684,21 @@ def home():
 
 @app.route("/yesterday/")
 def yesterday_page():
-    page = build_page_data("yesterday", "matches/past")
-    return render_template("day.html", page=page)
+    return render_day_page("yesterday")
 
 
 @app.route("/today/")
 def today_page():
-    page = build_page_data("today", "matches")
-    return render_template("day.html", page=page)
+    return render_day_page("today")
 
 
 @app.route("/tomorrow/")
 def tomorrow_page():
-    page = build_page_data("tomorrow", "matches/upcoming")
-    return render_template("day.html", page=page)
+    return render_day_page("tomorrow")
+
+
+if APP_PREFETCH:
+    start_prefetcher()
 
 
 if __name__ == "__main__":
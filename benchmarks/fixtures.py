@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import copy
+import json
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+
+# Raw PandaScore responses recorded by the file cache backend.
+RECORDED_DIR = Path(__file__).resolve().parent.parent / ".cache" / "http"
+
+_DATE_FIELDS = ("begin_at", "end_at", "scheduled_at", "original_scheduled_at")
+
+
+def load_recorded_matches(directory: Path = RECORDED_DIR) -> list[dict[str, Any]]:
+    """All recorded matches, deduplicated by id and sorted by begin_at."""
+    by_id: dict[Any, dict[str, Any]] = {}
+    for path in sorted(directory.glob("*.json")):
+        if path.name.endswith(".meta.json"):
+            continue
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        if not isinstance(payload, list):
+            continue
+        for item in payload:
+            if isinstance(item, dict):
+                by_id[item.get("id")] = item
+    if not by_id:
+        raise RuntimeError(f"No recorded PandaScore payloads found in {directory}")
+    return sorted(by_id.values(), key=lambda m: m.get("begin_at") or "")
+
+
+def rebase_to_day(matches: list[dict[str, Any]], day: date) -> list[dict[str, Any]]:
+    """Deep copies of matches with the date part of their timestamps moved to day."""
+    out = copy.deepcopy(matches)
+    day_str = day.isoformat()
+    for match in out:
+        for field in _DATE_FIELDS:
+            value = match.get(field)
+            if isinstance(value, str) and len(value) >= 10:
+                match[field] = day_str + value[10:]
+    return out
+
+
+class RecordedDaySource:
+    """Serve the recorded match set for any requested UTC day."""
+
+    def __init__(self, matches: list[dict[str, Any]] | None = None) -> None:
+        self.matches = matches if matches is not None else load_recorded_matches()
+        self._by_day: dict[date, list[dict[str, Any]]] = {}
+
+    def __call__(self, day: date) -> list[dict[str, Any]]:
+        if day not in self._by_day:
+            self._by_day[day] = rebase_to_day(self.matches, day)
+        return self._by_day[day]
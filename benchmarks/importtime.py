@@ -0,0 +1,102 @@
+"""
+Cold-start import budget for the build CLI and the web app.
+
+Each entry point is imported in a fresh interpreter under `python -X
+importtime`; the best cumulative time of --runs runs is compared with
+benchmarks/import_budget.json, and modules that must stay lazy (HTTP
+client, Jinja, image downloads) are checked to be absent after import.
+
+    python -m benchmarks.importtime             # check against the budget
+    python -m benchmarks.importtime --verbose   # also list the slowest imports
+
+Exits with status 1 when a budget is exceeded or a lazy module was loaded.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BUDGET_PATH = Path(__file__).resolve().parent / "import_budget.json"
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def import_profile(module: str) -> tuple[dict[str, tuple[int, int]], set[str]]:
+    """
+    Import module in a fresh interpreter.
+
+    Returns {name: (self_us, cumulative_us)} for every module it imported,
+    plus the full set of sys.modules afterwards.
+    """
+    code = f"import sys, json, {module}; sys.stdout.write(json.dumps(sorted(sys.modules)))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings: dict[str, tuple[int, int]] = {}
+    for line in result.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            timings[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return timings, set(json.loads(result.stdout))
+
+
+def check(module: str, budget: dict, runs: int, verbose: bool) -> list[str]:
+    best_ms = float("inf")
+    loaded: set[str] = set()
+    slowest: list[tuple[int, str]] = []
+    for _ in range(runs):
+        timings, loaded = import_profile(module)
+        cumulative_ms = timings.get(module, (0, 0))[1] / 1000
+        if cumulative_ms < best_ms:
+            best_ms = cumulative_ms
+            slowest = sorted(((self_us, name) for name, (self_us, _cum) in timings.items()), reverse=True)[:15]
+
+    limit = float(budget["budget_ms"])
+    print(f"{module:24s} {best_ms:8.1f} ms (budget {limit:.0f} ms)")
+    if verbose:
+        for self_us, name in slowest:
+            print(f"    {self_us / 1000:7.1f} ms  {name}")
+
+    problems = []
+    if best_ms > limit:
+        problems.append(f"{module}: import takes {best_ms:.1f} ms, budget is {limit:.0f} ms")
+    for name in budget.get("lazy", []):
+        if name in loaded:
+            problems.append(f"{module}: imports {name}, which should only load on first use")
+    return problems
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Check entry point import time against the budget.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=Path, default=BUDGET_PATH)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    budgets = json.loads(args.budget.read_text(encoding="utf-8"))
+    problems: list[str] = []
+    for module, budget in budgets.items():
+        problems.extend(check(module, budget, args.runs, args.verbose))
+
+    if problems:
+        print("Import budget exceeded:")
+        for line in problems:
+            print(f"  {line}")
+        return 1
+    print("Import budget OK.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,288 @@
+"""
+Offline benchmark suite replaying recorded PandaScore payloads.
+
+Every network call goes to a local stub server (benchmarks.stub_server) that
+serves the matches recorded in .cache/http with PandaScore's pagination
+headers, configurable latency and injected 429 responses, so runs are
+reproducible without a token or network access.
+
+Usage (from the repository root):
+
+    python -m benchmarks.run                    # compare with benchmarks/baseline.json
+    python -m benchmarks.run --update-baseline  # record a new baseline
+    python -m benchmarks.run --latency-ms 50 --rate-limit-every 7 --output out.json
+    python -m benchmarks.run --synthetic-per-day 5000 --output big.json
+
+--synthetic-per-day replaces the recorded matches with generated ones
+(benchmarks.synthetic); see benchmarks.scale for time and memory curves.
+
+Metrics ending in _seconds are lower-is-better, metrics ending in
+_per_second are higher-is-better. Each timing is the best of --repeat runs.
+The process exits with status 1 when any metric is worse than the baseline
+by more than --tolerance. Baselines are machine-specific: record one on the
+machine that runs the comparison.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+from benchmarks.fixtures import RecordedDaySource
+from benchmarks.stub_server import DaySource, StubConfig, StubPandaScoreServer
+from benchmarks.synthetic import SyntheticDaySource
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+BENCH_TOKEN = "benchmark-token"
+
+
+def _best_of(repeat: int, fn: Callable[[], Any]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _fresh_cache(directory: Path) -> None:
+    from src.sitegen import cache
+    from src.sitegen.cache_backends import FileCacheBackend
+
+    cache.set_backend(FileCacheBackend(directory))
+
+
+def bench_normalize(raw: list[dict[str, Any]], repeat: int) -> dict[str, float]:
+    from src.sitegen.normalize import normalize_match
+
+    rounds = max(1, 20_000 // len(raw))
+
+    def run() -> None:
+        for _ in range(rounds):
+            for item in raw:
+                normalize_match(item)
+
+    seconds = _best_of(repeat, run)
+    return {"normalize_matches_per_second": rounds * len(raw) / seconds}
+
+
+def bench_fetch(server: StubPandaScoreServer, repeat: int) -> dict[str, float]:
+    from src.sitegen.pandascore import PandaScoreClient
+
+    client = PandaScoreClient(BENCH_TOKEN, base_url=server.base_url)
+    day = date(2026, 2, 20)
+    counts: list[int] = []
+
+    def run() -> None:
+        counts.append(len(client.fetch_day(day)))
+
+    seconds = _best_of(repeat, run)
+    return {
+        "fetch_day_seconds": seconds,
+        "fetch_matches_per_second": counts[-1] / seconds,
+    }
+
+
+def _build_config(workdir: Path, base_url: str) -> Any:
+    from src.sitegen.build import BuildConfig
+
+    dist_dir = workdir / "dist"
+    return BuildConfig(
+        site_url="https://bench.example",
+        pandascore_token=BENCH_TOKEN,
+        pandascore_base_url=base_url,
+        day_mode="utc",
+        tz_name="UTC",
+        cache_ttl_seconds=120,
+        dist_dir=dist_dir,
+        template_dir=REPO_ROOT / "src" / "templates",
+        template_name="day.html.j2",
+        assets_src_dir=REPO_ROOT / "public" / "assets",
+        assets_out_dir=dist_dir / "assets",
+        assets_img_out_dir=dist_dir / "assets" / "img",
+        org_name="Esports Matches",
+        download_images=False,
+        state_path=workdir / "build" / "state.json",
+        report_path=workdir / "build" / "report.json",
+    )
+
+
+def bench_render(server: StubPandaScoreServer, source: DaySource, workdir: Path, repeat: int) -> dict[str, float]:
+    from src.sitegen.build import _normalize_all, _render_day, create_context
+    from src.sitegen.dates import get_day_ranges
+
+    ctx = create_context(_build_config(workdir / "render", server.base_url))
+    dr = get_day_ranges("utc", "UTC")[1]
+    normalized = _normalize_all(source(dr.start_dt_utc.date()))
+    seconds = _best_of(repeat, lambda: _render_day(ctx, dr, normalized))
+    return {"render_day_seconds": seconds}
+
+
+def bench_build(server: StubPandaScoreServer, workdir: Path, repeat: int) -> dict[str, float]:
+    from src.sitegen import metrics
+    from src.sitegen.build import build_site, create_context
+
+    runs = iter(range(repeat))
+
+    def run() -> None:
+        # Cold build: empty HTTP cache, no previous state or output.
+        n = next(runs)
+        cfg = _build_config(workdir / f"build-{n}", server.base_url)
+        _fresh_cache(workdir / f"build-{n}" / "http")
+        metrics.REGISTRY.reset()
+        build_site(create_context(cfg))
+
+    return {"build_site_cold_seconds": _best_of(repeat, run)}
+
+
+def bench_flask(workdir: Path, requests_per_run: int, repeat: int) -> dict[str, float]:
+    # app.py reads its configuration at import time.
+    import app as web
+
+    client = web.app.test_client()
+    runs = iter(range(repeat))
+
+    def cold() -> None:
+        _fresh_cache(workdir / f"flask-{next(runs)}")
+        response = client.get("/today/")
+        if response.status_code != 200:
+            raise RuntimeError(f"/today/ returned {response.status_code}")
+
+    def warm() -> None:
+        for _ in range(requests_per_run):
+            client.get("/today/")
+
+    cold_seconds = _best_of(repeat, cold)
+    warm_seconds = _best_of(repeat, warm)
+    return {
+        "flask_today_cold_seconds": cold_seconds,
+        "flask_today_warm_seconds": warm_seconds / requests_per_run,
+    }
+
+
+def run_suite(args: argparse.Namespace) -> dict[str, Any]:
+    stub_config = StubConfig(
+        latency_seconds=args.latency_ms / 1000.0,
+        rate_limit_every=args.rate_limit_every,
+        max_page_size=args.page_size,
+    )
+    source: DaySource
+    if args.synthetic_per_day:
+        source = SyntheticDaySource(args.synthetic_per_day)
+    else:
+        source = RecordedDaySource()
+    sample = source(date.today())
+    results: dict[str, float] = {}
+
+    with StubPandaScoreServer(source, stub_config) as server, tempfile.TemporaryDirectory(prefix="sitegen-bench-") as tmp:
+        workdir = Path(tmp)
+        os.environ["PANDASCORE_TOKEN"] = BENCH_TOKEN
+        os.environ["PANDASCORE_BASE_URL"] = server.base_url
+        os.environ["APP_PREFETCH"] = "0"
+        # Keep the app's image proxy registrations out of the real .cache/img.
+        os.environ["APP_IMAGE_CACHE_DIR"] = str(workdir / "img")
+        # Synthetic matches must never reach the real match history.
+        os.environ["HISTORY_ENABLED"] = "0"
+
+        results.update(bench_normalize(sample, args.repeat))
+        _fresh_cache(workdir / "fetch")
+        results.update(bench_fetch(server, args.repeat))
+        results.update(bench_render(server, source, workdir, args.repeat))
+        results.update(bench_build(server, workdir, args.repeat))
+        results.update(bench_flask(workdir, args.requests, args.repeat))
+        stub_requests = server.request_count
+        stub_429s = server.rate_limited_count
+
+    return {
+        "generated_at_utc": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "settings": {
+            "latency_ms": args.latency_ms,
+            "rate_limit_every": args.rate_limit_every,
+            "page_size": args.page_size,
+            "repeat": args.repeat,
+            "source": "synthetic" if args.synthetic_per_day else "recorded",
+            "matches_per_day": len(sample),
+        },
+        "stub": {"requests": stub_requests, "rate_limited": stub_429s},
+        "results": results,
+    }
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], tolerance: float) -> list[str]:
+    """Human-readable regressions of results against baseline beyond tolerance."""
+    regressions: list[str] = []
+    for name, base in sorted(baseline.items()):
+        value = results.get(name)
+        if value is None or base <= 0:
+            continue
+        if name.endswith("_per_second"):
+            worse = value < base * (1 - tolerance)
+        else:
+            worse = value > base * (1 + tolerance)
+        if worse:
+            regressions.append(f"{name}: {value:.6g} vs baseline {base:.6g}")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--requests", type=int, default=50, help="Flask requests per warm run")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="stub latency per request")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="answer every Nth request with 429")
+    parser.add_argument("--page-size", type=int, default=100, help="stub maximum page size")
+    parser.add_argument("--synthetic-per-day", type=int, default=0, help="serve N generated matches per day")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(message)s")
+    report = run_suite(args)
+
+    for name, value in sorted(report["results"].items()):
+        print(f"{name:32s} {value:12.6g}")
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --update-baseline first.")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    if baseline.get("settings") != report["settings"]:
+        print("Warning: baseline was recorded with different settings; comparison may be meaningless.")
+    regressions = compare(report["results"], baseline.get("results", {}), args.tolerance)
+    if regressions:
+        print("Regressions:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"No regressions beyond {args.tolerance:.0%} of baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""
+Time and memory curves of the per-day pipeline over growing synthetic days.
+
+For each size a single day of generated matches goes through normalize,
+sort and the streamed day template written to a scratch file, i.e. what
+build_day does after the fetch. Reports seconds per stage, microseconds per match (flat means
+linear) and the tracemalloc peak of each stage.
+
+    python -m benchmarks.scale --sizes 10000,50000,100000 --output curve.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+from benchmarks.synthetic import generate_day
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _measure(fn: Callable[[], Any]) -> tuple[Any, float, int]:
+    """Run fn once for wall time, then again under tracemalloc (which slows it) for peak memory."""
+    started = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - started
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, seconds, peak
+
+
+def measure_size(size: int, template: Any, day: date, out_file: Path) -> dict[str, Any]:
+    from src.sitegen.build import _normalize_all, _parse_iso_utc, page_match
+    from src.sitegen.i18n import DEFAULT_LOCALE, messages
+    from src.sitegen.streaming import json_array_chunks, write_chunks
+
+    raw, gen_seconds, gen_peak = _measure(lambda: generate_day(day, size))
+    normalized, norm_seconds, norm_peak = _measure(lambda: _normalize_all(raw))
+    del raw
+    normalized, sort_seconds, sort_peak = _measure(
+        lambda: sorted(normalized, key=lambda x: _parse_iso_utc(x.get("begin_at")))
+    )
+    html_bytes, render_seconds, render_peak = _measure(
+        lambda: write_chunks(out_file, template.generate(
+            slug="today",
+            root="/",
+            lang=DEFAULT_LOCALE,
+            t=messages(DEFAULT_LOCALE),
+            label="Сегодня",
+            date_str_display=day.isoformat(),
+            range_start_utc=f"{day.isoformat()}T00:00:00+00:00",
+            range_end_utc=f"{day.isoformat()}T23:59:59+00:00",
+            matches=normalized,
+            matches_json_chunks=json_array_chunks(page_match(m) for m in normalized),
+            schema_json="{}",
+            seo={"title": "", "description": "", "canonical_url": ""},
+            site_url="https://bench.example",
+            generated_at_utc=datetime.now(timezone.utc).isoformat(),
+        ))
+    )
+
+    stages = {
+        "generate": (gen_seconds, gen_peak),
+        "normalize": (norm_seconds, norm_peak),
+        "sort": (sort_seconds, sort_peak),
+        "render": (render_seconds, render_peak),
+    }
+    return {
+        "matches": size,
+        "html_bytes": html_bytes,
+        "stages": {
+            name: {
+                "seconds": seconds,
+                "us_per_match": seconds / size * 1e6,
+                "peak_bytes": peak,
+            }
+            for name, (seconds, peak) in stages.items()
+        },
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Per-day pipeline time/memory over synthetic sizes.")
+    parser.add_argument("--sizes", default="1000,10000,50000", help="comma-separated matches per day")
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+    env = Environment(
+        loader=FileSystemLoader(str(REPO_ROOT / "src" / "templates")),
+        autoescape=select_autoescape(["html", "xml"]),
+    )
+    env.globals["asset_url"] = lambda name: f"/assets/{name}"
+    template = env.get_template("day.html.j2")
+
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="sitegen-scale-") as tmp:
+        for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+            row = measure_size(size, template, date(2026, 2, 20), Path(tmp) / "index.html")
+            rows.append(row)
+            cells = "  ".join(
+                f"{name}={stage['seconds']:.3f}s/{stage['us_per_match']:.1f}us/{stage['peak_bytes'] / 2**20:.1f}MiB"
+                for name, stage in row["stages"].items()
+            )
+            print(f"{size:>9d}  {cells}")
+
+    if args.output is not None:
+        args.output.write_text(json.dumps({"sizes": rows}, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+from urllib.parse import parse_qs, urlencode, urlparse
+
+
+DaySource = Callable[[date], list[dict[str, Any]]]
+
+# Same status subsets PandaScore applies for these list endpoints.
+_ENDPOINT_STATUSES: dict[str, frozenset[str] | None] = {
+    "/matches": None,
+    "/matches/past": frozenset({"finished", "canceled"}),
+    "/matches/upcoming": frozenset({"not_started"}),
+    "/matches/running": frozenset({"running"}),
+}
+
+
+@dataclass(frozen=True)
+class StubConfig:
+    latency_seconds: float = 0.0
+    # Answer every Nth request with 429 (0 disables rate limiting).
+    rate_limit_every: int = 0
+    retry_after_seconds: int = 0
+    max_page_size: int = 100
+    # Without X-Total and rel="last" clients must follow rel="next".
+    send_total_header: bool = True
+
+
+class StubPandaScoreServer:
+    """
+    Local HTTP server replaying match payloads with PandaScore's list semantics.
+
+    Supports filter[begin_at], sort, page[size] and page[number] on /matches
+    and its status sub-endpoints, with X-Total/X-Page/X-Per-Page and Link
+    pagination headers, configurable latency and injected 429s.
+    """
+
+    def __init__(self, source: DaySource, config: StubConfig | None = None) -> None:
+        self.source = source
+        self.config = config or StubConfig()
+        self.request_count = 0
+        self.rate_limited_count = 0
+        self._lock = threading.Lock()
+        self._body_cache: dict[tuple[str, str, int, int], tuple[bytes, int]] = {}
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="stub-pandascore", daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> StubPandaScoreServer:
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> StubPandaScoreServer:
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def _next_request_is_limited(self) -> bool:
+        with self._lock:
+            self.request_count += 1
+            every = self.config.rate_limit_every
+            limited = every > 0 and self.request_count % every == 0
+            if limited:
+                self.rate_limited_count += 1
+            return limited
+
+    def _page(self, path: str, day_str: str, size: int, number: int) -> tuple[bytes, int]:
+        key = (path, day_str, size, number)
+        cached = self._body_cache.get(key)
+        if cached is not None:
+            return cached
+        statuses = _ENDPOINT_STATUSES[path]
+        items = [
+            m
+            for m in self.source(date.fromisoformat(day_str))
+            if statuses is None or (m.get("status") or "") in statuses
+        ]
+        start = (number - 1) * size
+        body = json.dumps(items[start : start + size], ensure_ascii=False).encode("utf-8")
+        with self._lock:
+            self._body_cache[key] = (body, len(items))
+        return body, len(items)
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                cfg = server.config
+                if cfg.latency_seconds > 0:
+                    time.sleep(cfg.latency_seconds)
+
+                parsed = urlparse(self.path)
+                if parsed.path not in _ENDPOINT_STATUSES:
+                    self._send(404, b'{"error":"not found"}')
+                    return
+                if server._next_request_is_limited():
+                    self._send(429, b'{"error":"rate limited"}', {"Retry-After": str(cfg.retry_after_seconds)})
+                    return
+
+                query = parse_qs(parsed.query)
+                day_str = (query.get("filter[begin_at]") or [""])[0]
+                try:
+                    date.fromisoformat(day_str)
+                    size = min(int((query.get("page[size]") or ["50"])[0]), cfg.max_page_size)
+                    number = max(1, int((query.get("page[number]") or ["1"])[0]))
+                except ValueError:
+                    self._send(400, b'{"error":"bad request"}')
+                    return
+
+                body, total = server._page(parsed.path, day_str, size, number)
+                last = max(1, -(-total // size))
+                headers = {"X-Page": str(number), "X-Per-Page": str(size)}
+                links = []
+                base_params = {"filter[begin_at]": day_str, "sort": "begin_at", "page[size]": size}
+                if number < last:
+                    links.append(f'<{server.base_url}{parsed.path}?{urlencode({**base_params, "page[number]": number + 1})}>; rel="next"')
+                if cfg.send_total_header:
+                    headers["X-Total"] = str(total)
+                    links.append(f'<{server.base_url}{parsed.path}?{urlencode({**base_params, "page[number]": last})}>; rel="last"')
+                if links:
+                    headers["Link"] = ", ".join(links)
+                self._send(200, body, headers)
+
+            def _send(self, status: int, body: bytes, headers: dict[str, str] | None = None) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
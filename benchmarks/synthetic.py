@@ -0,0 +1,290 @@
+"""
+Synthetic PandaScore match payloads at archive scale.
+
+Matches follow the shape of the recorded /matches responses (opponents,
+results, games, league/serie/tournament, videogame, streams_list) and draw
+teams, leagues and image URLs from fixed pools, so duplication looks like
+production: a few hundred teams and a few dozen leagues shared by every day.
+Generation is deterministic per (seed, day) and lazy per day, so a 1M match
+archive never has to be held in memory at once.
+
+    python -m benchmarks.synthetic --matches 100000 --days 30 --output matches.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterator
+
+
+CDN = "https://cdn-api.pandascore.co/images"
+
+VIDEOGAMES = (
+    (1, "LoL", "league-of-legends"),
+    (3, "Counter-Strike", "cs-go"),
+    (4, "Dota 2", "dota-2"),
+    (26, "Valorant", "valorant"),
+    (14, "Overwatch", "ow"),
+    (22, "Rocket League", "rl"),
+    (20, "PUBG", "pubg"),
+    (34, "Mobile Legends: Bang Bang", "mlbb"),
+)
+STATUSES = ("not_started", "running", "finished", "canceled", "postponed")
+STATUS_WEIGHTS = (40, 5, 50, 3, 2)
+REGIONS = ("EU", "NA", "SA", "ASIA", "CIS", "OCE", "ME")
+TIERS = ("s", "a", "b", "c", "d")
+_SYLLABLES = ("ka", "ro", "vin", "tor", "ex", "na", "lu", "mi", "zen", "dra", "qu", "pha", "sol", "ix", "bo")
+
+
+@dataclass(frozen=True)
+class SyntheticPools:
+    teams: list[dict[str, Any]]
+    leagues: list[dict[str, Any]]
+
+
+def _word(rng: random.Random, parts: int) -> str:
+    return "".join(rng.choice(_SYLLABLES) for _ in range(parts)).capitalize()
+
+
+@lru_cache(maxsize=8)
+def build_pools(seed: int = 0, teams: int = 600, leagues: int = 60) -> SyntheticPools:
+    """Shared teams and leagues (each league with one serie and tournament per game)."""
+    rng = random.Random(f"pools:{seed}")
+    team_pool = []
+    for i in range(teams):
+        team_id = 100_000 + i
+        name = f"{_word(rng, 2)} {_word(rng, 1)}"
+        slug = name.lower().replace(" ", "-")
+        team_pool.append(
+            {
+                "id": team_id,
+                "name": name,
+                "location": rng.choice(("US", "DE", "KR", "BR", "CN", "UA", "SE", "FR", None)),
+                "slug": slug,
+                "modified_at": "2026-01-15T12:00:00Z",
+                "acronym": "".join(w[0] for w in name.split()).upper() + str(i % 10),
+                "image_url": f"{CDN}/team/image/{team_id}/{slug}.png",
+                "dark_mode_image_url": f"{CDN.replace('/images', '/dark_images')}/team/dark_image/{team_id}/{slug}.png",
+            }
+        )
+
+    league_pool = []
+    for i in range(leagues):
+        game_id, game_name, game_slug = VIDEOGAMES[i % len(VIDEOGAMES)]
+        league_id = 4000 + i
+        name = f"{_word(rng, 2)} League"
+        slug = f"{game_slug}-{name.lower().replace(' ', '-')}"
+        league_pool.append(
+            {
+                "videogame": {"id": game_id, "name": game_name, "slug": game_slug},
+                "league": {
+                    "id": league_id,
+                    "name": name,
+                    "url": None,
+                    "slug": slug,
+                    "modified_at": "2026-01-10T09:00:00Z",
+                    "image_url": f"{CDN}/league/image/{league_id}/{slug}.png",
+                },
+                "serie_id": 10_000 + i,
+                "tournament_id": 20_000 + i,
+                "region": rng.choice(REGIONS),
+                "tier": rng.choice(TIERS),
+                "streams": [
+                    f"https://www.twitch.tv/{slug.replace('-', '_')[:24]}",
+                    f"https://www.youtube.com/@{_word(rng, 2).lower()}",
+                ],
+            }
+        )
+    return SyntheticPools(teams=team_pool, leagues=league_pool)
+
+
+def _iso(dt: datetime | None) -> str | None:
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ") if dt is not None else None
+
+
+def _match(rng: random.Random, pools: SyntheticPools, day: date, index: int) -> dict[str, Any]:
+    match_id = day.toordinal() * 1_000_000 + index
+    league = rng.choice(pools.leagues)
+    left, right = rng.sample(pools.teams, 2)
+    status = rng.choices(STATUSES, weights=STATUS_WEIGHTS)[0]
+    best_of = rng.choice((1, 3, 3, 5))
+
+    begin = datetime(day.year, day.month, day.day, tzinfo=timezone.utc) + timedelta(minutes=rng.randrange(0, 24 * 60, 15))
+    rescheduled = rng.random() < 0.05
+    original = begin - timedelta(hours=rng.randint(1, 6)) if rescheduled else begin
+    end = begin + timedelta(minutes=40 * best_of) if status == "finished" else None
+
+    wins = best_of // 2 + 1
+    left_score = right_score = 0
+    winner = None
+    if status == "running":
+        left_score, right_score = rng.randint(0, wins - 1), rng.randint(0, wins - 1)
+    elif status == "finished":
+        winner = rng.choice((left, right))
+        loser_score = rng.randint(0, wins - 1)
+        left_score, right_score = (wins, loser_score) if winner is left else (loser_score, wins)
+
+    games = [
+        {
+            "complete": status == "finished" and n < left_score + right_score,
+            "id": match_id * 10 + n,
+            "position": n + 1,
+            "status": "finished" if status == "finished" and n < left_score + right_score else "not_started",
+            "length": rng.randint(1200, 3600) if status == "finished" else None,
+            "finished": status == "finished" and n < left_score + right_score,
+            "begin_at": None,
+            "detailed_stats": True,
+            "end_at": None,
+            "forfeit": False,
+            "match_id": match_id,
+            "winner": {"id": None, "type": "Team"},
+            "winner_type": "Team",
+        }
+        for n in range(best_of)
+    ]
+
+    league_info = league["league"]
+    serie = {
+        "id": league["serie_id"],
+        "name": f"Season {day.year}",
+        "year": day.year,
+        "begin_at": f"{day.year}-01-01T00:00:00Z",
+        "end_at": None,
+        "winner_id": None,
+        "winner_type": "Team",
+        "slug": f"{league_info['slug']}-{day.year}",
+        "modified_at": "2026-01-10T09:00:00Z",
+        "league_id": league_info["id"],
+        "season": None,
+        "full_name": f"{league_info['name']} {day.year}",
+    }
+    tournament = {
+        "id": league["tournament_id"],
+        "name": rng.choice(("Group Stage", "Playoffs", "Regular Season", "Qualifier")),
+        "type": "online",
+        "country": None,
+        "begin_at": serie["begin_at"],
+        "detailed_stats": True,
+        "end_at": None,
+        "winner_id": None,
+        "winner_type": "Team",
+        "slug": f"{serie['slug']}-main",
+        "serie_id": serie["id"],
+        "modified_at": "2026-01-10T09:00:00Z",
+        "league_id": league_info["id"],
+        "prizepool": None,
+        "tier": league["tier"],
+        "has_bracket": rng.random() < 0.5,
+        "region": league["region"],
+        "live_supported": False,
+    }
+
+    return {
+        "begin_at": _iso(begin),
+        "live": {"supported": False, "url": None, "opens_at": None},
+        "league": league_info,
+        "videogame_title": None,
+        "game_advantage": None,
+        "videogame": league["videogame"],
+        "videogame_version": None,
+        "draw": False,
+        "original_scheduled_at": _iso(original),
+        "streams_list": [
+            {
+                "main": n == 0,
+                "language": "en",
+                "embed_url": url,
+                "official": n == 0,
+                "raw_url": url,
+            }
+            for n, url in enumerate(league["streams"])
+        ],
+        "tournament": tournament,
+        "opponents": [{"type": "Team", "opponent": left}, {"type": "Team", "opponent": right}],
+        "serie": serie,
+        "winner_type": "Team",
+        "results": [
+            {"team_id": left["id"], "score": left_score},
+            {"team_id": right["id"], "score": right_score},
+        ],
+        "winner_id": winner["id"] if winner else None,
+        "modified_at": _iso(begin - timedelta(hours=12)),
+        "status": status,
+        "forfeit": False,
+        "scheduled_at": _iso(begin),
+        "rescheduled": rescheduled,
+        "detailed_stats": True,
+        "end_at": _iso(end),
+        "games": games,
+        "winner": winner,
+        "id": match_id,
+        "name": f"{tournament['name']}: {left['acronym']} vs {right['acronym']}",
+        "match_type": "best_of",
+        "tournament_id": tournament["id"],
+        "slug": f"{left['slug']}-vs-{right['slug']}-{day.isoformat()}",
+        "league_id": league_info["id"],
+        "number_of_games": best_of,
+        "serie_id": serie["id"],
+    }
+
+
+def generate_day(day: date, count: int, seed: int = 0) -> list[dict[str, Any]]:
+    """count matches starting on day, sorted by begin_at like the API returns them."""
+    rng = random.Random(f"day:{seed}:{day.isoformat()}")
+    pools = build_pools(seed)
+    matches = [_match(rng, pools, day, i) for i in range(count)]
+    matches.sort(key=lambda m: m["begin_at"])
+    return matches
+
+
+def iter_archive(total: int, days: int, start: date, seed: int = 0) -> Iterator[dict[str, Any]]:
+    """total matches spread evenly over days consecutive days from start."""
+    per_day, extra = divmod(total, days)
+    for offset in range(days):
+        yield from generate_day(start + timedelta(days=offset), per_day + (1 if offset < extra else 0), seed)
+
+
+class SyntheticDaySource:
+    """Day source for StubPandaScoreServer returning matches_per_day generated matches for any day."""
+
+    def __init__(self, matches_per_day: int, seed: int = 0, cached_days: int = 4) -> None:
+        self.matches_per_day = matches_per_day
+        self.seed = seed
+        self._generate = lru_cache(maxsize=cached_days)(self._generate_uncached)
+
+    def _generate_uncached(self, day: date) -> list[dict[str, Any]]:
+        return generate_day(day, self.matches_per_day, self.seed)
+
+    def __call__(self, day: date) -> list[dict[str, Any]]:
+        return self._generate(day)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Write synthetic PandaScore matches as JSON lines.")
+    parser.add_argument("--matches", type=int, default=10_000)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--start", type=date.fromisoformat, default=date(2026, 1, 1))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=None, help="defaults to stdout")
+    args = parser.parse_args(argv)
+
+    out = args.output.open("w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for match in iter_archive(args.matches, args.days, args.start, args.seed):
+            out.write(json.dumps(match, ensure_ascii=False))
+            out.write("\n")
+    finally:
+        if args.output:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+MANIFEST_FILENAME = "manifest.json"
+HEADERS_FILENAME = "_headers"
+DIGEST_LENGTH = 10
+# Hashed names change with their content, so they can be cached forever.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+_CSS_SPACE_RE = re.compile(r"\s+")
+_CSS_PUNCT_RE = re.compile(r"\s*([{};,>])\s*")
+_CSS_COLON_RE = re.compile(r":\s+")
+
+
+@dataclass(frozen=True)
+class Asset:
+    name: str
+    hashed_name: str
+    content: bytes
+
+
+def minify_css(text: str) -> str:
+    """
+    Drop comments and insignificant whitespace.
+
+    Deliberately conservative: whitespace before ":" is kept (it separates a
+    descendant pseudo-class such as "a :hover"), and strings are not parsed,
+    so the stylesheets must not put these characters inside quoted values.
+    """
+    text = _CSS_COMMENT_RE.sub("", text.lstrip("\ufeff"))
+    text = _CSS_SPACE_RE.sub(" ", text)
+    text = _CSS_PUNCT_RE.sub(r"\1", text)
+    text = _CSS_COLON_RE.sub(":", text)
+    return text.replace(";}", "}").strip() + "\n"
+
+
+def hashed_name(name: str, content: bytes) -> str:
+    """style.css -> style.<digest>.css, keeping the directory part of name."""
+    digest = hashlib.sha256(content).hexdigest()[:DIGEST_LENGTH]
+    path = Path(name)
+    return path.with_name(f"{path.stem}.{digest}{path.suffix}").as_posix()
+
+
+def collect_assets(src_dir: Path, minify: bool = True) -> dict[str, Asset]:
+    """Every file under src_dir keyed by its relative posix path, with its content-hashed name."""
+    assets: dict[str, Asset] = {}
+    for path in sorted(p for p in src_dir.rglob("*") if p.is_file()):
+        name = path.relative_to(src_dir).as_posix()
+        content = path.read_bytes()
+        if minify and path.suffix == ".css":
+            content = minify_css(content.decode("utf-8")).encode("utf-8")
+        assets[name] = Asset(name=name, hashed_name=hashed_name(name, content), content=content)
+    return assets
+
+
+def load_manifest(out_dir: Path) -> dict[str, str]:
+    try:
+        manifest = json.loads((out_dir / MANIFEST_FILENAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(manifest, dict):
+        return {}
+    return {str(k): str(v) for k, v in manifest.items()}
+
+
+def write_assets(assets: dict[str, Asset], out_dir: Path) -> dict[str, str]:
+    """
+    Write hashed files and manifest.json into out_dir; returns the manifest.
+
+    Files of the previous manifest are kept for one more build, so pages
+    cached with the old names keep working while the new ones propagate.
+    Older hashed copies are removed.
+    """
+    previous = load_manifest(out_dir)
+    manifest = {name: asset.hashed_name for name, asset in assets.items()}
+    for asset in assets.values():
+        target = out_dir / asset.hashed_name
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(asset.content)
+
+    keep = set(manifest.values()) | set(previous.values())
+    for name in manifest:
+        path = Path(name)
+        pattern = re.compile(rf"{re.escape(path.stem)}\.[0-9a-f]{{{DIGEST_LENGTH}}}{re.escape(path.suffix)}")
+        for old in (out_dir / path.parent).glob(f"{path.stem}.*{path.suffix}"):
+            rel = old.relative_to(out_dir).as_posix()
+            if pattern.fullmatch(old.name) and rel not in keep:
+                old.unlink()
+
+    (out_dir / MANIFEST_FILENAME).write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    return manifest
+
+
+def headers_file(manifest: dict[str, str], url_prefix: str) -> str:
+    """Netlify / Cloudflare Pages _headers rules marking hashed assets immutable."""
+    return "".join(
+        f"{url_prefix}/{hashed}\n  Cache-Control: {IMMUTABLE_CACHE_CONTROL}\n" for hashed in sorted(manifest.values())
+    )
+
+
+def asset_url_function(manifest: dict[str, str], url_prefix: str) -> Callable[[str], str]:
+    """Jinja helper: asset_url("style.css") -> "/assets/style.<digest>.css" (the plain name if unknown)."""
+
+    def asset_url(name: str) -> str:
+        return f"{url_prefix}/{manifest.get(name, name)}"
+
+    return asset_url
@@ -1,31 +1,72 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import os
 import shutil
-from dataclasses import dataclass
-from datetime import datetime, timezone
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
 from pathlib import Path
-from typing import Any
-
-from dotenv import load_dotenv
-from jinja2 import Environment, FileSystemLoader, select_autoescape
-
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator
+from urllib.parse import urlencode
+
+from src.sitegen import metrics, profiling
+from src.sitegen.assets import (
+    HEADERS_FILENAME,
+    asset_url_function,
+    collect_assets,
+    headers_file,
+    load_manifest,
+    write_assets,
+)
 from src.sitegen.cache import get_or_fetch
-from src.sitegen.dates import DayRange, get_day_ranges
-from src.sitegen.images import build_image_name, download_image
+from src.sitegen.dates import DayRange
+from src.sitegen.diff import MatchDiff, diff_matches
+from src.sitegen.i18n import DEFAULT_LOCALE, messages
+from src.sitegen.index import MatchIndex
 from src.sitegen.normalize import normalize_match
-from src.sitegen.pandascore import PandaScoreClient
+from src.sitegen.search import SEARCH_INDEX_FILENAME, build_search_index, dumps_search_index
+from src.sitegen.pandascore import PandaScoreClient, day_cache_key, day_params
+from src.sitegen.sitemap import INDEX_FILENAME as SITEMAP_INDEX_FILENAME
+from src.sitegen.sitemap import SitemapUrl, write_sitemaps
+from src.sitegen.streaming import json_array_chunks, write_chunks
+from src.sitegen.variants import Variant, parse_variants, plan_ranges
+
+if TYPE_CHECKING:
+    from jinja2 import Template
+
+    from src.sitegen.history import HistoryStore
 
 
 logger = logging.getLogger(__name__)
 
+CHANGELOG_MAX_ENTRIES = 200
+ASSETS_URL_PREFIX = "/assets"
+# Match fields the page script renders. The inline page JSON carries only
+# these; other searchable strings (titles, acronyms) ship in search.json.
+PAGE_MATCH_FIELDS = (
+    "begin_at",
+    "game_name",
+    "game_image_url",
+    "local_game_icon_path",
+    "score_str",
+    "league_name",
+    "tournament_name",
+    "stream_url",
+)
+# Part of every page fingerprint. Bump it when the render code changes the
+# output for the same data, so pages written by older builds are redone.
+BUILD_FORMAT = 3
+
 
 @dataclass(frozen=True)
 class BuildConfig:
     site_url: str
     pandascore_token: str
+    pandascore_base_url: str
     day_mode: str
     tz_name: str
     cache_ttl_seconds: int
@@ -37,9 +78,20 @@ class BuildConfig:
     assets_img_out_dir: Path
     org_name: str
     download_images: bool
+    state_path: Path
+    report_path: Path
+    minify_assets: bool = True
+    # Empty means a single root variant in tz_name and the default locale.
+    variants: tuple[Variant, ...] = ()
+    # (connect, read) seconds per PandaScore request attempt.
+    http_timeout: tuple[float, float] = (3.0, 15.0)
+    # Match history (see history.py); None disables it.
+    history_dir: Path | None = None
 
 
 def _load_config() -> BuildConfig:
+    from dotenv import load_dotenv
+
     load_dotenv()
 
     raw_site_url = (os.getenv("SITE_URL") or "").strip()
@@ -53,11 +105,21 @@ def _load_config() -> BuildConfig:
     if not token:
         raise RuntimeError("Missing PANDASCORE_TOKEN in environment")
 
+    base_url = (os.getenv("PANDASCORE_BASE_URL") or "https://api.pandascore.co").strip().rstrip("/")
+
     day_mode = (os.getenv("DAY_MODE") or "utc").strip().lower()
     tz_name = (os.getenv("TZ_NAME") or "UTC").strip()
     cache_ttl = int((os.getenv("CACHE_TTL_SECONDS") or "120").strip())
     org_name = (os.getenv("ORG_NAME") or "Esports Matches").strip()
     download_images = _env_bool("DOWNLOAD_IMAGES", default=False)
+    minify_assets = _env_bool("MINIFY_ASSETS", default=True)
+    variants = parse_variants(os.getenv("SITE_VARIANTS") or "")
+    http_timeout = (
+        float((os.getenv("API_CONNECT_TIMEOUT_SECONDS") or "3").strip()),
+        float((os.getenv("API_TIMEOUT_SECONDS") or "15").strip()),
+    )
+
+    history_dir = Path((os.getenv("HISTORY_DIR") or ".cache/history").strip())
 
     dist_dir = Path("dist")
     template_dir = Path("src/templates")
@@ -68,6 +130,7 @@ def _load_config() -> BuildConfig:
     return BuildConfig(
         site_url=site_url,
         pandascore_token=token,
+        pandascore_base_url=base_url,
         day_mode=day_mode,
         tz_name=tz_name,
         cache_ttl_seconds=cache_ttl,
@@ -79,6 +142,12 @@ def _load_config() -> BuildConfig:
         assets_img_out_dir=assets_img_out_dir,
         org_name=org_name,
         download_images=download_images,
+        state_path=Path(".cache/build/state.json"),
+        report_path=Path(".cache/build/report.json"),
+        minify_assets=minify_assets,
+        variants=variants,
+        http_timeout=http_timeout,
+        history_dir=history_dir if _env_bool("HISTORY_ENABLED", default=True) else None,
     )
 
 
@@ -172,7 +241,10 @@ def _copy_assets(cfg: BuildConfig) -> None:
         logger.warning("Assets directory not found: %s", cfg.assets_src_dir)
         return
     cfg.assets_out_dir.parent.mkdir(parents=True, exist_ok=True)
+    # Plain names stay available for pages rendered before the manifest existed.
     shutil.copytree(cfg.assets_src_dir, cfg.assets_out_dir, dirs_exist_ok=True)
+    manifest = write_assets(collect_assets(cfg.assets_src_dir, minify=cfg.minify_assets), cfg.assets_out_dir)
+    _write_text(cfg.dist_dir / HEADERS_FILENAME, headers_file(manifest, ASSETS_URL_PREFIX))
 
 
 def _write_text(path: Path, content: str) -> None:
@@ -180,21 +252,15 @@ def _write_text(path: Path, content: str) -> None:
     path.write_text(content, encoding="utf-8")
 
 
-def _generate_sitemap(cfg: BuildConfig, slugs: list[str]) -> None:
-    urls = "\n".join(
-        f"  <url><loc>{cfg.site_url}/{slug}/</loc></url>" for slug in slugs
-    )
-    xml = (
-        '<?xml version="1.0" encoding="UTF-8"?>\n'
-        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
-        f"{urls}\n"
-        "</urlset>\n"
-    )
-    _write_text(cfg.dist_dir / "sitemap.xml", xml)
+def _generate_sitemap(cfg: BuildConfig, pages: list[str], lastmod: dict[str, str]) -> None:
+    urls = (SitemapUrl(loc=f"{cfg.site_url}/{page}/", lastmod=lastmod.get(page)) for page in pages)
+    write_sitemaps(cfg.dist_dir, cfg.site_url, urls)
+    # Single-file sitemap written by earlier versions of the builder.
+    (cfg.dist_dir / "sitemap.xml").unlink(missing_ok=True)
 
 
 def _generate_robots(cfg: BuildConfig) -> None:
-    txt = f"User-agent: *\nAllow: /\n\nSitemap: {cfg.site_url}/sitemap.xml\n"
+    txt = f"User-agent: *\nAllow: /\n\nSitemap: {cfg.site_url}/{SITEMAP_INDEX_FILENAME}\n"
     _write_text(cfg.dist_dir / "robots.txt", txt)
 
 
@@ -202,10 +268,14 @@ def _web_img_path(filename: str) -> str:
     return f"/assets/img/{filename}"
 
 
-def _localize_match_images(match: dict[str, Any], cfg: BuildConfig) -> None:
+def _localize_match_images(match: dict[str, Any], cfg: BuildConfig) -> dict[str, Any]:
+    """A copy of match pointing at downloaded images; the shared normalized match is left untouched."""
     if not cfg.download_images:
-        return
+        return match
+    # Only builds that download images pay for importing the image module.
+    from src.sitegen.images import build_image_name, download_image
 
+    match = dict(match)
     match_id = str(match.get("id") or "na")
 
     game_url = (match.get("game_image_url") or "").strip()
@@ -220,6 +290,7 @@ def _localize_match_images(match: dict[str, Any], cfg: BuildConfig) -> None:
     first_team_local = ""
     teams = match.get("teams") or []
     if isinstance(teams, list):
+        teams = match["teams"] = [dict(team) if isinstance(team, dict) else team for team in teams]
         for i, team in enumerate(teams):
             if not isinstance(team, dict):
                 continue
@@ -237,11 +308,31 @@ def _localize_match_images(match: dict[str, Any], cfg: BuildConfig) -> None:
 
     if first_team_local:
         match["local_team_logo_path"] = first_team_local
+    return match
+
+
+@dataclass
+class BuildContext:
+    """Long-lived build state: HTTP client, compiled template and rendered page fingerprints."""
+
+    cfg: BuildConfig
+    client: PandaScoreClient
+    # Compiled on first render, so builds where every page is unchanged skip Jinja.
+    template: Template | None = None
+    # Logical asset name -> content-hashed name, read from the manifest on first use.
+    assets: dict[str, str] | None = None
+    # Template sources, BUILD_FORMAT and render-relevant config, hashed on first use.
+    render_digest: str | None = None
+    page_fingerprints: dict[str, str] = field(default_factory=dict)
+    page_lastmod: dict[str, str] = field(default_factory=dict)
+    # Per-game pages under each day page: day slug -> ["today/cs-go", ...].
+    subpages: dict[str, list[str]] = field(default_factory=dict)
+    changelog: list[dict[str, Any]] = field(default_factory=list)
+    history: HistoryStore | None = None
 
 
-def build_site() -> None:
-    cfg = _load_config()
-    day_ranges = get_day_ranges(cfg.day_mode, cfg.tz_name)
+def create_context(cfg: BuildConfig | None = None) -> BuildContext:
+    cfg = cfg or _load_config()
 
     if not cfg.template_dir.joinpath(cfg.template_name).exists():
         raise RuntimeError(
@@ -249,86 +340,509 @@ def build_site() -> None:
             "Expected Jinja2 template day.html.j2"
         )
 
-    env = Environment(
-        loader=FileSystemLoader(str(cfg.template_dir)),
-        autoescape=select_autoescape(["html", "xml"]),
-    )
-    template = env.get_template(cfg.template_name)
+    client = PandaScoreClient(cfg.pandascore_token, base_url=cfg.pandascore_base_url, timeout=cfg.http_timeout)
+    history = None
+    if cfg.history_dir is not None:
+        from src.sitegen.history import HistoryStore
+
+        history = HistoryStore(cfg.history_dir)
+    ctx = BuildContext(cfg=cfg, client=client, history=history)
+    _load_state(ctx)
+    return ctx
+
+
+def _template(ctx: BuildContext) -> Template:
+    if ctx.template is None:
+        from jinja2 import Environment, FileSystemLoader, select_autoescape
 
-    client = PandaScoreClient(cfg.pandascore_token)
+        env = Environment(
+            loader=FileSystemLoader(str(ctx.cfg.template_dir)),
+            autoescape=select_autoescape(["html", "xml"]),
+            auto_reload=False,
+        )
+        env.globals["asset_url"] = asset_url_function(_asset_manifest(ctx), ASSETS_URL_PREFIX)
+        ctx.template = env.get_template(ctx.cfg.template_name)
+    return ctx.template
+
+
+def _render_digest(ctx: BuildContext) -> str:
+    if ctx.render_digest is None:
+        cfg = ctx.cfg
+        digest = hashlib.sha1()
+        settings = [BUILD_FORMAT, cfg.site_url, cfg.org_name, cfg.download_images, cfg.template_name]
+        digest.update(json.dumps(settings).encode("utf-8"))
+        for path in sorted(p for p in cfg.template_dir.rglob("*") if p.is_file()):
+            digest.update(path.relative_to(cfg.template_dir).as_posix().encode("utf-8"))
+            digest.update(path.read_bytes())
+        ctx.render_digest = digest.hexdigest()
+    return ctx.render_digest
+
+
+def _asset_manifest(ctx: BuildContext) -> dict[str, str]:
+    if ctx.assets is None:
+        ctx.assets = load_manifest(ctx.cfg.assets_out_dir)
+    return ctx.assets
 
-    if cfg.dist_dir.exists():
-        shutil.rmtree(cfg.dist_dir)
+
+def _load_state(ctx: BuildContext) -> None:
+    try:
+        with ctx.cfg.state_path.open("r", encoding="utf-8") as f:
+            state = json.load(f)
+    except Exception:
+        return
+    if not isinstance(state, dict):
+        return
+    pages = state.get("pages")
+    if isinstance(pages, dict):
+        ctx.page_fingerprints = {str(k): str(v) for k, v in pages.items()}
+    lastmod = state.get("lastmod")
+    if isinstance(lastmod, dict):
+        ctx.page_lastmod = {str(k): str(v) for k, v in lastmod.items()}
+    subpages = state.get("subpages")
+    if isinstance(subpages, dict):
+        ctx.subpages = {str(k): [str(p) for p in v] for k, v in subpages.items() if isinstance(v, list)}
+    changelog = state.get("changelog")
+    if isinstance(changelog, list):
+        ctx.changelog = [x for x in changelog if isinstance(x, dict)][-CHANGELOG_MAX_ENTRIES:]
+
+
+def save_state(ctx: BuildContext) -> None:
+    state = {
+        "pages": ctx.page_fingerprints,
+        "lastmod": ctx.page_lastmod,
+        "subpages": ctx.subpages,
+        "changelog": ctx.changelog,
+    }
+    try:
+        _write_text(ctx.cfg.state_path, json.dumps(state, ensure_ascii=False))
+    except OSError as exc:
+        logger.warning("Could not save build state to %s: %s", ctx.cfg.state_path, exc)
+
+
+def prepare_dist(cfg: BuildConfig) -> None:
+    """
+    Create the output tree. Existing pages are kept so unchanged days can be
+    skipped; build state remembers what each page was rendered from.
+    """
     cfg.dist_dir.mkdir(parents=True, exist_ok=True)
     _copy_assets(cfg)
     cfg.assets_img_out_dir.mkdir(parents=True, exist_ok=True)
 
-    rendered_slugs: list[str] = []
 
-    for dr in day_ranges:
-        cache_url = (
-            f"{client.base_url}/matches"
-            f"?start={dr.start_dt_utc.isoformat()}&end={dr.end_dt_utc.isoformat()}"
-        )
+def _page_fingerprint(
+    variant: Variant,
+    dr: DayRange,
+    matches: list[dict[str, Any]],
+    assets: dict[str, str],
+    render_digest: str,
+) -> str:
+    # Asset names and the templates are part of the page, so a CSS or template
+    # change re-renders every page.
+    payload = json.dumps(
+        [
+            dr.start_dt_utc.isoformat(),
+            dr.end_dt_utc.isoformat(),
+            dr.date_str_display,
+            variant.locale,
+            matches,
+            assets,
+            render_digest,
+        ],
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
 
-        try:
-            raw_matches, was_cached = get_or_fetch(
-                url=cache_url,
-                headers={"accept": "application/json"},
-                ttl_seconds=cfg.cache_ttl_seconds,
-                fetcher_callable=lambda dr=dr: client.fetch_matches(dr.start_dt_utc, dr.end_dt_utc),
-            )
-        except Exception as exc:
-            raise RuntimeError(
-                f"API fetch failed for {dr.slug} ({dr.start_dt_utc.isoformat()}..{dr.end_dt_utc.isoformat()}): {exc}"
-            ) from exc
-
-        if not isinstance(raw_matches, list):
-            raise RuntimeError(f"API returned unexpected payload type for {dr.slug}: {type(raw_matches).__name__}")
-
-        normalized = [normalize_match(item if isinstance(item, dict) else {}) for item in raw_matches]
-        for match in normalized:
-            _localize_match_images(match, cfg)
-        normalized.sort(key=lambda x: _parse_iso_utc(x.get("begin_at")))
-
-        schema_json = _build_schema_json(cfg, dr.slug, normalized)
-        canonical = f"{cfg.site_url}/{dr.slug}/"
-
-        logger.info(
-            "Build %s: matches=%d source=%s",
-            dr.slug,
-            len(normalized),
-            "cache" if was_cached else "api",
-        )
 
-        html = template.render(
-            slug=dr.slug,
-            label_ru=dr.label_ru,
-            date_str_display=dr.date_str_display,
-            range_start_utc=dr.start_dt_utc.isoformat(),
-            range_end_utc=dr.end_dt_utc.isoformat(),
-            matches=normalized,
-            matches_json=json.dumps(normalized, ensure_ascii=False),
-            schema_json=schema_json,
-            seo={
-                "title": f"{dr.label_ru}: киберспортивные матчи",
-                "description": f"Расписание и результаты киберспортивных матчей за {dr.label_ru.lower()}.",
-                "canonical_url": canonical,
-            },
-            site_url=cfg.site_url,
-            generated_at_utc=datetime.now(timezone.utc).isoformat(),
-        )
+def _page_outputs_exist(ctx: BuildContext, page: str) -> bool:
+    """Whether the day page, its per-game pages and their search indexes are all on disk."""
+    subpages = ctx.subpages.get(page)
+    if subpages is None:
+        return False
+    return all(
+        (ctx.cfg.dist_dir / p / name).exists() for p in (page, *subpages) for name in ("index.html", SEARCH_INDEX_FILENAME)
+    )
 
-        out_file = cfg.dist_dir / dr.slug / "index.html"
-        _write_text(out_file, html)
-        rendered_slugs.append(dr.slug)
 
-    _generate_sitemap(cfg, rendered_slugs)
-    _generate_robots(cfg)
+def _normalize_all(raw_matches: Any) -> list[dict[str, Any]]:
+    if not isinstance(raw_matches, list):
+        return []
+    return [normalize_match(item if isinstance(item, dict) else {}) for item in raw_matches]
+
+
+def site_variants(cfg: BuildConfig) -> tuple[Variant, ...]:
+    return cfg.variants or (Variant(prefix="", tz_name=cfg.tz_name, locale=DEFAULT_LOCALE),)
+
+
+def _fetch_days(
+    ctx: BuildContext,
+    targets: list[tuple[Variant, DayRange]],
+    ttl_seconds: int,
+    on_diff: Callable[[DayRange, MatchDiff], None] | None = None,
+) -> dict[date, tuple[list[dict[str, Any]], bool]]:
+    """
+    Normalized matches and was_cached for every UTC day any target overlaps.
+
+    Each UTC day is fetched (cached under day_cache_key()) and normalized
+    once, however many variants and local-mode ranges need it, so another
+    variant costs rendering only. Changes are reported against the ranges of
+    the first variant, so the changelog does not repeat per variant.
+
+    Days the match history holds as final are read from it instead of the
+    API; every fetched day is recorded there.
+    """
+    client = ctx.client
+    history = ctx.history
+    if history is not None:
+        from src.sitegen.history import may_be_final
+    primary = [dr for variant, dr in targets if variant == targets[0][0]] if targets else []
+    days = sorted({day for _variant, dr in targets for day in client.utc_days(dr.start_dt_utc, dr.end_dt_utc)})
+    fetched: dict[date, tuple[Any, bool]] = {}
+    archived: dict[date, list[dict[str, Any]]] = {}
+
+    with _stage("fetch", "days"):
+        for day in days:
+            stored = history.final_day(day) if history is not None and may_be_final(day) else None
+            if stored is not None:
+                archived[day] = stored
+                metrics.inc("sitegen_history_requests_total", result="hit")
+                continue
+            if history is not None:
+                metrics.inc("sitegen_history_requests_total", result="miss")
+            overlapping = [dr for dr in primary if day in client.utc_days(dr.start_dt_utc, dr.end_dt_utc)]
+            try:
+                fetched[day] = get_or_fetch(
+                    url=f"{client.base_url}/matches?{urlencode(day_params(day))}",
+                    headers={"accept": "application/json"},
+                    ttl_seconds=ttl_seconds,
+                    fetcher_callable=lambda day=day: client.fetch_day(day),
+                    on_refresh=_diff_recorder(overlapping, on_diff),
+                    cache_key=day_cache_key(day),
+                    stale_if_error=True,
+                )
+            except Exception as exc:
+                raise RuntimeError(f"API fetch failed for UTC day {day.isoformat()}: {exc}") from exc
+            if not isinstance(fetched[day][0], list):
+                raise RuntimeError(
+                    f"API returned unexpected payload type for {day.isoformat()}: {type(fetched[day][0]).__name__}"
+                )
+
+    result: dict[date, tuple[list[dict[str, Any]], bool]] = {}
+    with _stage("normalize", "days"):
+        for day, (day_matches, day_cached) in fetched.items():
+            normalized = _normalize_all(day_matches)
+            normalized.sort(key=lambda x: _parse_iso_utc(x.get("begin_at")))
+            result[day] = (normalized, day_cached)
+            metrics.inc("sitegen_normalized_matches_total", len(normalized), page="days")
+
+    if history is not None:
+        from src.sitegen.history import record_fetched_day
+
+        with _stage("history", "days"):
+            for day, (normalized, _cached) in result.items():
+                record_fetched_day(history, day, normalized)
+    result.update((day, (matches, True)) for day, matches in archived.items())
+    return result
+
+
+def _diff_recorder(
+    ranges: list[DayRange],
+    on_diff: Callable[[DayRange, MatchDiff], None] | None,
+) -> Callable[[Any, Any], dict[str, Any]]:
+    def record(previous: Any, fresh: Any) -> dict[str, Any]:
+        diff = diff_matches(_normalize_all(previous), _normalize_all(fresh))
+        # The first fetch of a day is not a change worth reporting downstream.
+        if on_diff is not None and previous is not None:
+            for dr in ranges:
+                in_range = {
+                    item.get("id")
+                    for items in (previous, fresh)
+                    if isinstance(items, list)
+                    for item in PandaScoreClient.filter_range(items, dr.start_dt_utc, dr.end_dt_utc)
+                }
+                on_diff(dr, diff.restricted_to(in_range))
+        return {"initial": previous is None, **diff.summary()}
+
+    return record
+
+
+def _record_change(ctx: BuildContext, dr: DayRange, diff: MatchDiff) -> None:
+    if diff.is_empty:
+        return
+    logger.info(
+        "Refresh %s: added=%d removed=%d changed=%d",
+        dr.slug,
+        len(diff.added),
+        len(diff.removed),
+        len(diff.changed),
+    )
+    entry = {
+        "slug": dr.slug,
+        "range_start_utc": dr.start_dt_utc.isoformat(),
+        "range_end_utc": dr.end_dt_utc.isoformat(),
+        "detected_at_utc": datetime.now(timezone.utc).isoformat(),
+        **diff.summary(),
+    }
+    ctx.changelog.append(entry)
+    del ctx.changelog[:-CHANGELOG_MAX_ENTRIES]
+
 
-    logger.info("Build completed. Pages=%d output=%s", len(rendered_slugs), cfg.dist_dir)
+def page_match(match: dict[str, Any]) -> dict[str, Any]:
+    """The part of a match the page script renders."""
+    slim = {key: match.get(key) for key in PAGE_MATCH_FIELDS}
+    slim["teams"] = [
+        {"name": team.get("name"), "image_url": team.get("image_url")}
+        for team in match.get("teams") or []
+        if isinstance(team, dict)
+    ]
+    return slim
+
+
+def _render_day(
+    ctx: BuildContext,
+    dr: DayRange,
+    matches: list[dict[str, Any]],
+    games: list[dict[str, Any]] | None = None,
+    game: dict[str, Any] | None = None,
+    variant: Variant | None = None,
+) -> None:
+    """Render the day page, or its per-game page when game is given, for variant (the first one by default)."""
+    cfg = ctx.cfg
+    variant = variant or site_variants(cfg)[0]
+    t = messages(variant.locale)
+    label = t["days"].get(dr.slug, dr.label_ru)
+    page = variant.page(f"{dr.slug}/{game['key']}" if game else dr.slug)
+    schema_json = _build_schema_json(cfg, page, matches)
+    canonical = f"{cfg.site_url}/{page}/"
+    if game:
+        title = t["game_title"].format(day=label, game=game["label"])
+        description = t["game_description"].format(day=label.lower(), game=game["label"])
+    else:
+        title = t["title"].format(day=label)
+        description = t["description"].format(day=label.lower())
+
+    # generate() yields the page head before the match loop runs, and the
+    # chunks go straight to disk, so no full-page string is ever built.
+    chunks = _template(ctx).generate(
+        slug=dr.slug,
+        root=variant.root,
+        lang=variant.locale,
+        t=t,
+        label=label,
+        date_str_display=dr.date_str_display,
+        range_start_utc=dr.start_dt_utc.isoformat(),
+        range_end_utc=dr.end_dt_utc.isoformat(),
+        matches=matches,
+        matches_json_chunks=json_array_chunks(page_match(m) for m in matches),
+        schema_json=schema_json,
+        games=games or [],
+        active_game=game["key"] if game else None,
+        seo={
+            "title": title,
+            "description": description,
+            "canonical_url": canonical,
+        },
+        site_url=cfg.site_url,
+        generated_at_utc=datetime.now(timezone.utc).isoformat(),
+    )
 
+    size = write_chunks(cfg.dist_dir / page / "index.html", chunks)
+    _write_text(cfg.dist_dir / page / SEARCH_INDEX_FILENAME, dumps_search_index(build_search_index(matches)))
+    metrics.observe("sitegen_render_bytes", size, page=dr.slug)
+
+
+def _render_game_pages(
+    ctx: BuildContext, variant: Variant, dr: DayRange, index: MatchIndex, games: list[dict[str, Any]]
+) -> list[str]:
+    """Render {day}/{game}/ for every game of the day and remove pages of games no longer present."""
+    day_page = variant.page(dr.slug)
+    pages = []
+    for game in games:
+        _render_day(ctx, dr, index.query(game=game["key"]), games=games, game=game, variant=variant)
+        pages.append(f"{day_page}/{game['key']}")
+
+    current = {game["key"] for game in games}
+    day_dir = ctx.cfg.dist_dir / day_page
+    for child in day_dir.iterdir() if day_dir.is_dir() else ():
+        if child.is_dir() and child.name not in current and (child / "index.html").exists():
+            shutil.rmtree(child)
+            ctx.page_lastmod.pop(f"{day_page}/{child.name}", None)
+    return pages
+
+
+@contextmanager
+def _stage(stage: str, slug: str) -> Iterator[None]:
+    with metrics.timer("sitegen_build_stage_seconds", stage=stage, page=slug), profiling.section(f"build.{stage}.{slug}"):
+        yield
+
+
+def _build_page(
+    ctx: BuildContext,
+    variant: Variant,
+    dr: DayRange,
+    days: dict[date, tuple[list[dict[str, Any]], bool]],
+) -> bool:
+    """Render one variant's day page and its per-game pages from the shared normalized days."""
+    cfg = ctx.cfg
+    page = variant.page(dr.slug)
+    utc_days = ctx.client.utc_days(dr.start_dt_utc, dr.end_dt_utc)
+    # Each day is already sorted, so this sort only merges neighbouring days.
+    matches = sorted(
+        (m for day in utc_days for m in PandaScoreClient.filter_range(days[day][0], dr.start_dt_utc, dr.end_dt_utc)),
+        key=lambda x: _parse_iso_utc(x.get("begin_at")),
+    )
+    source = "cache" if all(days[day][1] for day in utc_days) else "api"
+
+    fingerprint = _page_fingerprint(variant, dr, matches, _asset_manifest(ctx), _render_digest(ctx))
+    if ctx.page_fingerprints.get(page) == fingerprint and _page_outputs_exist(ctx, page):
+        logger.info("Build %s: unchanged, matches=%d source=%s", page, len(matches), source)
+        return False
+
+    with _stage("images", dr.slug):
+        matches = [_localize_match_images(match, cfg) for match in matches]
+
+    logger.info("Build %s: matches=%d source=%s", page, len(matches), source)
+
+    index = MatchIndex.build(matches)
+    games = [
+        {"key": key, "label": label, "count": count, "url": f"/{page}/{key}/"}
+        for key, label, count in index.facet("game")
+    ]
+    with _stage("render", dr.slug):
+        _render_day(ctx, dr, matches, games=games, variant=variant)
+        subpages = _render_game_pages(ctx, variant, dr, index, games)
+    now = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+    ctx.page_fingerprints[page] = fingerprint
+    ctx.subpages[page] = subpages
+    for rendered in [page, *subpages]:
+        ctx.page_lastmod[rendered] = now
+    return True
+
+
+def build_days(
+    ctx: BuildContext,
+    slugs: Iterable[str] | None = None,
+    ttl_seconds: int | None = None,
+    now_utc: datetime | None = None,
+) -> list[str]:
+    """
+    Fetch, normalize and render the given day slugs (all by default) for every variant.
+
+    Returns the day pages that were (re)written, e.g. ["today", "en/today"].
+    Pages whose normalized data, day range and locale are identical to what
+    was rendered last time in this context are skipped.
+    """
+    cfg = ctx.cfg
+    ttl = cfg.cache_ttl_seconds if ttl_seconds is None else ttl_seconds
+    wanted = None if slugs is None else set(slugs)
+    targets = [
+        (variant, dr)
+        for variant, dr in plan_ranges(site_variants(cfg), cfg.day_mode, now_utc or datetime.now(timezone.utc))
+        if wanted is None or dr.slug in wanted
+    ]
+    days = _fetch_days(ctx, targets, ttl, on_diff=lambda dr, diff: _record_change(ctx, dr, diff))
+    return [variant.page(dr.slug) for variant, dr in targets if _build_page(ctx, variant, dr, days)]
+
+
+def site_pages(cfg: BuildConfig, now_utc: datetime | None = None) -> list[str]:
+    """Day pages of every variant, e.g. ["yesterday", "today", "tomorrow", "en/yesterday", ...]."""
+    now = now_utc or datetime.now(timezone.utc)
+    return [variant.page(dr.slug) for variant, dr in plan_ranges(site_variants(cfg), cfg.day_mode, now)]
+
+
+def _generate_changelog(ctx: BuildContext) -> None:
+    feed = {"entries": list(reversed(ctx.changelog))}
+    _write_text(ctx.cfg.dist_dir / "changes.json", json.dumps(feed, ensure_ascii=False))
+
+
+def write_site_files(ctx: BuildContext, pages: list[str]) -> None:
+    """Sitemap (day pages plus their per-game pages), robots.txt, changes.json and build state."""
+    all_pages = [p for page in pages for p in (page, *ctx.subpages.get(page, []))]
+    _generate_sitemap(ctx.cfg, all_pages, ctx.page_lastmod)
+    _generate_robots(ctx.cfg)
+    _generate_changelog(ctx)
+    save_state(ctx)
+
+
+def _stage_seconds(snapshot: dict[str, Any], stage: str) -> float:
+    series = snapshot["summaries"].get("sitegen_build_stage_seconds", [])
+    return sum(s["sum"] for s in series if s["labels"].get("stage") == stage)
+
+
+def write_build_report(cfg: BuildConfig, duration_seconds: float, pages: list[str], rendered: int) -> None:
+    """Write timings, cache/HTTP counters and per-stage totals as JSON to cfg.report_path."""
+    snapshot = metrics.REGISTRY.snapshot()
+    normalized = sum(s["value"] for s in snapshot["counters"].get("sitegen_normalized_matches_total", []))
+    normalize_seconds = _stage_seconds(snapshot, "normalize")
+    report = {
+        "generated_at_utc": datetime.now(timezone.utc).isoformat(),
+        "duration_seconds": duration_seconds,
+        "pages": pages,
+        "pages_rendered": rendered,
+        "stages_seconds": {
+            stage: _stage_seconds(snapshot, stage) for stage in ("fetch", "normalize", "images", "render")
+        },
+        "normalize_seconds_per_match": normalize_seconds / normalized if normalized else 0.0,
+        "metrics": snapshot,
+    }
+    try:
+        _write_text(cfg.report_path, json.dumps(report, ensure_ascii=False, indent=2))
+    except OSError as exc:
+        logger.warning("Could not write build report to %s: %s", cfg.report_path, exc)
+
+
+def compact_history(ctx: BuildContext) -> None:
+    """Fold the match history's sealed segments once enough have accumulated."""
+    if ctx.history is None:
+        return
+    try:
+        ctx.history.maybe_compact()
+    except OSError as exc:
+        logger.warning("Could not compact match history in %s: %s", ctx.history.directory, exc)
+
+
+def build_site(ctx: BuildContext | None = None) -> None:
+    started = time.perf_counter()
+    ctx = ctx or create_context()
+    cfg = ctx.cfg
+    now = datetime.now(timezone.utc)
+
+    prepare_dist(cfg)
+
+    pages = site_pages(cfg, now_utc=now)
+    rendered = build_days(ctx, now_utc=now)
+
+    write_site_files(ctx, pages)
+    compact_history(ctx)
+    write_build_report(cfg, time.perf_counter() - started, pages, len(rendered))
+
+    logger.info("Build completed. Pages=%d rendered=%d output=%s", len(pages), len(rendered), cfg.dist_dir)
+
+
+def main(argv: list[str] | None = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the static site.")
+    parser.add_argument(
+        "--profile",
+        default=None,
+        help="cpu, mem or all: profile each build stage (overrides SITEGEN_PROFILE)",
+    )
+    parser.add_argument("--profile-dir", type=Path, default=None, help="where to write profiles")
+    args = parser.parse_args(argv)
 
-if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    profiling.configure_from_env()
+    if args.profile is not None or args.profile_dir is not None:
+        profiling.configure(
+            modes=args.profile if args.profile is not None else os.getenv("SITEGEN_PROFILE") or "",
+            directory=args.profile_dir,
+        )
     build_site()
+
+
+if __name__ == "__main__":
+    main()
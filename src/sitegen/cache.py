@@ -1,21 +1,94 @@
 from __future__ import annotations
 
 import hashlib
-import json
+import logging
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import Executor, Future
 from pathlib import Path
 from typing import Any, Callable
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
+from src.sitegen import metrics
+from src.sitegen.cache_backends import CacheBackend, backend_from_env
+
+
+logger = logging.getLogger(__name__)
 
 CACHE_DIR = Path(".cache/http")
+MEMORY_MAX_ENTRIES = 256
+
+# Request headers that change the response body. Anything else, notably
+# Authorization, is left out of the key so token rotation keeps the cache.
+VARY_HEADERS = frozenset({"accept", "accept-language"})
+
+_BACKEND: CacheBackend | None = None
+_BACKEND_LOCK = threading.Lock()
+
+# In-process tier in front of the shared backend: key -> (saved_at, data).
+_MEMORY: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+_MEMORY_LOCK = threading.Lock()
+
+# Fetches in progress, shared by concurrent callers asking for the same key.
+_INFLIGHT: dict[str, Future] = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+
+def get_backend() -> CacheBackend:
+    """Backend selected by CACHE_BACKEND on first use; see cache_backends.backend_from_env()."""
+    global _BACKEND
+    with _BACKEND_LOCK:
+        if _BACKEND is None:
+            _BACKEND = backend_from_env()
+        return _BACKEND
+
+
+def set_backend(backend: CacheBackend | None) -> None:
+    """Replace the shared backend; None re-reads the environment on next use."""
+    global _BACKEND
+    with _BACKEND_LOCK:
+        _BACKEND = backend
+    clear_memory_cache()
+
+
+def _memory_get(key: str) -> tuple[float, Any] | None:
+    with _MEMORY_LOCK:
+        entry = _MEMORY.get(key)
+        if entry is not None:
+            _MEMORY.move_to_end(key)
+        return entry
+
+
+def _memory_put(key: str, saved_at: float, data: Any) -> None:
+    with _MEMORY_LOCK:
+        _MEMORY[key] = (saved_at, data)
+        _MEMORY.move_to_end(key)
+        while len(_MEMORY) > MEMORY_MAX_ENTRIES:
+            _MEMORY.popitem(last=False)
+
 
+def clear_memory_cache() -> None:
+    with _MEMORY_LOCK:
+        _MEMORY.clear()
 
-def _build_cache_key(url: str, headers: dict[str, str] | None) -> str:
-    normalized_headers = headers or {}
-    headers_part = "\n".join(
-        f"{k.lower()}:{v}" for k, v in sorted(normalized_headers.items(), key=lambda x: x[0].lower())
-    )
-    raw = f"{url}\n{headers_part}"
+
+def canonical_url(url: str) -> str:
+    """Lowercase scheme/host, sorted and uniformly encoded query, no fragment."""
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, ""))
+
+
+def _build_cache_key(url: str, headers: dict[str, str] | None, cache_key: str | None = None) -> str:
+    if cache_key is not None:
+        raw = cache_key
+    else:
+        vary = sorted(
+            (k.lower(), v.strip().lower()) for k, v in (headers or {}).items() if k.lower() in VARY_HEADERS
+        )
+        headers_part = "\n".join(f"{k}:{v}" for k, v in vary)
+        raw = f"{canonical_url(url)}\n{headers_part}"
     return hashlib.sha1(raw.encode("utf-8")).hexdigest()
 
 
@@ -24,52 +97,202 @@ def get_or_fetch(
     headers: dict[str, str] | None,
     ttl_seconds: int,
     fetcher_callable: Callable[[], Any],
+    on_refresh: Callable[[Any | None, Any], dict[str, Any] | None] | None = None,
+    stale_ttl_seconds: int = 0,
+    executor: Executor | None = None,
+    cache_key: str | None = None,
+    stale_if_error: bool = False,
 ) -> tuple[Any, bool]:
     """
-    Return (json_data, was_cached) using file cache in .cache/http.
+    Return (json_data, was_cached) using the configured cache backend.
+
+    Entries are keyed by the canonical form of url plus the VARY_HEADERS
+    present in headers, or by cache_key when given: a semantic key (e.g.
+    pandascore.day_cache_key()) lets requests with different URLs share one
+    entry. url is then only recorded in the entry meta.
+
+    on_refresh(previous_data, fresh_data) is called after a fetch, with the
+    previous entry's data even if it had expired (None if there was none). Its
+    return value is stored in the entry's meta under "refresh"; see read_meta().
+
+    Entries are also kept in a bounded in-process memory tier, so long-running
+    processes (the build daemon, the Flask app) skip the backend read and JSON
+    parse on warm hits. Callers must treat returned data as read-only.
+
+    Concurrent misses for the same key share one fetcher_callable call. When
+    executor is given, an entry that expired less than stale_ttl_seconds ago is
+    returned immediately and refreshed on the executor in the background.
+
+    With stale_if_error, a failed fetch returns the expired entry, however old,
+    as (data, True) instead of raising, e.g. while the upstream circuit is open
+    (see circuit.py). The error is raised only when there is nothing cached.
 
-    Cache files:
+    The default file backend stores:
     - .cache/http/{sha1}.json
     - .cache/http/{sha1}.meta.json
     """
-    key = _build_cache_key(url, headers)
-    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    key = _build_cache_key(url, headers, cache_key)
+    now = time.time()
 
-    data_path = CACHE_DIR / f"{key}.json"
-    meta_path = CACHE_DIR / f"{key}.meta.json"
+    entry = _memory_get(key)
+    tier = "memory"
+    if entry is None or not (ttl_seconds > 0 and now - entry[0] <= ttl_seconds):
+        # Another process may have refreshed the shared backend meanwhile.
+        backend_entry = _backend_get(key)
+        if backend_entry is not None and (entry is None or backend_entry[0] > entry[0]):
+            entry, tier = backend_entry, "backend"
 
-    now = time.time()
+    if entry is not None:
+        saved_at, cached_data = entry
+        age = now - saved_at
+        if ttl_seconds > 0 and age <= ttl_seconds:
+            _memory_put(key, saved_at, cached_data)
+            metrics.inc("sitegen_cache_requests_total", tier=tier, result="hit")
+            return cached_data, True
+        if executor is not None and stale_ttl_seconds > 0 and age <= ttl_seconds + stale_ttl_seconds:
+            _refresh_in_background(executor, key, url, ttl_seconds, fetcher_callable, on_refresh, cached_data)
+            metrics.inc("sitegen_cache_requests_total", tier=tier, result="stale")
+            return cached_data, True
+        metrics.inc("sitegen_cache_requests_total", tier=tier, result="expired")
+    else:
+        metrics.inc("sitegen_cache_requests_total", tier="none", result="miss")
 
+    previous = entry[1] if entry is not None else None
+
+    def load() -> Any:
+        # Another caller may have finished a fetch between our lookup and
+        # becoming the owner of this key.
+        latest = _memory_get(key)
+        if latest is not None and ttl_seconds > 0 and time.time() - latest[0] <= ttl_seconds:
+            return latest[1]
+        return _fetch_and_store(key, url, ttl_seconds, fetcher_callable, on_refresh, previous)
+
+    try:
+        return _single_flight(key, load), False
+    except Exception as exc:
+        if not stale_if_error or entry is None:
+            raise
+        logger.warning("Serving stale %s after fetch error: %s", url, exc)
+        metrics.inc("sitegen_cache_requests_total", tier=tier, result="stale_error")
+        return entry[1], True
+
+
+def _backend_get(key: str) -> tuple[float, Any] | None:
     # Cache read path: any error = cache miss.
     try:
-        with meta_path.open("r", encoding="utf-8") as f:
-            meta = json.load(f)
-        saved_at = float(meta.get("saved_at", 0))
-        if ttl_seconds > 0 and now - saved_at <= ttl_seconds:
-            with data_path.open("r", encoding="utf-8") as f:
-                cached_data = json.load(f)
-            return cached_data, True
+        entry = get_backend().get(key)
+        if entry is None:
+            return None
+        meta, data = entry
+        return float(meta.get("saved_at", 0)), data
     except Exception:
-        pass
+        logger.debug("Cache read failed for %s", key, exc_info=True)
+        return None
+
 
+def _fetch_and_store(
+    key: str,
+    url: str,
+    ttl_seconds: int,
+    fetcher_callable: Callable[[], Any],
+    on_refresh: Callable[[Any | None, Any], dict[str, Any] | None] | None,
+    previous: Any | None,
+) -> Any:
+    now = time.time()
     fresh_data = fetcher_callable()
 
+    refresh_info: dict[str, Any] | None = None
+    if on_refresh is not None:
+        refresh_info = on_refresh(previous, fresh_data)
+
+    _memory_put(key, now, fresh_data)
+
+    meta = {
+        "saved_at": now,
+        "saved_at_iso": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now)),
+        "ttl_seconds": ttl_seconds,
+        "url": url,
+    }
+    if refresh_info is not None:
+        meta["refresh"] = refresh_info
+
     # Cache write path: write failures should not fail request flow.
     try:
-        with data_path.open("w", encoding="utf-8") as f:
-            json.dump(fresh_data, f, ensure_ascii=False)
-        with meta_path.open("w", encoding="utf-8") as f:
-            json.dump(
-                {
-                    "saved_at": now,
-                    "saved_at_iso": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now)),
-                    "ttl_seconds": ttl_seconds,
-                    "url": url,
-                },
-                f,
-                ensure_ascii=False,
-            )
+        get_backend().set(key, meta, fresh_data)
     except Exception:
-        pass
+        logger.debug("Cache write failed for %s", key, exc_info=True)
+
+    return fresh_data
 
-    return fresh_data, False
+
+def _single_flight(key: str, fn: Callable[[], Any]) -> Any:
+    with _INFLIGHT_LOCK:
+        future = _INFLIGHT.get(key)
+        owner = future is None
+        if owner:
+            future = Future()
+            _INFLIGHT[key] = future
+    assert future is not None
+    if not owner:
+        return future.result()
+
+    try:
+        result = fn()
+    except BaseException as exc:
+        future.set_exception(exc)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.pop(key, None)
+
+
+def _refresh_in_background(
+    executor: Executor,
+    key: str,
+    url: str,
+    ttl_seconds: int,
+    fetcher_callable: Callable[[], Any],
+    on_refresh: Callable[[Any | None, Any], dict[str, Any] | None] | None,
+    previous: Any,
+) -> None:
+    with _INFLIGHT_LOCK:
+        if key in _INFLIGHT:
+            return
+        future: Future = Future()
+        _INFLIGHT[key] = future
+
+    def run() -> None:
+        try:
+            result = _fetch_and_store(key, url, ttl_seconds, fetcher_callable, on_refresh, previous)
+        except Exception as exc:
+            future.set_exception(exc)
+            logger.warning("Background refresh failed for %s: %s", url, exc)
+        else:
+            future.set_result(result)
+        finally:
+            with _INFLIGHT_LOCK:
+                _INFLIGHT.pop(key, None)
+
+    try:
+        executor.submit(run)
+    except RuntimeError:
+        # Executor already shut down; the next caller will fetch inline.
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.pop(key, None)
+
+
+def read_meta(
+    url: str,
+    headers: dict[str, str] | None,
+    cache_key: str | None = None,
+) -> dict[str, Any] | None:
+    """Return the meta dict of a cache entry regardless of its age, or None."""
+    key = _build_cache_key(url, headers, cache_key)
+    try:
+        meta = get_backend().get_meta(key)
+    except Exception:
+        return None
+    return meta if isinstance(meta, dict) else None
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from urllib.parse import unquote, urlparse
+
+if TYPE_CHECKING:
+    import sqlite3
+
+
+class CacheBackend(ABC):
+    """
+    Storage for cache entries: a JSON meta dict plus JSON data per key.
+
+    Implementations must be safe to share between threads. Read errors are
+    reported as misses (None) and write errors are swallowed by the caller,
+    so a broken backend degrades to "no cache" rather than failing requests.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> tuple[dict[str, Any], Any] | None: ...
+
+    def get_meta(self, key: str) -> dict[str, Any] | None:
+        entry = self.get(key)
+        return entry[0] if entry is not None else None
+
+    @abstractmethod
+    def set(self, key: str, meta: dict[str, Any], data: Any) -> None: ...
+
+
+class FileCacheBackend(CacheBackend):
+    """
+    One {key}.json and {key}.meta.json file pair per entry.
+
+    directory=None resolves src.sitegen.cache.CACHE_DIR at call time.
+    """
+
+    def __init__(self, directory: Path | None = None) -> None:
+        self._directory = directory
+
+    @property
+    def directory(self) -> Path:
+        if self._directory is not None:
+            return self._directory
+        from src.sitegen.cache import CACHE_DIR
+
+        return CACHE_DIR
+
+    def get(self, key: str) -> tuple[dict[str, Any], Any] | None:
+        meta = self.get_meta(key)
+        if meta is None:
+            return None
+        data = _read_json(self.directory / f"{key}.json")
+        if data is _MISSING:
+            return None
+        return meta, data
+
+    def get_meta(self, key: str) -> dict[str, Any] | None:
+        meta = _read_json(self.directory / f"{key}.meta.json")
+        return meta if isinstance(meta, dict) else None
+
+    def set(self, key: str, meta: dict[str, Any], data: Any) -> None:
+        directory = self.directory
+        directory.mkdir(parents=True, exist_ok=True)
+        with (directory / f"{key}.json").open("w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        with (directory / f"{key}.meta.json").open("w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    Single SQLite file in WAL mode, shared by every process on the host.
+
+    WAL lets readers proceed while one writer commits, which fits many
+    gunicorn workers reading and occasionally refreshing the same entries.
+    """
+
+    def __init__(self, path: Path, timeout_seconds: float = 5.0) -> None:
+        self.path = path
+        self.timeout_seconds = timeout_seconds
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "key TEXT PRIMARY KEY, meta TEXT NOT NULL, data TEXT NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            import sqlite3
+
+            conn = sqlite3.connect(str(self.path), timeout=self.timeout_seconds)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> tuple[dict[str, Any], Any] | None:
+        row = self._connect().execute(
+            "SELECT meta, data FROM cache_entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), json.loads(row[1])
+
+    def get_meta(self, key: str) -> dict[str, Any] | None:
+        row = self._connect().execute("SELECT meta FROM cache_entries WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def set(self, key: str, meta: dict[str, Any], data: Any) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, meta, data) VALUES (?, ?, ?)",
+                (key, json.dumps(meta, ensure_ascii=False), json.dumps(data, ensure_ascii=False)),
+            )
+
+
+class RedisError(RuntimeError):
+    pass
+
+
+class _RespConnection:
+    """Minimal RESP2 client: enough for AUTH/SELECT/GET/SET/MGET against Redis or compatibles."""
+
+    def __init__(self, host: str, port: int, timeout_seconds: float) -> None:
+        import socket
+
+        self._sock = socket.create_connection((host, port), timeout=timeout_seconds)
+        self._reader = self._sock.makefile("rb")
+
+    def close(self) -> None:
+        try:
+            self._reader.close()
+        finally:
+            self._sock.close()
+
+    def command(self, *args: str | bytes | int) -> Any:
+        parts = [f"*{len(args)}\r\n".encode("ascii")]
+        for arg in args:
+            raw = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+            parts.append(f"${len(raw)}\r\n".encode("ascii"))
+            parts.append(raw)
+            parts.append(b"\r\n")
+        self._sock.sendall(b"".join(parts))
+        return self._read_reply()
+
+    def _read_line(self) -> bytes:
+        line = self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("connection closed by server")
+        return line[:-2]
+
+    def _read_reply(self) -> Any:
+        line = self._read_line()
+        kind, rest = line[:1], line[1:]
+        if kind == b"+":
+            return rest.decode("utf-8")
+        if kind == b"-":
+            raise RedisError(rest.decode("utf-8", "replace"))
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            size = int(rest)
+            if size < 0:
+                return None
+            payload = self._reader.read(size + 2)
+            if len(payload) != size + 2:
+                raise ConnectionError("connection closed by server")
+            return payload[:-2]
+        if kind == b"*":
+            count = int(rest)
+            if count < 0:
+                return None
+            return [self._read_reply() for _ in range(count)]
+        raise RedisError(f"unexpected reply type: {line[:20]!r}")
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Entries in a Redis-protocol server, shared across hosts.
+
+    Meta and data live under "{prefix}{key}:meta" and "{prefix}{key}:data"
+    and expire after entry_ttl_seconds. One connection per thread; a failed
+    connection is dropped and reopened on the next call.
+    """
+
+    def __init__(
+        self,
+        url: str = "redis://127.0.0.1:6379/0",
+        prefix: str = "sitegen:http:",
+        entry_ttl_seconds: int = 7 * 24 * 3600,
+        timeout_seconds: float = 2.0,
+    ) -> None:
+        parsed = urlparse(url)
+        if parsed.scheme != "redis":
+            raise ValueError("Redis cache URL must start with redis://")
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 6379
+        self.db = int((parsed.path or "/0").lstrip("/") or 0)
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.prefix = prefix
+        self.entry_ttl_seconds = entry_ttl_seconds
+        self.timeout_seconds = timeout_seconds
+        self._local = threading.local()
+
+    def _conn(self) -> _RespConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = _RespConnection(self.host, self.port, self.timeout_seconds)
+            if self.password:
+                conn.command("AUTH", self.password)
+            if self.db:
+                conn.command("SELECT", self.db)
+            self._local.conn = conn
+        return conn
+
+    def _command(self, *args: str | bytes | int) -> Any:
+        try:
+            return self._conn().command(*args)
+        except (OSError, ConnectionError):
+            conn = getattr(self._local, "conn", None)
+            self._local.conn = None
+            if conn is not None:
+                conn.close()
+            raise
+
+    def get(self, key: str) -> tuple[dict[str, Any], Any] | None:
+        meta_raw, data_raw = self._command("MGET", f"{self.prefix}{key}:meta", f"{self.prefix}{key}:data")
+        if meta_raw is None or data_raw is None:
+            return None
+        return json.loads(meta_raw), json.loads(data_raw)
+
+    def get_meta(self, key: str) -> dict[str, Any] | None:
+        raw = self._command("GET", f"{self.prefix}{key}:meta")
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, meta: dict[str, Any], data: Any) -> None:
+        # Data first, so a reader never sees fresh meta next to missing data.
+        self._command(
+            "SET",
+            f"{self.prefix}{key}:data",
+            json.dumps(data, ensure_ascii=False),
+            "EX",
+            self.entry_ttl_seconds,
+        )
+        self._command(
+            "SET",
+            f"{self.prefix}{key}:meta",
+            json.dumps(meta, ensure_ascii=False),
+            "EX",
+            self.entry_ttl_seconds,
+        )
+
+
+def backend_from_env() -> CacheBackend:
+    """
+    Build the backend selected by CACHE_BACKEND: "file" (default), "sqlite" or "redis".
+
+    CACHE_SQLITE_PATH and CACHE_REDIS_URL configure the shared backends.
+    """
+    kind = (os.getenv("CACHE_BACKEND") or "file").strip().lower()
+    if kind == "file":
+        return FileCacheBackend()
+    if kind == "sqlite":
+        return SQLiteCacheBackend(Path((os.getenv("CACHE_SQLITE_PATH") or ".cache/http.sqlite3").strip()))
+    if kind == "redis":
+        return RedisCacheBackend((os.getenv("CACHE_REDIS_URL") or "redis://127.0.0.1:6379/0").strip())
+    raise RuntimeError(f"Unsupported CACHE_BACKEND: {kind!r} (expected file, sqlite or redis)")
+
+
+_MISSING = object()
+
+
+def _read_json(path: Path) -> Any:
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return _MISSING
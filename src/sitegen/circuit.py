@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from src.sitegen import metrics
+
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a host whose circuit is open."""
+
+    def __init__(self, host: str, retry_in: float) -> None:
+        super().__init__(f"Circuit open for {host}; next probe in {retry_in:.0f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+
+@dataclass(frozen=True)
+class CircuitConfig:
+    # Outcomes of the last `window` calls decide whether the circuit opens.
+    window: int = 20
+    min_calls: int = 5
+    failure_rate: float = 0.5
+    # How long an open circuit rejects calls before letting one probe through.
+    open_seconds: float = 30.0
+
+
+def config_from_env() -> CircuitConfig:
+    """CIRCUIT_WINDOW, CIRCUIT_MIN_CALLS, CIRCUIT_FAILURE_RATE and CIRCUIT_OPEN_SECONDS."""
+    defaults = CircuitConfig()
+    return CircuitConfig(
+        window=int((os.getenv("CIRCUIT_WINDOW") or str(defaults.window)).strip()),
+        min_calls=int((os.getenv("CIRCUIT_MIN_CALLS") or str(defaults.min_calls)).strip()),
+        failure_rate=float((os.getenv("CIRCUIT_FAILURE_RATE") or str(defaults.failure_rate)).strip()),
+        open_seconds=float((os.getenv("CIRCUIT_OPEN_SECONDS") or str(defaults.open_seconds)).strip()),
+    )
+
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker for one host.
+
+    Closed: calls go through and their outcomes fill a rolling window; once
+    it holds at least min_calls outcomes with a failure share of
+    failure_rate or more, the circuit opens. Open: before_call() raises
+    CircuitOpenError for open_seconds. Half-open: a single probe call is let
+    through; its success closes the circuit, its failure reopens it.
+    """
+
+    def __init__(self, host: str, config: CircuitConfig | None = None) -> None:
+        self.host = host
+        self.config = config or CircuitConfig()
+        self._lock = threading.Lock()
+        self._outcomes: deque[bool] = deque(maxlen=self.config.window)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self._state == CLOSED:
+                return
+            now = time.monotonic()
+            if self._state == OPEN:
+                remaining = self._opened_at + self.config.open_seconds - now
+                if remaining > 0:
+                    metrics.inc("sitegen_circuit_rejected_total", host=self.host)
+                    raise CircuitOpenError(self.host, remaining)
+                self._transition(HALF_OPEN)
+            if self._probing:
+                metrics.inc("sitegen_circuit_rejected_total", host=self.host)
+                raise CircuitOpenError(self.host, 0)
+            self._probing = True
+
+    def record(self, success: bool) -> None:
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probing = False
+                self._outcomes.clear()
+                if success:
+                    self._transition(CLOSED)
+                else:
+                    self._open()
+                return
+            if self._state == OPEN:
+                return
+            self._outcomes.append(success)
+            failures = self._outcomes.count(False)
+            if len(self._outcomes) >= self.config.min_calls and failures >= self.config.failure_rate * len(self._outcomes):
+                self._open()
+
+    def _open(self) -> None:
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self._transition(OPEN)
+        logger.warning("Circuit opened for %s for %.0fs", self.host, self.config.open_seconds)
+
+    def _transition(self, state: str) -> None:
+        self._state = state
+        metrics.inc("sitegen_circuit_transitions_total", host=self.host, state=state)
+
+
+_BREAKERS: dict[str, CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+# Read from the environment when the first breaker is created, not at import.
+_config: CircuitConfig | None = None
+
+
+def configure(config: CircuitConfig) -> None:
+    """Use config for breakers created from now on."""
+    global _config
+    _config = config
+
+
+def _current_config() -> CircuitConfig:
+    global _config
+    if _config is None:
+        try:
+            _config = config_from_env()
+        except ValueError as exc:
+            logger.warning("Invalid CIRCUIT_* setting (%s); using defaults", exc)
+            _config = CircuitConfig()
+    return _config
+
+
+def breaker_for(host: str) -> CircuitBreaker:
+    """The process-wide breaker for host, shared by every client and thread."""
+    with _BREAKERS_LOCK:
+        breaker = _BREAKERS.get(host)
+        if breaker is None:
+            breaker = _BREAKERS[host] = CircuitBreaker(host, _current_config())
+        return breaker
+
+
+def reset() -> None:
+    """Forget every breaker (tests, or after a configuration change)."""
+    with _BREAKERS_LOCK:
+        _BREAKERS.clear()
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import logging
+import os
+import signal
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from src.sitegen import profiling
+from src.sitegen.build import (
+    BuildContext,
+    build_days,
+    compact_history,
+    create_context,
+    prepare_dist,
+    site_variants,
+    write_site_files,
+)
+from src.sitegen.dates import DayRange
+from src.sitegen.schedule import RefreshSchedule
+from src.sitegen.variants import plan_ranges
+
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on a single sleep, so day-boundary rollovers are noticed promptly.
+MAX_SLEEP_SECONDS = 30.0
+
+
+@dataclass(frozen=True)
+class DaemonConfig:
+    today_interval_seconds: int
+    other_interval_seconds: int
+
+
+def _load_daemon_config() -> DaemonConfig:
+    today_interval = int((os.getenv("DAEMON_TODAY_INTERVAL_SECONDS") or "60").strip())
+    other_interval = int((os.getenv("DAEMON_OTHER_INTERVAL_SECONDS") or "900").strip())
+    if today_interval <= 0 or other_interval <= 0:
+        raise RuntimeError("DAEMON_*_INTERVAL_SECONDS must be positive")
+    return DaemonConfig(today_interval_seconds=today_interval, other_interval_seconds=other_interval)
+
+
+def _build_schedule(daemon_cfg: DaemonConfig) -> RefreshSchedule:
+    return RefreshSchedule(
+        {
+            "yesterday": daemon_cfg.other_interval_seconds,
+            "today": daemon_cfg.today_interval_seconds,
+            "tomorrow": daemon_cfg.other_interval_seconds,
+        }
+    )
+
+
+def run_once(
+    ctx: BuildContext,
+    schedule: RefreshSchedule,
+    current_ranges: dict[str, DayRange],
+) -> int:
+    """
+    Refresh every due day once. Returns the number of pages rewritten.
+
+    A slug whose day range moved in any variant (UTC or local midnight
+    passed) is refreshed immediately regardless of its cadence. Each slug is
+    fetched once for all variants.
+    """
+    cfg = ctx.cfg
+    now = datetime.now(timezone.utc)
+    ranges = {variant.page(dr.slug): dr for variant, dr in plan_ranges(site_variants(cfg), cfg.day_mode, now)}
+    for page, dr in ranges.items():
+        if current_ranges.get(page) != dr:
+            schedule.force(dr.slug)
+
+    rendered = 0
+    for slug in schedule.due():
+        # Let the schedule, not the cache TTL, decide freshness: the entry must
+        # expire by the time this slug is due again.
+        ttl_seconds = max(1, int(schedule.intervals[slug]) - 1)
+        try:
+            rendered += len(build_days(ctx, [slug], ttl_seconds=ttl_seconds, now_utc=now))
+        except Exception:
+            logger.exception("Daemon refresh failed for %s", slug)
+        current_ranges.update({page: dr for page, dr in ranges.items() if dr.slug == slug})
+        schedule.mark_done(slug)
+
+    if rendered:
+        write_site_files(ctx, list(ranges))
+    compact_history(ctx)
+    return rendered
+
+
+def run_daemon(
+    ctx: BuildContext | None = None,
+    daemon_cfg: DaemonConfig | None = None,
+    stop_event: threading.Event | None = None,
+) -> None:
+    ctx = ctx or create_context()
+    daemon_cfg = daemon_cfg or _load_daemon_config()
+    stop = stop_event or threading.Event()
+
+    prepare_dist(ctx.cfg)
+    schedule = _build_schedule(daemon_cfg)
+    current_ranges: dict[str, DayRange] = {}
+
+    logger.info(
+        "Daemon started: today every %ds, yesterday/tomorrow every %ds, output=%s",
+        daemon_cfg.today_interval_seconds,
+        daemon_cfg.other_interval_seconds,
+        ctx.cfg.dist_dir,
+    )
+
+    while not stop.is_set():
+        rendered = run_once(ctx, schedule, current_ranges)
+        if rendered:
+            logger.info("Daemon tick: pages rewritten=%d", rendered)
+        stop.wait(min(schedule.seconds_until_next(), MAX_SLEEP_SECONDS))
+
+    logger.info("Daemon stopped")
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    profiling.configure_from_env()
+    stop = threading.Event()
+
+    def _handle_signal(signum: int, _frame: object) -> None:
+        logger.info("Received signal %d, shutting down", signum)
+        stop.set()
+
+    signal.signal(signal.SIGTERM, _handle_signal)
+    signal.signal(signal.SIGINT, _handle_signal)
+    run_daemon(stop_event=stop)
+
+
+if __name__ == "__main__":
+    main()
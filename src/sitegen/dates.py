@@ -1,7 +1,7 @@
 ﻿from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 
 
@@ -56,28 +56,32 @@ def get_day_ranges(
     ranges: list[DayRange] = []
     for slug, label_ru, delta in specs:
         if mode == "utc":
-            day_utc = (base_now_utc + timedelta(days=delta)).date()
-            start_utc = datetime(day_utc.year, day_utc.month, day_utc.day, tzinfo=timezone.utc)
-            end_utc = start_utc + timedelta(days=1)
-            display_local_date = start_utc.astimezone(tz).date().isoformat()
+            day = (base_now_utc + timedelta(days=delta)).date()
         else:
-            day_local = (local_now + timedelta(days=delta)).replace(
-                hour=0,
-                minute=0,
-                second=0,
-                microsecond=0,
-            )
-            start_utc, end_utc = _day_bounds_utc_from_local_day(day_local, tz)
-            display_local_date = day_local.date().isoformat()
-
-        ranges.append(
-            DayRange(
-                slug=slug,
-                label_ru=label_ru,
-                start_dt_utc=start_utc,
-                end_dt_utc=end_utc,
-                date_str_display=display_local_date,
-            )
-        )
+            day = (local_now + timedelta(days=delta)).date()
+        ranges.append(day_range_for_date(day, mode, tz_name, slug=slug, label_ru=label_ru))
 
     return ranges
+
+
+def day_range_for_date(day: date, mode: str, tz_name: str, slug: str, label_ru: str) -> DayRange:
+    """The DayRange of calendar day `day` (a UTC day in "utc" mode, a tz_name day in "local" mode)."""
+    if mode not in {"utc", "local"}:
+        raise ValueError("mode must be 'utc' or 'local'")
+
+    tz = ZoneInfo(tz_name)
+    if mode == "utc":
+        start_utc = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+        end_utc = start_utc + timedelta(days=1)
+        display_local_date = start_utc.astimezone(tz).date().isoformat()
+    else:
+        start_utc, end_utc = _day_bounds_utc_from_local_day(datetime(day.year, day.month, day.day), tz)
+        display_local_date = day.isoformat()
+
+    return DayRange(
+        slug=slug,
+        label_ru=label_ru,
+        start_dt_utc=start_utc,
+        end_dt_utc=end_utc,
+        date_str_display=display_local_date,
+    )
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+# Fields whose changes are reported individually. Any other difference in a
+# normalized match is reported under the catch-all "details" field.
+TRACKED_FIELDS = (
+    "status",
+    "score_str",
+    "begin_at",
+    "end_at",
+    "is_rescheduled",
+    "original_scheduled_at",
+)
+
+
+@dataclass(frozen=True)
+class MatchChange:
+    id: Any
+    fields: dict[str, tuple[Any, Any]]
+
+    @property
+    def rescheduled(self) -> bool:
+        return "begin_at" in self.fields or "is_rescheduled" in self.fields
+
+
+@dataclass(frozen=True)
+class MatchDiff:
+    added: list[Any] = field(default_factory=list)
+    removed: list[Any] = field(default_factory=list)
+    changed: list[MatchChange] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+    def restricted_to(self, keys: set[Any]) -> MatchDiff:
+        """Only the entries whose match id is in keys."""
+        return MatchDiff(
+            added=[k for k in self.added if k in keys],
+            removed=[k for k in self.removed if k in keys],
+            changed=[c for c in self.changed if c.id in keys],
+        )
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "added": list(self.added),
+            "removed": list(self.removed),
+            "changed": [
+                {
+                    "id": change.id,
+                    "rescheduled": change.rescheduled,
+                    "fields": {name: {"old": old, "new": new} for name, (old, new) in change.fields.items()},
+                }
+                for change in self.changed
+            ],
+        }
+
+
+def _match_key(match: dict[str, Any]) -> Any:
+    match_id = match.get("id")
+    if match_id is not None:
+        return match_id
+    return f"{match.get('title') or ''}@{match.get('begin_at') or ''}"
+
+
+def _index(matches: Iterable[dict[str, Any]]) -> dict[Any, dict[str, Any]]:
+    return {_match_key(m): m for m in matches if isinstance(m, dict)}
+
+
+def diff_matches(old: Iterable[dict[str, Any]], new: Iterable[dict[str, Any]]) -> MatchDiff:
+    """
+    Compare two sets of normalized matches keyed by id.
+
+    Order of the inputs does not matter. Ids in the result keep the order of
+    the new set (added/changed) or the old set (removed).
+    """
+    old_by_key = _index(old)
+    new_by_key = _index(new)
+
+    added = [key for key in new_by_key if key not in old_by_key]
+    removed = [key for key in old_by_key if key not in new_by_key]
+
+    changed: list[MatchChange] = []
+    for key, new_match in new_by_key.items():
+        old_match = old_by_key.get(key)
+        if old_match is None or old_match == new_match:
+            continue
+        fields = {
+            name: (old_match.get(name), new_match.get(name))
+            for name in TRACKED_FIELDS
+            if old_match.get(name) != new_match.get(name)
+        }
+        if not fields:
+            fields["details"] = (None, None)
+        changed.append(MatchChange(id=key, fields=fields))
+
+    return MatchDiff(added=added, removed=removed, changed=changed)
@@ -0,0 +1,410 @@
+from __future__ import annotations
+
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from src.sitegen import metrics
+
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_MAX_BYTES = 8 * 1024 * 1024
+# Compaction folds sealed segments once there are at least this many...
+COMPACT_MIN_SEGMENTS = 4
+# ...and leaves segments written to this recently alone, in case another
+# process still appends to one it believed was active.
+COMPACT_QUIET_SECONDS = 60.0
+# Folded days kept in memory per store.
+STATE_CACHE_DAYS = 64
+# Reads rescan the directory for segments at most this often; writes always do.
+REFRESH_INTERVAL_SECONDS = 5.0
+
+# A UTC day is final, i.e. served from history instead of the API, once it
+# has been over for SETTLE_SECONDS with every match settled, or for
+# MAX_OPEN_SECONDS whatever the statuses say.
+SETTLED_STATUSES = frozenset({"finished", "canceled", "cancelled", "postponed"})
+SETTLE_SECONDS = 6 * 3600
+MAX_OPEN_SECONDS = 3 * 86400
+
+# Version of the recorded match shape. Bump it when normalize_match() output
+# changes: days recorded in another version are never final, so they are
+# fetched again and re-recorded as a snapshot.
+FORMAT_VERSION = 1
+
+# Record: header, then a zlib-compressed JSON payload {"v": FORMAT_VERSION, "upsert": [...], "removed": [...]}.
+_HEADER = struct.Struct("<4sIIIB")  # magic, payload length, payload crc32, day ordinal, flags
+_MAGIC = b"MHS1"
+FLAG_SNAPSHOT = 1  # the payload replaces the day's state instead of updating it
+FLAG_FINAL = 2  # the day is complete
+_SEGMENT_RE = re.compile(r"(\d{8})(?:-(\d+))?\.seg")
+
+
+@dataclass
+class _Segment:
+    path: Path
+    # Bytes scanned so far and the records found in them: day ordinal -> [(offset, length, flags)].
+    scanned: int = 0
+    records: dict[int, list[tuple[int, int, int]]] = field(default_factory=dict)
+
+
+@dataclass
+class _DayState:
+    matches: dict[str, dict[str, Any]]
+    final: bool
+    # Some record since the last snapshot has another FORMAT_VERSION.
+    outdated: bool = False
+
+
+def _segment_key(path: Path) -> tuple[int, int]:
+    m = _SEGMENT_RE.fullmatch(path.name)
+    assert m is not None
+    return int(m.group(1)), int(m.group(2) or 0)
+
+
+def _segment_name(seq: int, generation: int = 0) -> str:
+    return f"{seq:08d}-{generation}.seg" if generation else f"{seq:08d}.seg"
+
+
+def match_key(match: dict[str, Any]) -> str:
+    match_id = match.get("id")
+    if match_id is not None:
+        return str(match_id)
+    return f"{match.get('begin_at') or ''}|{match.get('title') or ''}"
+
+
+def _begin_at(match: dict[str, Any]) -> datetime | None:
+    value = match.get("begin_at")
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _over_for(day: date, now_utc: datetime | None) -> float:
+    now = now_utc or datetime.now(timezone.utc)
+    return (now - datetime(day.year, day.month, day.day, tzinfo=timezone.utc) - timedelta(days=1)).total_seconds()
+
+
+def may_be_final(day: date, now_utc: datetime | None = None) -> bool:
+    """Whether UTC day `day` ended long enough ago to be final, so the history is worth asking."""
+    return _over_for(day, now_utc) >= SETTLE_SECONDS
+
+
+def day_is_settled(day: date, matches: list[dict[str, Any]], now_utc: datetime | None = None) -> bool:
+    """Whether UTC day `day` can no longer change upstream (see SETTLE_SECONDS)."""
+    over_for = _over_for(day, now_utc)
+    if over_for >= MAX_OPEN_SECONDS:
+        return True
+    # An empty day is only trusted once MAX_OPEN_SECONDS have passed.
+    return over_for >= SETTLE_SECONDS and bool(matches) and all(
+        str(m.get("status") or "").lower() in SETTLED_STATUSES for m in matches
+    )
+
+
+class HistoryStore:
+    """
+    Append-only history of normalized matches per UTC day, in compressed segment files.
+
+    record_day() appends only what changed since the day's last record (new
+    or changed matches by match_key(), and removed keys), so unchanged
+    refreshes cost nothing. Segments ({seq}.seg) roll over at
+    segment_max_bytes and are read through mmap: a day is rebuilt by
+    decompressing its records only, located by a header scan that is done
+    once per segment and then only for newly appended bytes. Reads look for
+    other processes' appends at most every refresh_interval seconds.
+
+    compact() folds sealed segments into one that holds a single snapshot
+    record per day. It sorts after the segments it replaces, so readers in
+    other processes see consistent data whether or not they have noticed the
+    swap. One writer per process is expected; records are appended with a
+    single write, and a torn tail left by a crash is skipped by rolling over
+    to a new segment.
+
+    Returned matches are shared with the store's cache and must be treated
+    as read-only.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        segment_max_bytes: int = SEGMENT_MAX_BYTES,
+        refresh_interval: float = REFRESH_INTERVAL_SECONDS,
+    ) -> None:
+        self.directory = directory
+        self.segment_max_bytes = segment_max_bytes
+        self.refresh_interval = refresh_interval
+        self._refreshed_at: float | None = None
+        self._lock = threading.RLock()
+        self._segments: dict[str, _Segment] = {}
+        self._order: list[_Segment] = []
+        self._states: OrderedDict[int, tuple[tuple[Any, ...], _DayState]] = OrderedDict()
+
+    # Reading.
+
+    def _refresh(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and self._refreshed_at is not None and now - self._refreshed_at < self.refresh_interval:
+            return
+        self._refreshed_at = now
+        paths = sorted(
+            (p for p in self.directory.glob("*.seg") if _SEGMENT_RE.fullmatch(p.name)) if self.directory.is_dir() else (),
+            key=_segment_key,
+        )
+        self._segments = {p.name: self._segments.get(p.name) or _Segment(p) for p in paths}
+        self._order = [self._segments[p.name] for p in paths]
+        for segment in self._order:
+            self._scan(segment)
+
+    def _scan(self, segment: _Segment) -> None:
+        try:
+            with segment.path.open("rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if size <= segment.scanned:
+                    return
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    pos = segment.scanned
+                    while pos + _HEADER.size <= size:
+                        magic, length, _crc, ordinal, flags = _HEADER.unpack_from(mm, pos)
+                        end = pos + _HEADER.size + length
+                        # A bad magic or a record running past the end is a
+                        # write in progress or a torn tail; stop before it.
+                        if magic != _MAGIC or end > size:
+                            break
+                        segment.records.setdefault(ordinal, []).append((pos, length, flags))
+                        pos = end
+                    segment.scanned = pos
+        except FileNotFoundError:
+            pass
+
+    def _day_state(self, day: date) -> _DayState | None:
+        self._refresh()
+        ordinal = day.toordinal()
+        located = [(segment, segment.records[ordinal]) for segment in self._order if ordinal in segment.records]
+        if not located:
+            return None
+        signature = tuple((segment.path.name, len(records)) for segment, records in located)
+        cached = self._states.get(ordinal)
+        if cached is not None and cached[0] == signature:
+            self._states.move_to_end(ordinal)
+            return cached[1]
+
+        # Only the records from the last snapshot on matter.
+        start = 0
+        for i, (_segment, records) in enumerate(located):
+            if any(flags & FLAG_SNAPSHOT for _offset, _length, flags in records):
+                start = i
+        state = _DayState(matches={}, final=False)
+        for segment, records in located[start:]:
+            try:
+                self._apply(segment, records, state)
+            except FileNotFoundError:
+                # Compacted away meanwhile: rescan and fold from its replacement.
+                self._segments.clear()
+                self._states.pop(ordinal, None)
+                self._refresh(force=True)
+                return self._day_state(day)
+
+        self._states[ordinal] = (signature, state)
+        self._states.move_to_end(ordinal)
+        while len(self._states) > STATE_CACHE_DAYS:
+            self._states.popitem(last=False)
+        return state
+
+    def _apply(self, segment: _Segment, records: list[tuple[int, int, int]], state: _DayState) -> None:
+        with segment.path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for offset, length, flags in records:
+                _magic, _length, crc, _ordinal, _flags = _HEADER.unpack_from(mm, offset)
+                body = mm[offset + _HEADER.size : offset + _HEADER.size + length]
+                if zlib.crc32(body) != crc:
+                    logger.warning("Skipping corrupt history record at %s:%d", segment.path, offset)
+                    continue
+                payload = json.loads(zlib.decompress(body))
+                if flags & FLAG_SNAPSHOT:
+                    state.matches = {}
+                    state.outdated = False
+                state.outdated = state.outdated or payload.get("v") != FORMAT_VERSION
+                for key in payload.get("removed", ()):
+                    state.matches.pop(key, None)
+                for match in payload.get("upsert", ()):
+                    state.matches[match_key(match)] = match
+                state.final = bool(flags & FLAG_FINAL) or (state.final and not (flags & FLAG_SNAPSHOT))
+
+    def day(self, day: date) -> list[dict[str, Any]] | None:
+        """Matches of UTC day `day` sorted by begin_at, or None if the day was never recorded."""
+        with self._lock:
+            state = self._day_state(day)
+        if state is None:
+            return None
+        return sorted(state.matches.values(), key=lambda m: m.get("begin_at") or "")
+
+    def final_day(self, day: date) -> list[dict[str, Any]] | None:
+        """Like day(), but None unless the day was recorded as final in the current FORMAT_VERSION."""
+        with self._lock:
+            state = self._day_state(day)
+        if state is None or not state.final or state.outdated:
+            return None
+        return sorted(state.matches.values(), key=lambda m: m.get("begin_at") or "")
+
+    def days(self) -> list[date]:
+        with self._lock:
+            self._refresh()
+            return sorted({date.fromordinal(o) for segment in self._order for o in segment.records})
+
+    def matches_between(self, start_utc: datetime, end_utc: datetime) -> list[dict[str, Any]]:
+        """Recorded matches beginning in [start_utc, end_utc), sorted by begin_at."""
+        found: dict[str, dict[str, Any]] = {}
+        day = start_utc.astimezone(timezone.utc).date()
+        last = (end_utc.astimezone(timezone.utc) - timedelta(microseconds=1)).date()
+        while day <= last:
+            for match in self.day(day) or ():
+                begin = _begin_at(match)
+                if begin is not None and start_utc <= begin < end_utc:
+                    # A rescheduled match may be on two days; the later day wins.
+                    found[match_key(match)] = match
+            day += timedelta(days=1)
+        return sorted(found.values(), key=lambda m: m.get("begin_at") or "")
+
+    # Writing.
+
+    def record_day(self, day: date, matches: list[dict[str, Any]], final: bool = False) -> bool:
+        """Append the changes of UTC day `day` against its recorded state. Returns whether anything was written."""
+        fresh = {match_key(m): m for m in matches}
+        with self._lock:
+            # Deltas must be taken against everything appended so far, by any process.
+            self._refresh(force=True)
+            state = self._day_state(day)
+            snapshot = state is None or state.outdated
+            if snapshot:
+                upsert, removed = list(fresh.values()), []
+            else:
+                # Once final, a day stays final.
+                final = final or state.final
+                upsert = [m for key, m in fresh.items() if state.matches.get(key) != m]
+                removed = [key for key in state.matches if key not in fresh]
+                if not upsert and not removed and final == state.final:
+                    return False
+            flags = (FLAG_SNAPSHOT if snapshot else 0) | (FLAG_FINAL if final else 0)
+            self._append(day, {"v": FORMAT_VERSION, "upsert": upsert, "removed": removed}, flags)
+        return True
+
+    def _encode(self, day: date, payload: dict[str, Any], flags: int) -> bytes:
+        body = zlib.compress(json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        return _HEADER.pack(_MAGIC, len(body), zlib.crc32(body), day.toordinal(), flags) + body
+
+    def _append(self, day: date, payload: dict[str, Any], flags: int) -> None:
+        record = self._encode(day, payload, flags)
+        active = self._order[-1] if self._order else None
+        if (
+            active is None
+            or active.scanned >= self.segment_max_bytes
+            or active.scanned != _file_size(active.path)
+        ):
+            # Roll over when full, and past a torn tail nothing could be read beyond.
+            seq = _segment_key(active.path)[0] + 1 if active is not None else 1
+            active = _Segment(self.directory / _segment_name(seq))
+            self.directory.mkdir(parents=True, exist_ok=True)
+        _write_all(active.path, record)
+        self._refresh(force=True)
+        metrics.inc("sitegen_history_appends_total", kind="snapshot" if flags & FLAG_SNAPSHOT else "delta")
+        metrics.inc("sitegen_history_append_bytes_total", len(record))
+
+    # Compaction.
+
+    def compact(self) -> int:
+        """Fold sealed segments into one snapshot segment. Returns how many segments it replaced."""
+        with self._lock:
+            self._refresh(force=True)
+            quiet_before = time.time() - COMPACT_QUIET_SECONDS
+            sealed: list[_Segment] = []
+            # A prefix of segments, never the active (last) one or a recently written one.
+            for segment in self._order[:-1]:
+                try:
+                    if segment.path.stat().st_mtime > quiet_before:
+                        break
+                except FileNotFoundError:
+                    break
+                sealed.append(segment)
+            if len(sealed) < 2:
+                return 0
+
+            states: dict[int, _DayState] = {}
+            for segment in sealed:
+                for ordinal, records in segment.records.items():
+                    state = states.setdefault(ordinal, _DayState(matches={}, final=False))
+                    self._apply(segment, records, state)
+
+            seq, generation = _segment_key(sealed[-1].path)
+            target = self.directory / _segment_name(seq, generation + 1)
+            tmp = self.directory / f".{target.name}.tmp"
+            with tmp.open("wb") as f:
+                for ordinal in sorted(states):
+                    state = states[ordinal]
+                    flags = FLAG_SNAPSHOT | (FLAG_FINAL if state.final else 0)
+                    payload: dict[str, Any] = {"upsert": list(state.matches.values())}
+                    # An outdated day stays outdated; compaction does not upgrade it.
+                    if not state.outdated:
+                        payload["v"] = FORMAT_VERSION
+                    f.write(self._encode(date.fromordinal(ordinal), payload, flags))
+            os.replace(tmp, target)
+            before = sum(_file_size(segment.path) for segment in sealed)
+            for segment in sealed:
+                segment.path.unlink(missing_ok=True)
+            self._segments.clear()
+            self._states.clear()
+            self._refresh(force=True)
+
+        metrics.inc("sitegen_history_compactions_total")
+        logger.info(
+            "Compacted %d history segments: %d -> %d bytes", len(sealed), before, _file_size(target)
+        )
+        return len(sealed)
+
+    def maybe_compact(self, min_segments: int = COMPACT_MIN_SEGMENTS) -> int:
+        with self._lock:
+            self._refresh(force=True)
+            if len(self._order) < min_segments:
+                return 0
+        return self.compact()
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def _write_all(path: Path, data: bytes) -> None:
+    # One O_APPEND write per record, so concurrent readers never see records interleave.
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
+
+
+def record_fetched_day(
+    store: HistoryStore, day: date, matches: list[dict[str, Any]], now_utc: datetime | None = None
+) -> None:
+    """record_day() with finality from day_is_settled(); storage errors are logged, not raised."""
+    try:
+        store.record_day(day, matches, final=day_is_settled(day, matches, now_utc))
+    except (OSError, ValueError) as exc:
+        logger.warning("Could not record %s in match history: %s", day.isoformat(), exc)
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from typing import Any
+
+DEFAULT_LOCALE = "ru"
+
+# Strings of the static day template and its SEO fields, per locale.
+MESSAGES: dict[str, dict[str, Any]] = {
+    "ru": {
+        "days": {"yesterday": "Вчера", "today": "Сегодня", "tomorrow": "Завтра"},
+        "title": "{day}: киберспортивные матчи",
+        "game_title": "{day}: {game}: матчи",
+        "description": "Расписание и результаты киберспортивных матчей за {day}.",
+        "game_description": "Расписание и результаты матчей по {game} за {day}.",
+        "all_games": "Все игры",
+        "generated": "Сгенерировано",
+        "search_placeholder": "Поиск команды, игры, лиги",
+        "not_found": "Матчи не найдены",
+        "watch": "Watch",
+    },
+    "en": {
+        "days": {"yesterday": "Yesterday", "today": "Today", "tomorrow": "Tomorrow"},
+        "title": "{day}: esports matches",
+        "game_title": "{day}: {game} matches",
+        "description": "Esports match schedule and results for {day}.",
+        "game_description": "{game} match schedule and results for {day}.",
+        "all_games": "All games",
+        "generated": "Generated",
+        "search_placeholder": "Search teams, games, leagues",
+        "not_found": "No matches found",
+        "watch": "Watch",
+    },
+}
+
+
+def messages(locale: str) -> dict[str, Any]:
+    try:
+        return MESSAGES[locale]
+    except KeyError:
+        raise ValueError(f"Unsupported locale: {locale!r} (expected one of {', '.join(sorted(MESSAGES))})") from None
@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+from urllib.parse import urlparse
+
+from src.sitegen import metrics
+from src.sitegen.circuit import breaker_for
+
+if TYPE_CHECKING:
+    import requests
+
+
+logger = logging.getLogger(__name__)
+
+DIGEST_LENGTH = 32
+MAX_IMAGE_BYTES = 2 * 1024 * 1024
+# Registrations remembered in memory; the store directory holds all of them.
+MAX_REGISTERED_URLS = 50_000
+# A registration whose image is not cached is dropped once it has not been
+# renewed for this long; pages in use renew theirs at most once per
+# REGISTRATION_RENEW_SECONDS. Stores sweep at most every REGISTRATION_SWEEP_SECONDS.
+REGISTRATION_MAX_AGE_SECONDS = 30 * 86400.0
+REGISTRATION_RENEW_SECONDS = 86400.0
+REGISTRATION_SWEEP_SECONDS = 3600.0
+# Upstream failures are not retried for this long, so a broken logo on a busy
+# page does not turn every page view into an upstream request.
+FAILURE_TTL_SECONDS = 300.0
+
+Fetcher = Callable[[str], tuple[bytes, str]]
+
+
+@dataclass(frozen=True)
+class StoredImage:
+    content: bytes
+    content_type: str
+    etag: str
+
+
+def image_digest(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()[:DIGEST_LENGTH]
+
+
+def _touch(path: Path) -> None:
+    # An explicit fine-grained time: implicit mtimes come from a coarse clock,
+    # which would leave quick successive writes and hits unordered.
+    now = time.time()
+    os.utime(path, (now, now))
+
+
+class ImageStore:
+    """
+    Images on disk as {digest}.bin with a {digest}.json sidecar, bounded to max_bytes.
+
+    All state lives in the directory, so the worker processes of one host
+    can share a store: recency is the .bin modification time (touched on
+    every hit), and after each write the directory is scanned and the least
+    recently used images are evicted until the total fits. URLs the proxy
+    may fetch are registered as {digest}.url files; those without a cached
+    image are pruned once older than registration_max_age.
+    """
+
+    def __init__(
+        self, directory: Path, max_bytes: int, registration_max_age: float = REGISTRATION_MAX_AGE_SECONDS
+    ) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.registration_max_age = registration_max_age
+        self._swept_at: float | None = None
+
+    def _entries(self) -> list[tuple[float, str, int]]:
+        entries = []
+        for path in self.directory.glob("*.bin") if self.directory.is_dir() else ():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+        return sorted(entries)
+
+    def get(self, digest: str) -> StoredImage | None:
+        try:
+            content = (self.directory / f"{digest}.bin").read_bytes()
+            meta = json.loads((self.directory / f"{digest}.json").read_text(encoding="utf-8"))
+            _touch(self.directory / f"{digest}.bin")
+        except (OSError, ValueError):
+            return None
+        return StoredImage(content=content, content_type=meta["content_type"], etag=meta["etag"])
+
+    def put(self, digest: str, url: str, image: StoredImage) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        meta = {"url": url, "content_type": image.content_type, "etag": image.etag}
+        # Sidecar first: a .bin file is only served once complete.
+        (self.directory / f"{digest}.json").write_text(json.dumps(meta), encoding="utf-8")
+        tmp = self.directory / f".{digest}.{os.getpid()}.tmp"
+        tmp.write_bytes(image.content)
+        os.replace(tmp, self.directory / f"{digest}.bin")
+        _touch(self.directory / f"{digest}.bin")
+        self._evict()
+        self._maybe_prune_registrations()
+
+    def _evict(self) -> None:
+        entries = self._entries()
+        total = sum(size for _mtime, _digest, size in entries)
+        # The newest entry (the one just written) is always kept.
+        for _mtime, old, size in entries[:-1]:
+            if total <= self.max_bytes:
+                break
+            total -= size
+            for suffix in (".bin", ".json"):
+                (self.directory / f"{old}{suffix}").unlink(missing_ok=True)
+            metrics.inc("sitegen_image_cache_evictions_total")
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(size for _mtime, _digest, size in self._entries())
+
+    def register(self, digest: str, url: str) -> None:
+        """Record url as fetchable under digest, or renew an existing registration."""
+        path = self.directory / f"{digest}.url"
+        try:
+            if time.time() - path.stat().st_mtime >= REGISTRATION_RENEW_SECONDS:
+                _touch(path)
+            return
+        except FileNotFoundError:
+            pass
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.directory / f".{digest}.{os.getpid()}.url.tmp"
+        tmp.write_text(url, encoding="utf-8")
+        os.replace(tmp, path)
+        self._maybe_prune_registrations()
+
+    def _maybe_prune_registrations(self) -> None:
+        now = time.monotonic()
+        if self._swept_at is not None and now - self._swept_at < REGISTRATION_SWEEP_SECONDS:
+            return
+        self._swept_at = now
+        self.prune_registrations()
+
+    def prune_registrations(self) -> int:
+        """Delete registrations without a cached image not renewed for registration_max_age. Returns how many."""
+        cutoff = time.time() - self.registration_max_age
+        pruned = 0
+        for path in self.directory.glob("*.url") if self.directory.is_dir() else ():
+            try:
+                if path.stat().st_mtime >= cutoff or path.with_suffix(".bin").exists():
+                    continue
+                path.unlink()
+            except OSError:
+                continue
+            pruned += 1
+        if pruned:
+            metrics.inc("sitegen_image_registrations_pruned_total", pruned)
+        return pruned
+
+    def registered_url(self, digest: str) -> str | None:
+        try:
+            return (self.directory / f"{digest}.url").read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+
+class ImageProxy:
+    """
+    Serve upstream images by digest from an ImageStore, fetching each at most once at a time.
+
+    register(url) returns the digest a page links to and records it in the
+    store, so any worker sharing the store directory (or this one after a
+    restart) may fetch it; get(digest) answers from disk, or fetches the
+    registered URL (concurrent callers share one fetch) and stores it.
+    """
+
+    def __init__(self, store: ImageStore, fetch: Fetcher) -> None:
+        self.store = store
+        self.fetch = fetch
+        # digest -> (url, monotonic time it was last registered in the store).
+        self._urls: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._failures: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._inflight: dict[str, Future] = {}
+
+    def register(self, url: str) -> str:
+        digest = image_digest(url)
+        with self._lock:
+            known = self._urls.get(digest)
+            if known is not None:
+                self._urls.move_to_end(digest)
+                if time.monotonic() - known[1] < REGISTRATION_RENEW_SECONDS:
+                    return digest
+        try:
+            self.store.register(digest, url)
+        except OSError as exc:
+            logger.warning("Could not register image %s: %s", url, exc)
+            return digest
+        self._remember(digest, url)
+        return digest
+
+    def _remember(self, digest: str, url: str) -> None:
+        with self._lock:
+            self._urls[digest] = (url, time.monotonic())
+            self._urls.move_to_end(digest)
+            while len(self._urls) > MAX_REGISTERED_URLS:
+                self._urls.popitem(last=False)
+
+    def get(self, digest: str) -> StoredImage | None:
+        """The image for digest, or None if it is unknown or could not be fetched."""
+        image = self.store.get(digest)
+        if image is not None:
+            metrics.inc("sitegen_image_cache_total", result="hit")
+            return image
+        with self._lock:
+            known = self._urls.get(digest)
+        url = known[0] if known is not None else None
+        if url is None:
+            # Registered by another worker, or before a restart.
+            url = self.store.registered_url(digest)
+            if url is None or image_digest(url) != digest:
+                return None
+            self._remember(digest, url)
+        with self._lock:
+            failed_at = self._failures.get(digest)
+            if failed_at is not None and time.monotonic() - failed_at < FAILURE_TTL_SECONDS:
+                return None
+            future = self._inflight.get(digest)
+            owner = future is None
+            if owner:
+                future = self._inflight[digest] = Future()
+        assert future is not None
+        if not owner:
+            return future.result()
+
+        metrics.inc("sitegen_image_cache_total", result="miss")
+        image = None
+        try:
+            image = self._fetch(digest, url)
+        finally:
+            with self._lock:
+                self._inflight.pop(digest, None)
+            future.set_result(image)
+        return image
+
+    def _fetch(self, digest: str, url: str) -> StoredImage | None:
+        started = time.perf_counter()
+        try:
+            content, content_type = self.fetch(url)
+        except Exception as exc:
+            logger.warning("Image fetch failed for %s: %s", url, exc)
+            with self._lock:
+                self._failures[digest] = time.monotonic()
+            metrics.observe("sitegen_image_download_seconds", time.perf_counter() - started, result="failed")
+            return None
+        metrics.observe("sitegen_image_download_seconds", time.perf_counter() - started, result="ok")
+        metrics.inc("sitegen_image_download_bytes_total", len(content))
+        image = StoredImage(
+            content=content,
+            content_type=content_type,
+            etag='"' + hashlib.sha256(content).hexdigest()[:DIGEST_LENGTH] + '"',
+        )
+        with self._lock:
+            self._failures.pop(digest, None)
+        try:
+            self.store.put(digest, url, image)
+        except OSError as exc:
+            logger.warning("Could not store image %s: %s", digest, exc)
+        return image
+
+
+def session_fetcher(session: requests.Session, timeout: tuple[float, float]) -> Fetcher:
+    """Fetcher using a pooled requests session; rejects non-images and anything over MAX_IMAGE_BYTES."""
+
+    def fetch(url: str) -> tuple[bytes, str]:
+        breaker = breaker_for(urlparse(url).netloc)
+        breaker.before_call()
+        try:
+            response = session.get(url, timeout=timeout, stream=True)
+        except Exception:
+            breaker.record(False)
+            raise
+        breaker.record(response.status_code < 500)
+        with response:
+            response.raise_for_status()
+            content_type = (response.headers.get("Content-Type") or "").split(";")[0].strip().lower()
+            if not content_type.startswith("image/"):
+                raise ValueError(f"Not an image: {content_type or 'no content type'}")
+            content = response.raw.read(MAX_IMAGE_BYTES + 1, decode_content=True)
+        if len(content) > MAX_IMAGE_BYTES:
+            raise ValueError(f"Image larger than {MAX_IMAGE_BYTES} bytes")
+        return content, content_type
+
+    return fetch
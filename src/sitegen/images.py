@@ -6,7 +6,8 @@ import time
 from pathlib import Path
 from urllib.parse import urlparse
 
-import requests
+from src.sitegen import metrics
+from src.sitegen.circuit import CLOSED, CircuitOpenError, breaker_for
 
 
 _INVALID_FILE_CHARS = re.compile(r"[^a-zA-Z0-9._-]+")
@@ -58,13 +59,28 @@ def download_image(
     if not src:
         return None
 
+    import requests
+
     out_path.parent.mkdir(parents=True, exist_ok=True)
     backoffs = [1, 2, 4]
     last_error: Exception | None = None
+    started = time.perf_counter()
+    breaker = breaker_for(urlparse(src).netloc)
 
     for attempt in range(max_retries):
         try:
-            response = requests.get(src, timeout=timeout_seconds)
+            breaker.before_call()
+        except CircuitOpenError:
+            # The image host is down: skip the image instead of sleeping through retries.
+            metrics.observe("sitegen_image_download_seconds", time.perf_counter() - started, result="circuit_open")
+            return None
+        try:
+            try:
+                response = requests.get(src, timeout=timeout_seconds)
+            except Exception:
+                breaker.record(False)
+                raise
+            breaker.record(response.status_code < 500)
             if response.status_code >= 400:
                 raise requests.HTTPError(f"HTTP {response.status_code} for {src}")
 
@@ -72,12 +88,17 @@ def download_image(
             stem = sanitize_filename(out_path.stem)
             target = out_path.with_name(f"{stem}{ext}")
             target.write_bytes(response.content)
+            metrics.observe("sitegen_image_download_seconds", time.perf_counter() - started, result="ok")
+            metrics.inc("sitegen_image_download_bytes_total", len(response.content))
             return target
         except Exception as exc:
             last_error = exc
-            if attempt < max_retries - 1:
+            # Once the circuit is open the next before_call() skips the image; don't sleep first.
+            if attempt < max_retries - 1 and breaker.state == CLOSED:
                 time.sleep(backoffs[min(attempt, len(backoffs) - 1)])
 
+    metrics.observe("sitegen_image_download_seconds", time.perf_counter() - started, result="failed")
+
     if last_error:
         return None
     return None
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from src.sitegen.normalize import slugify
+
+FACETS = ("game", "league", "tournament", "team", "status")
+
+# Common short names that differ from PandaScore's videogame slugs.
+GAME_ALIASES = {
+    "cs2": "cs-go",
+    "csgo": "cs-go",
+    "cs": "cs-go",
+    "counter-strike": "cs-go",
+    "lol": "league-of-legends",
+    "dota": "dota-2",
+    "dota2": "dota-2",
+    "val": "valorant",
+    "overwatch": "ow",
+    "rocket-league": "rl",
+}
+
+
+def _entries(facet: str, match: dict[str, Any]) -> list[tuple[str, str, tuple[str, ...]]]:
+    """(canonical key, label, alias keys) for each value of facet on match."""
+    if facet == "status":
+        status = (match.get("status") or "unknown").lower()
+        return [(status, match.get("status_ru") or status, ())]
+    if facet == "team":
+        values = [(team.get("slug"), team.get("name") or "", team.get("acronym")) for team in match.get("teams") or []]
+    else:
+        values = [(match.get(f"{facet}_slug"), match.get(f"{facet}_name") or "", None)]
+    entries = []
+    for slug, name, acronym in values:
+        aliases = tuple(key for key in (slugify(name), slugify(acronym)) if key)
+        canonical = slug or (aliases[0] if aliases else "")
+        if canonical:
+            entries.append((canonical, name or canonical, aliases))
+    return entries
+
+
+@dataclass(frozen=True)
+class MatchIndex:
+    """
+    Inverted maps from facet keys (game, league, tournament, team, status) to match positions.
+
+    Keys are slugs; teams are also reachable by acronym and leagues or
+    tournaments by their slugified name. Queries intersect facets and union
+    comma-separated values within one facet, keeping the order of matches.
+    """
+
+    matches: list[dict[str, Any]]
+    postings: dict[str, dict[str, tuple[int, ...]]]
+    # Display label and number of matches per canonical key.
+    labels: dict[str, dict[str, str]]
+    counts: dict[str, dict[str, int]]
+
+    @classmethod
+    def build(cls, matches: Iterable[dict[str, Any]]) -> MatchIndex:
+        items = list(matches)
+        postings: dict[str, dict[str, list[int]]] = {facet: {} for facet in FACETS}
+        labels: dict[str, dict[str, str]] = {facet: {} for facet in FACETS}
+        counts: dict[str, dict[str, int]] = {facet: {} for facet in FACETS}
+        for pos, match in enumerate(items):
+            for facet in FACETS:
+                for canonical, label, aliases in _entries(facet, match):
+                    counts[facet][canonical] = counts[facet].get(canonical, 0) + 1
+                    labels[facet].setdefault(canonical, label)
+                    for key in (canonical, *aliases):
+                        posting = postings[facet].setdefault(key, [])
+                        if not posting or posting[-1] != pos:
+                            posting.append(pos)
+        return cls(
+            matches=items,
+            postings={facet: {k: tuple(v) for k, v in keys.items()} for facet, keys in postings.items()},
+            labels=labels,
+            counts=counts,
+        )
+
+    def positions(self, facet: str, value: str) -> set[int]:
+        """Positions of matches with any of the comma-separated values of facet."""
+        if facet not in self.postings:
+            raise ValueError(f"Unknown facet: {facet!r} (expected one of {', '.join(FACETS)})")
+        found: set[int] = set()
+        for part in value.split(","):
+            key = slugify(part)
+            found.update(self.postings[facet].get(key, ()))
+            if facet == "game" and key in GAME_ALIASES:
+                found.update(self.postings[facet].get(GAME_ALIASES[key], ()))
+        return found
+
+    def query(self, **filters: str | None) -> list[dict[str, Any]]:
+        """Matches satisfying every non-empty filter, e.g. query(game="cs2", team="navi")."""
+        selected: set[int] | None = None
+        for facet, value in filters.items():
+            if not value:
+                continue
+            found = self.positions(facet, value)
+            selected = found if selected is None else selected & found
+        if selected is None:
+            return list(self.matches)
+        return [self.matches[pos] for pos in sorted(selected)]
+
+    def facet(self, facet: str) -> list[tuple[str, str, int]]:
+        """(key, label, match count) for every canonical key of facet, most matches first."""
+        return sorted(
+            ((key, self.labels[facet][key], count) for key, count in self.counts[facet].items()),
+            key=lambda item: (-item[2], item[1].lower()),
+        )
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import deque
+from typing import Any, Iterable
+
+from src.sitegen.diff import diff_matches
+
+# Fields pushed to clients; everything else on a card is static for the day.
+LIVE_FIELDS = ("status", "status_ru", "score_str", "end_at")
+DEFAULT_HISTORY = 256
+
+
+def _live_view(match: dict[str, Any]) -> dict[str, Any]:
+    return {"id": match.get("id"), **{name: match.get(name) for name in LIVE_FIELDS}}
+
+
+class LiveFeed:
+    """
+    Sequence of small deltas for running matches, shared by every subscriber.
+
+    One poller calls publish() with the latest normalized matches; each call
+    that changes a running match (or starts or finishes one) appends an event
+    {"seq", "matches": {id: {changed fields}}}. Subscribers block in wait()
+    and receive only the events after the last seq they saw. Subscribers that
+    fall behind the history get a fresh snapshot instead.
+    """
+
+    def __init__(self, history: int = DEFAULT_HISTORY) -> None:
+        self._cond = threading.Condition()
+        self._state: dict[Any, dict[str, Any]] = {}
+        self._events: deque[dict[str, Any]] = deque(maxlen=history)
+        self._seq = 0
+
+    @property
+    def seq(self) -> int:
+        with self._cond:
+            return self._seq
+
+    def publish(self, matches: Iterable[dict[str, Any]]) -> dict[str, Any] | None:
+        """Record the latest match set; returns the event it produced, if any."""
+        new_state = {view["id"]: view for view in map(_live_view, matches) if view["id"] is not None}
+        with self._cond:
+            diff = diff_matches(self._state.values(), new_state.values())
+            changes: dict[Any, dict[str, Any]] = {}
+            for change in diff.changed:
+                old, new = self._state[change.id], new_state[change.id]
+                if "running" not in (old.get("status"), new.get("status")):
+                    continue
+                changes[change.id] = {k: v for k, v in new.items() if k != "id" and old.get(k) != v}
+            for match_id in diff.added:
+                if new_state[match_id].get("status") == "running":
+                    changes[match_id] = {k: v for k, v in new_state[match_id].items() if k != "id"}
+            self._state = new_state
+            if not changes:
+                return None
+            self._seq += 1
+            event = {"seq": self._seq, "matches": {str(k): v for k, v in changes.items()}}
+            self._events.append(event)
+            self._cond.notify_all()
+            return event
+
+    def snapshot(self) -> dict[str, Any]:
+        """Current live fields of every running match, tagged with the latest seq."""
+        with self._cond:
+            running = {
+                str(match_id): {k: v for k, v in view.items() if k != "id"}
+                for match_id, view in self._state.items()
+                if view.get("status") == "running"
+            }
+            return {"seq": self._seq, "snapshot": True, "matches": running}
+
+    def wait(self, after_seq: int, timeout: float) -> list[dict[str, Any]]:
+        """
+        Events newer than after_seq, blocking up to timeout for the first one.
+
+        Returns [] on timeout, or [snapshot] when after_seq is older than the
+        retained history (or from a previous process).
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            if after_seq > self._seq:
+                return [self.snapshot()]
+            while self._seq == after_seq:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return []
+                self._cond.wait(remaining)
+            oldest = self._events[0]["seq"] if self._events else self._seq + 1
+            if after_seq + 1 < oldest:
+                return [self.snapshot()]
+            return [event for event in self._events if event["seq"] > after_seq]
+
+
+def sse_message(event: dict[str, Any]) -> str:
+    """Format an event for a text/event-stream response."""
+    name = "snapshot" if event.get("snapshot") else "delta"
+    data = json.dumps(event, ensure_ascii=False, separators=(",", ":"))
+    return f"id: {event['seq']}\nevent: {name}\ndata: {data}\n\n"
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+
+_LabelKey = tuple[tuple[str, str], ...]
+_NAME_RE = re.compile(r"^[a-zA-Z_:][a-zA-Z0-9_:]*$")
+
+
+def _label_key(labels: dict[str, Any]) -> _LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(key: _LabelKey) -> str:
+    if not key:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in key) + "}"
+
+
+class MetricsRegistry:
+    """
+    Thread-safe counters and summaries (count/sum/max) keyed by name and labels.
+
+    Counters end in _total; summaries observe durations in seconds or sizes in
+    bytes. Exported as Prometheus text or as a JSON-ready snapshot.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[_LabelKey, float]] = {}
+        self._summaries: dict[str, dict[_LabelKey, list[float]]] = {}
+
+    def inc(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._summaries.setdefault(name, {})
+            stats = series.get(key)
+            if stats is None:
+                series[key] = [1.0, value, value]
+            else:
+                stats[0] += 1
+                stats[1] += value
+                stats[2] = max(stats[2], value)
+
+    @contextmanager
+    def timer(self, name: str, **labels: Any) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._summaries.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "counters": {
+                    name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                    for name, series in sorted(self._counters.items())
+                },
+                "summaries": {
+                    name: [
+                        {"labels": dict(key), "count": int(stats[0]), "sum": stats[1], "max": stats[2]}
+                        for key, stats in series.items()
+                    ]
+                    for name, series in sorted(self._summaries.items())
+                },
+            }
+
+    def render_prometheus(self) -> str:
+        lines: list[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                if not _NAME_RE.match(name):
+                    continue
+                lines.append(f"# TYPE {name} counter")
+                for key, value in series.items():
+                    lines.append(f"{name}{_format_labels(key)} {value:g}")
+            for name, series in sorted(self._summaries.items()):
+                if not _NAME_RE.match(name):
+                    continue
+                lines.append(f"# TYPE {name} summary")
+                for key, (count, total, _max) in series.items():
+                    labels = _format_labels(key)
+                    lines.append(f"{name}_count{labels} {count:g}")
+                    lines.append(f"{name}_sum{labels} {total:.6f}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+inc = REGISTRY.inc
+observe = REGISTRY.observe
+timer = REGISTRY.timer
@@ -1,5 +1,6 @@
 ﻿from __future__ import annotations
 
+import re
 from datetime import datetime
 from typing import Any
 
@@ -13,6 +14,20 @@ STATUS_RU = {
 }
 
 
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+
+def slugify(value: Any) -> str:
+    """Lowercase ASCII slug ("Natus Vincere" -> "natus-vincere"); "" for anything else."""
+    if not isinstance(value, str):
+        return ""
+    return _SLUG_RE.sub("-", value.strip().lower()).strip("-")
+
+
+def _slug(entity: dict[str, Any]) -> str:
+    return slugify(entity.get("slug")) or slugify(entity.get("name"))
+
+
 def _safe_dict(value: Any) -> dict[str, Any]:
     return value if isinstance(value, dict) else {}
 
@@ -54,6 +69,7 @@ def normalize_match(raw: dict) -> dict[str, Any]:
         teams.append(
             {
                 "name": opponent.get("name") or "Unknown",
+                "slug": _slug(opponent),
                 "acronym": opponent.get("acronym") or "",
                 "image_url": opponent.get("image_url") or "",
             }
@@ -99,9 +115,12 @@ def normalize_match(raw: dict) -> dict[str, Any]:
         "is_rescheduled": bool(raw.get("rescheduled")),
         "original_scheduled_at": raw.get("original_scheduled_at") or None,
         "game_name": videogame.get("name") or "",
+        "game_slug": _slug(videogame),
         "game_image_url": videogame.get("image_url") or "",
         "league_name": league.get("name") or "",
+        "league_slug": _slug(league),
         "tournament_name": tournament.get("name") or "",
+        "tournament_slug": _slug(tournament),
         "teams": teams,
         "score_str": score_str,
         "stream_url": stream_url,
@@ -1,31 +1,109 @@
 from __future__ import annotations
 
 import logging
+import math
+import re
+import sys
+import threading
 import time
-from datetime import datetime, timedelta, timezone
-from email.utils import parsedate_to_datetime
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any
+from urllib.parse import parse_qs, urlparse
 
-import requests
+from src.sitegen import metrics
+from src.sitegen.circuit import CLOSED, CircuitOpenError, breaker_for
+
+if TYPE_CHECKING:
+    import requests
 
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_POOL_SIZE = 10
+MAX_PAGE_SIZE = 100
+
+_LINK_PART_RE = re.compile(r'<([^>]*)>\s*;\s*rel="?([^";]+)"?')
+
+
+def build_session(pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """
+    Session whose connection pool holds pool_size keep-alive connections per host.
+
+    requests' default pool keeps 10 connections and silently discards extras,
+    so threads beyond that pay a new TCP/TLS handshake on every call.
+    """
+    if pool_size <= 0:
+        raise ValueError("pool_size must be positive")
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def is_network_error(exc: BaseException) -> bool:
+    """Whether exc is a requests error or an open circuit, without importing requests if nothing has used it yet."""
+    if isinstance(exc, CircuitOpenError):
+        return True
+    requests = sys.modules.get("requests")
+    return requests is not None and isinstance(exc, requests.RequestException)
+
+
+def day_cache_key(day: date, path: str = "matches") -> str:
+    """Semantic cache key for "all results of <path> that begin on UTC day <day>"."""
+    return f"pandascore:{path.strip('/')}:begin_at={day.isoformat()}"
+
+
+def day_params(day: date) -> dict[str, Any]:
+    return {"filter[begin_at]": day.isoformat(), "sort": "begin_at"}
+
 
 class PandaScoreClient:
-    def __init__(self, token: str, base_url: str = "https://api.pandascore.co") -> None:
+    def __init__(
+        self,
+        token: str,
+        base_url: str = "https://api.pandascore.co",
+        max_workers: int = 4,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: float | tuple[float, float] = 20,
+    ) -> None:
         token = token.strip()
         if not token:
             raise ValueError("token must not be empty")
+        if max_workers <= 0:
+            raise ValueError("max_workers must be positive")
 
         self.base_url = base_url.rstrip("/")
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                "Accept": "application/json",
-                "Authorization": f"Bearer {token}",
-            }
-        )
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._token = token
+        self._pool_size = max(pool_size, max_workers)
+        self._session: requests.Session | None = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        """HTTP session, created (and requests imported) on first use."""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = build_session(pool_size=self._pool_size)
+                    session.headers.update(
+                        {
+                            "Accept": "application/json",
+                            "Authorization": f"Bearer {self._token}",
+                        }
+                    )
+                    self._session = session
+        return self._session
+
+    @session.setter
+    def session(self, session: requests.Session) -> None:
+        self._session = session
 
     def fetch_matches(self, start_dt_utc: datetime, end_dt_utc: datetime) -> list[dict[str, Any]]:
         start_utc = self._to_utc(start_dt_utc)
@@ -34,72 +112,133 @@ class PandaScoreClient:
             raise ValueError("end_dt_utc must be greater than start_dt_utc")
 
         all_items: list[dict[str, Any]] = []
-        total_pages = 0
-
-        day_cursor = start_utc.date()
-        last_day = (end_utc - timedelta(microseconds=1)).date()
-
-        while day_cursor <= last_day:
-            day_str = day_cursor.isoformat()
-            page = 1
-            day_pages = 0
-            day_received = 0
-
-            while True:
-                params = {
-                    "filter[begin_at]": day_str,
-                    "page[size]": 100,
-                    "page[number]": page,
-                    "sort": "begin_at",
-                }
-                response = self._request_with_retries("GET", f"{self.base_url}/matches", params=params)
-
-                try:
-                    payload = response.json()
-                except ValueError as exc:
-                    raise RuntimeError(f"Invalid JSON from PandaScore for day={day_str}, page={page}") from exc
-
-                if not isinstance(payload, list):
-                    raise RuntimeError(
-                        f"Unexpected PandaScore response shape for day={day_str}, page={page}: "
-                        f"{type(payload).__name__}"
-                    )
-
-                day_pages += 1
-                total_pages += 1
-
-                if not payload:
-                    break
-
-                filtered_items = [
-                    item
-                    for item in payload
-                    if self._is_match_in_range(item, start_utc=start_utc, end_utc=end_utc)
-                ]
-                all_items.extend(filtered_items)
-                day_received += len(payload)
-
-                if not self._has_next_page(response.headers.get("Link")):
-                    break
-                page += 1
-
-            logger.info(
-                "PandaScore day=%s pages=%d raw_matches=%d",
-                day_str,
-                day_pages,
-                day_received,
-            )
-            day_cursor += timedelta(days=1)
+        for day in self.utc_days(start_utc, end_utc):
+            all_items.extend(self.filter_range(self.fetch_day(day), start_utc, end_utc))
 
         logger.info(
-            "PandaScore range %s..%s pages=%d matches=%d",
+            "PandaScore range %s..%s matches=%d",
             start_utc.isoformat(),
             end_utc.isoformat(),
-            total_pages,
             len(all_items),
         )
         return all_items
 
+    def fetch_day(self, day: date, path: str = "matches") -> list[dict[str, Any]]:
+        """All results of path beginning on UTC day; see day_cache_key() for caching."""
+        payload, pages = self.fetch_all_pages(path, day_params(day))
+        logger.info(
+            "PandaScore day=%s pages=%d raw_matches=%d",
+            day.isoformat(),
+            pages,
+            len(payload),
+        )
+        return payload
+
+    @classmethod
+    def utc_days(cls, start_dt_utc: datetime, end_dt_utc: datetime) -> list[date]:
+        """UTC calendar days overlapping [start_dt_utc, end_dt_utc)."""
+        start_utc = cls._to_utc(start_dt_utc)
+        end_utc = cls._to_utc(end_dt_utc)
+        days: list[date] = []
+        day_cursor = start_utc.date()
+        last_day = (end_utc - timedelta(microseconds=1)).date()
+        while day_cursor <= last_day:
+            days.append(day_cursor)
+            day_cursor += timedelta(days=1)
+        return days
+
+    @classmethod
+    def filter_range(
+        cls,
+        items: list[dict[str, Any]],
+        start_dt_utc: datetime,
+        end_dt_utc: datetime,
+    ) -> list[dict[str, Any]]:
+        start_utc = cls._to_utc(start_dt_utc)
+        end_utc = cls._to_utc(end_dt_utc)
+        return [
+            item
+            for item in items
+            if isinstance(item, dict) and cls._is_match_in_range(item, start_utc=start_utc, end_utc=end_utc)
+        ]
+
+    def fetch_all_pages(self, path: str, params: dict[str, Any]) -> tuple[list[dict[str, Any]], int]:
+        """
+        Fetch every page of a list endpoint at the maximum page size.
+
+        The first response's X-Total header (or its rel="last" link) tells how
+        many pages there are; the rest are fetched concurrently. Without either,
+        pages are followed sequentially through rel="next". Returns the items in
+        page order and the number of pages requested.
+        """
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        first = self._request_page(url, params, 1)
+        items = self._page_items(first, path, 1)
+        pages = 1
+
+        last_page = self._last_page_number(first)
+        if last_page is not None:
+            if last_page > 1:
+                remaining = range(2, last_page + 1)
+                workers = min(self.max_workers, len(remaining))
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pandascore-page") as pool:
+                    responses = list(pool.map(lambda n: (n, self._request_page(url, params, n)), remaining))
+                for number, response in responses:
+                    items.extend(self._page_items(response, path, number))
+                pages += len(responses)
+            return items, pages
+
+        response = first
+        page_items = items
+        while page_items and self._has_next_page(response.headers.get("Link")):
+            response = self._request_page(url, params, pages + 1)
+            page_items = self._page_items(response, path, pages + 1)
+            items.extend(page_items)
+            pages += 1
+        return items, pages
+
+    def _request_page(self, url: str, params: dict[str, Any], number: int) -> requests.Response:
+        page_params = {**params, "page[size]": MAX_PAGE_SIZE, "page[number]": number}
+        return self._request_with_retries("GET", url, params=page_params)
+
+    @staticmethod
+    def _page_items(response: requests.Response, path: str, number: int) -> list[dict[str, Any]]:
+        try:
+            payload = response.json()
+        except ValueError as exc:
+            raise RuntimeError(f"Invalid JSON from PandaScore for {path}, page={number}") from exc
+
+        if not isinstance(payload, list):
+            raise RuntimeError(
+                f"Unexpected PandaScore response shape for {path}, page={number}: "
+                f"{type(payload).__name__}"
+            )
+        return payload
+
+    @classmethod
+    def _last_page_number(cls, response: requests.Response) -> int | None:
+        total = response.headers.get("X-Total")
+        per_page = response.headers.get("X-Per-Page") or str(MAX_PAGE_SIZE)
+        if total and total.strip().isdigit() and per_page.strip().isdigit() and int(per_page) > 0:
+            return max(1, math.ceil(int(total) / int(per_page)))
+
+        last_url = cls._link_url(response.headers.get("Link"), "last")
+        if last_url:
+            query = parse_qs(urlparse(last_url).query)
+            raw = (query.get("page[number]") or query.get("page") or [""])[0]
+            if raw.isdigit():
+                return max(1, int(raw))
+        return None
+
+    @staticmethod
+    def _link_url(link_header: str | None, rel: str) -> str | None:
+        if not link_header:
+            return None
+        for target, link_rel in _LINK_PART_RE.findall(link_header):
+            if link_rel.strip() == rel:
+                return target
+        return None
+
     @staticmethod
     def _to_utc(dt: datetime) -> datetime:
         if dt.tzinfo is None:
@@ -118,8 +257,9 @@ class PandaScoreClient:
             parsed = parsed.replace(tzinfo=timezone.utc)
         return parsed.astimezone(timezone.utc)
 
-    def _is_match_in_range(self, item: dict[str, Any], start_utc: datetime, end_utc: datetime) -> bool:
-        begin_dt = self._parse_begin_at(item.get("begin_at"))
+    @classmethod
+    def _is_match_in_range(cls, item: dict[str, Any], start_utc: datetime, end_utc: datetime) -> bool:
+        begin_dt = cls._parse_begin_at(item.get("begin_at"))
         if begin_dt is None:
             return False
         return start_utc <= begin_dt < end_utc
@@ -137,30 +277,59 @@ class PandaScoreClient:
     def _request_with_retries(self, method: str, url: str, **kwargs: Any) -> requests.Response:
         backoffs = [1, 2, 4]
         attempt = 0
+        host = urlparse(url).netloc
+        breaker = breaker_for(host)
 
         while True:
             attempt += 1
+            # Fails fast (CircuitOpenError) while the host is known to be down.
+            breaker.before_call()
+            started = time.perf_counter()
             try:
-                response = self.session.request(method, url, timeout=20, **kwargs)
-            except requests.RequestException:
-                if attempt >= 3:
+                response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+            except Exception as exc:
+                breaker.record(False)
+                if not is_network_error(exc):
                     raise
-                time.sleep(backoffs[attempt - 1])
+                metrics.observe(
+                    "sitegen_http_attempt_seconds",
+                    time.perf_counter() - started,
+                    host=host,
+                    status="error",
+                )
+                # Stop once this failure opened the circuit; the next attempt would be rejected anyway.
+                if attempt >= 3 or breaker.state != CLOSED:
+                    raise
+                self._sleep_before_retry(host, backoffs[attempt - 1])
                 continue
+            metrics.observe(
+                "sitegen_http_attempt_seconds",
+                time.perf_counter() - started,
+                host=host,
+                status=response.status_code,
+            )
 
+            # A 429 means the host is up but throttling us; Retry-After covers it.
+            breaker.record(not 500 <= response.status_code <= 599)
             if response.status_code == 429 or 500 <= response.status_code <= 599:
-                if attempt >= 3:
+                if attempt >= 3 or breaker.state != CLOSED:
                     response.raise_for_status()
                 retry_after = self._get_retry_after_seconds(response.headers.get("Retry-After"))
                 if retry_after is not None:
-                    time.sleep(retry_after)
+                    self._sleep_before_retry(host, retry_after)
                 else:
-                    time.sleep(backoffs[attempt - 1])
+                    self._sleep_before_retry(host, backoffs[attempt - 1])
                 continue
 
             response.raise_for_status()
             return response
 
+    @staticmethod
+    def _sleep_before_retry(host: str, seconds: float) -> None:
+        metrics.inc("sitegen_http_retries_total", host=host)
+        metrics.inc("sitegen_http_retry_sleep_seconds_total", seconds, host=host)
+        time.sleep(seconds)
+
     @staticmethod
     def _get_retry_after_seconds(value: str | None) -> float | None:
         if not value:
@@ -170,6 +339,8 @@ class PandaScoreClient:
             return None
         if value.isdigit():
             return float(value)
+        from email.utils import parsedate_to_datetime
+
         try:
             dt = parsedate_to_datetime(value)
         except (TypeError, ValueError):
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Callable
+
+from src.sitegen.schedule import RefreshSchedule
+
+
+logger = logging.getLogger(__name__)
+
+MAX_SLEEP_SECONDS = 15.0
+
+
+class Prefetcher:
+    """
+    Daemon thread that calls refresh(key) whenever a key is due on the schedule.
+
+    on_tick() runs after every pass, for work that is not tied to one key
+    (e.g. warming the next day before a boundary). Errors are logged and the
+    key is retried on its next interval.
+    """
+
+    def __init__(
+        self,
+        schedule: RefreshSchedule,
+        refresh: Callable[[str], None],
+        on_tick: Callable[[], None] | None = None,
+        name: str = "prefetcher",
+    ) -> None:
+        self.schedule = schedule
+        self.refresh = refresh
+        self.on_tick = on_tick
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def run_pending(self) -> None:
+        for key in self.schedule.due():
+            try:
+                self.refresh(key)
+            except Exception:
+                logger.exception("Prefetch failed for %s", key)
+            self.schedule.mark_done(key)
+        if self.on_tick is not None:
+            try:
+                self.on_tick()
+            except Exception:
+                logger.exception("Prefetch tick failed")
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.run_pending()
+            self._stop.wait(min(self.schedule.seconds_until_next(), MAX_SLEEP_SECONDS))
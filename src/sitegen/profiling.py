@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import re
+import threading
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, ContextManager, Iterator
+
+if TYPE_CHECKING:
+    import cProfile
+    import pstats
+
+
+logger = logging.getLogger(__name__)
+
+# Functions whose share of a profile is below this fraction are folded into
+# their caller in the collapsed stacks.
+COLLAPSED_MIN_FRACTION = 0.0005
+COLLAPSED_MAX_DEPTH = 64
+TOP_ALLOCATIONS = 30
+
+_FuncKey = tuple[str, int, str]
+
+_NULL = contextlib.nullcontext()
+_CPU_LOCK = threading.Lock()
+_MEM_LOCK = threading.Lock()
+_mem_sections = 0
+_owns_tracing = False
+_SAFE_NAME_RE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+_cpu = False
+_mem = False
+_directory = Path(".cache/profiles")
+_request_sample_rate = 0.0
+
+
+def configure(modes: str = "", directory: Path | None = None, request_sample_rate: float | None = None) -> None:
+    """
+    Enable profiling: modes is a comma-separated subset of "cpu", "mem" or "all"; "" or "off" disables.
+
+    cpu writes {name}.pstats and {name}.collapsed (flamegraph.pl / speedscope
+    input); mem writes {name}.alloc.txt with the top allocation sites.
+    """
+    global _cpu, _mem, _directory, _request_sample_rate
+    parts = {p.strip().lower() for p in modes.split(",") if p.strip()}
+    unknown = parts - {"cpu", "mem", "all", "off"}
+    if unknown:
+        raise ValueError(f"Unsupported profile mode(s): {', '.join(sorted(unknown))} (expected cpu, mem or all)")
+    _cpu = bool(parts & {"cpu", "all"})
+    _mem = bool(parts & {"mem", "all"})
+    if directory is not None:
+        _directory = directory
+    if request_sample_rate is not None:
+        _request_sample_rate = max(0.0, min(1.0, request_sample_rate))
+
+
+def configure_from_env() -> None:
+    """Apply SITEGEN_PROFILE, SITEGEN_PROFILE_DIR and SITEGEN_PROFILE_REQUEST_RATE."""
+    configure(
+        modes=(os.getenv("SITEGEN_PROFILE") or "").strip(),
+        directory=Path((os.getenv("SITEGEN_PROFILE_DIR") or ".cache/profiles").strip()),
+        request_sample_rate=float((os.getenv("SITEGEN_PROFILE_REQUEST_RATE") or "0").strip()),
+    )
+
+
+def enabled() -> bool:
+    return _cpu or _mem
+
+
+def sample_request() -> bool:
+    """Whether the current web request should be profiled."""
+    if not enabled() or _request_sample_rate <= 0:
+        return False
+    import random
+
+    return random.random() < _request_sample_rate
+
+
+def section(name: str) -> ContextManager[None]:
+    """
+    Profile the enclosed block as name, or do nothing when profiling is off.
+
+    The disabled path returns a shared nullcontext, so wrapped code pays one
+    function call. cProfile only sees the calling thread; only one CPU
+    section runs at a time, overlapping sections (e.g. concurrent requests)
+    skip CPU capture.
+    """
+    if not (_cpu or _mem):
+        return _NULL
+    return _profiled(name)
+
+
+@contextlib.contextmanager
+def _profiled(name: str) -> Iterator[None]:
+    profiler: cProfile.Profile | None = None
+    if _cpu and _CPU_LOCK.acquire(blocking=False):
+        import cProfile
+
+        profiler = cProfile.Profile()
+    before = _start_tracing() if _mem else None
+
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            _CPU_LOCK.release()
+        snapshot = _stop_tracing() if _mem else None
+        try:
+            _write_reports(name, profiler, snapshot, before)
+        except OSError as exc:
+            logger.warning("Could not write profile %s: %s", name, exc)
+
+
+def _start_tracing() -> tracemalloc.Snapshot | None:
+    """Start tracemalloc for the first open section; later ones get a baseline snapshot."""
+    global _mem_sections, _owns_tracing
+    with _MEM_LOCK:
+        _mem_sections += 1
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(25)
+            _owns_tracing = True
+            return None
+        return tracemalloc.take_snapshot()
+
+
+def _stop_tracing() -> tracemalloc.Snapshot:
+    global _mem_sections, _owns_tracing
+    with _MEM_LOCK:
+        snapshot = tracemalloc.take_snapshot()
+        _mem_sections -= 1
+        if _mem_sections == 0 and _owns_tracing:
+            tracemalloc.stop()
+            _owns_tracing = False
+        return snapshot
+
+
+def _write_reports(
+    name: str,
+    profiler: cProfile.Profile | None,
+    snapshot: tracemalloc.Snapshot | None,
+    before: tracemalloc.Snapshot | None,
+) -> None:
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    base = f"{stamp}-{_SAFE_NAME_RE.sub('_', name)}"
+    _directory.mkdir(parents=True, exist_ok=True)
+
+    if profiler is not None:
+        import pstats
+
+        stats = pstats.Stats(profiler)
+        stats.dump_stats(str(_directory / f"{base}.pstats"))
+        collapsed = "".join(f"{line}\n" for line in collapsed_stacks(stats))
+        (_directory / f"{base}.collapsed").write_text(collapsed, encoding="utf-8")
+        logger.info("Profile written to %s", _directory / f"{base}.pstats")
+
+    if snapshot is not None:
+        (_directory / f"{base}.alloc.txt").write_text(allocation_report(snapshot, before), encoding="utf-8")
+
+
+def _label(func: _FuncKey) -> str:
+    filename, lineno, funcname = func
+    if filename == "~":
+        return funcname
+    return f"{funcname} ({Path(filename).name}:{lineno})".replace(";", ":")
+
+
+def collapsed_stacks(stats: pstats.Stats) -> list[str]:
+    """
+    Approximate "root;...;leaf microseconds" lines from a cProfile call graph.
+
+    cProfile keeps caller/callee edges rather than full stacks, so each
+    function's time is split between its callees in proportion to the
+    cumulative time of each edge, walking down from the entry points.
+    """
+    raw: dict[_FuncKey, Any] = stats.stats  # type: ignore[attr-defined]
+    callees: dict[_FuncKey, list[tuple[_FuncKey, float]]] = {}
+    for func, (_cc, _nc, _tt, _ct, callers) in raw.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+
+    total = sum(tt for (_cc, _nc, tt, _ct, _callers) in raw.values()) or 1.0
+    lines: dict[str, float] = {}
+
+    def walk(func: _FuncKey, share: float, stack: list[str], seen: set[_FuncKey]) -> None:
+        ct = raw[func][3]
+        stack = stack + [_label(func)]
+        if ct <= 0:
+            return
+        children = [
+            (child, edge_ct)
+            for child, edge_ct in callees.get(func, [])
+            if child not in seen and edge_ct * share / ct >= total * COLLAPSED_MIN_FRACTION
+        ]
+        if len(stack) >= COLLAPSED_MAX_DEPTH:
+            children = []
+        self_time = share - sum(edge_ct * share / ct for _child, edge_ct in children)
+        if self_time > 0:
+            key = ";".join(stack)
+            lines[key] = lines.get(key, 0.0) + self_time
+        for child, edge_ct in children:
+            walk(child, edge_ct * share / ct, stack, seen | {child})
+
+    for func, (_cc, _nc, _tt, ct, callers) in raw.items():
+        if not callers:
+            walk(func, ct, [], {func})
+
+    return [f"{stack} {round(seconds * 1e6)}" for stack, seconds in sorted(lines.items()) if seconds * 1e6 >= 1]
+
+
+def allocation_report(snapshot: tracemalloc.Snapshot, before: tracemalloc.Snapshot | None = None) -> str:
+    """Top allocation sites by size, as growth since before when given."""
+    snapshot = snapshot.filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),))
+    lines = []
+    if before is not None:
+        before = before.filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),))
+        lines.append(f"Top {TOP_ALLOCATIONS} allocation sites by growth")
+        for stat in snapshot.compare_to(before, "lineno")[:TOP_ALLOCATIONS]:
+            lines.append(str(stat))
+    else:
+        lines.append(f"Top {TOP_ALLOCATIONS} allocation sites by size")
+        for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+            lines.append(str(stat))
+    current = sum(stat.size for stat in snapshot.statistics("filename"))
+    lines.append(f"Total traced: {current / 1024:.1f} KiB")
+    return "\n".join(lines) + "\n"
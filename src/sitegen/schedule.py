@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import time
+
+
+class RefreshSchedule:
+    """
+    Per-key refresh cadence.
+
+    Every key has its own interval in seconds. A key is due when it was never
+    refreshed, was forced, or its interval has elapsed since the last refresh.
+    """
+
+    def __init__(self, intervals: dict[str, float]) -> None:
+        for key, interval in intervals.items():
+            if interval <= 0:
+                raise ValueError(f"interval for {key!r} must be positive")
+        self.intervals = dict(intervals)
+        self._last_run: dict[str, float] = {}
+
+    def due(self, now: float | None = None) -> list[str]:
+        current = time.monotonic() if now is None else now
+        return [key for key in self.intervals if self._next_run(key) <= current]
+
+    def mark_done(self, key: str, now: float | None = None) -> None:
+        self._last_run[key] = time.monotonic() if now is None else now
+
+    def force(self, key: str) -> None:
+        self._last_run.pop(key, None)
+
+    def seconds_until_next(self, now: float | None = None) -> float:
+        current = time.monotonic() if now is None else now
+        if not self.intervals:
+            return 0.0
+        return max(0.0, min(self._next_run(key) for key in self.intervals) - current)
+
+    def _next_run(self, key: str) -> float:
+        last = self._last_run.get(key)
+        if last is None:
+            return float("-inf")
+        return last + self.intervals[key]
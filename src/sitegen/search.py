@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Iterable
+
+SEARCH_INDEX_FILENAME = "search.json"
+SEARCH_INDEX_VERSION = 1
+
+
+def _terms(match: dict[str, Any]) -> set[str]:
+    """Lowercased searchable strings of a match: title, game, league, tournament, team names and acronyms."""
+    values = [match.get("title"), match.get("game_name"), match.get("league_name"), match.get("tournament_name")]
+    for team in match.get("teams") or []:
+        if isinstance(team, dict):
+            values.extend((team.get("name"), team.get("acronym")))
+    return {v.strip().lower() for v in values if isinstance(v, str) and v.strip()}
+
+
+def build_search_index(matches: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Compact search index for one page.
+
+    {"v": 1, "ids": [match id per position], "terms": [sorted unique
+    lowercased strings], "postings": [positions per term]}. Team, league and
+    game names repeat across a day, so interning them as terms keeps the file
+    small and lets the client substring-match a few hundred terms instead of
+    every match. A query word selects the union of postings of the terms
+    containing it; words are intersected.
+    """
+    ids: list[Any] = []
+    postings: dict[str, list[int]] = {}
+    for pos, match in enumerate(matches):
+        ids.append(match.get("id"))
+        for term in _terms(match):
+            postings.setdefault(term, []).append(pos)
+    terms = sorted(postings)
+    return {
+        "v": SEARCH_INDEX_VERSION,
+        "ids": ids,
+        "terms": terms,
+        "postings": [postings[term] for term in terms],
+    }
+
+
+def dumps_search_index(index: dict[str, Any]) -> str:
+    return json.dumps(index, ensure_ascii=False, separators=(",", ":"))
+
+
+def search(index: dict[str, Any], query: str) -> list[Any]:
+    """Match ids for query, with the same semantics as the page script (for tests and tooling)."""
+    selected: set[int] | None = None
+    for word in query.lower().split():
+        found: set[int] = set()
+        for term, positions in zip(index["terms"], index["postings"]):
+            if word in term:
+                found.update(positions)
+        selected = found if selected is None else selected & found
+    if selected is None:
+        return list(index["ids"])
+    return [index["ids"][pos] for pos in sorted(selected)]
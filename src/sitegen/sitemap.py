@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import gzip
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Iterable
+
+
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+MAX_URLS_PER_SITEMAP = 50_000
+MAX_BYTES_PER_SITEMAP = 50 * 1024 * 1024
+INDEX_FILENAME = "sitemap_index.xml"
+
+_URLSET_HEADER = f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{SITEMAP_NS}">\n'.encode("utf-8")
+_URLSET_FOOTER = b"</urlset>\n"
+
+
+def _escape(value: str) -> str:
+    # Same as xml.sax.saxutils.escape, which would pull in urllib.request and ssl.
+    return value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+@dataclass(frozen=True)
+class SitemapUrl:
+    loc: str
+    lastmod: str | None = None
+
+
+def _url_entry(url: SitemapUrl) -> bytes:
+    parts = [f"  <url><loc>{_escape(url.loc)}</loc>"]
+    if url.lastmod:
+        parts.append(f"<lastmod>{_escape(url.lastmod)}</lastmod>")
+    parts.append("</url>\n")
+    return "".join(parts).encode("utf-8")
+
+
+def _gzip_copy(path: Path) -> None:
+    with path.open("rb") as src, gzip.open(path.with_name(path.name + ".gz"), "wb") as dst:
+        shutil.copyfileobj(src, dst)
+
+
+class _ChunkWriter:
+    def __init__(self, out_dir: Path, max_urls: int, max_bytes: int) -> None:
+        self.out_dir = out_dir
+        self.max_urls = max_urls
+        self.max_bytes = max_bytes
+        self.chunks: list[tuple[Path, str | None]] = []
+        self._fh: IO[bytes] | None = None
+        self._count = 0
+        self._size = 0
+        self._latest: str | None = None
+
+    def add(self, url: SitemapUrl) -> None:
+        entry = _url_entry(url)
+        if self._fh is not None and (
+            self._count >= self.max_urls or self._size + len(entry) + len(_URLSET_FOOTER) > self.max_bytes
+        ):
+            self.close()
+        if self._fh is None:
+            self._open()
+        assert self._fh is not None
+        self._fh.write(entry)
+        self._count += 1
+        self._size += len(entry)
+        if url.lastmod and (self._latest is None or url.lastmod > self._latest):
+            self._latest = url.lastmod
+
+    def _open(self) -> None:
+        path = self.out_dir / f"sitemap-{len(self.chunks) + 1}.xml"
+        self._fh = path.open("wb")
+        self._fh.write(_URLSET_HEADER)
+        self._count = 0
+        self._size = len(_URLSET_HEADER)
+        self._latest = None
+        self.chunks.append((path, None))
+
+    def close(self) -> None:
+        if self._fh is None:
+            return
+        self._fh.write(_URLSET_FOOTER)
+        self._fh.close()
+        self._fh = None
+        path, _ = self.chunks[-1]
+        self.chunks[-1] = (path, self._latest)
+        _gzip_copy(path)
+
+
+def write_sitemaps(
+    out_dir: Path,
+    base_url: str,
+    urls: Iterable[SitemapUrl],
+    max_urls: int = MAX_URLS_PER_SITEMAP,
+    max_bytes: int = MAX_BYTES_PER_SITEMAP,
+) -> Path:
+    """
+    Stream urls into sitemap-N.xml chunks and write sitemap_index.xml.
+
+    Chunks are split at max_urls entries or max_bytes uncompressed size,
+    whichever comes first, and each file gets a .gz sibling. Chunks left over
+    from a previous, larger run are removed. Returns the index path.
+    """
+    if max_urls <= 0 or max_bytes <= len(_URLSET_HEADER) + len(_URLSET_FOOTER):
+        raise ValueError("sitemap limits are too small")
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    writer = _ChunkWriter(out_dir, max_urls=max_urls, max_bytes=max_bytes)
+    try:
+        for url in urls:
+            writer.add(url)
+    finally:
+        writer.close()
+
+    current = {path.name for path, _ in writer.chunks}
+    current |= {f"{name}.gz" for name in current}
+    for stale in out_dir.glob("sitemap-*.xml*"):
+        if stale.name not in current:
+            stale.unlink()
+
+    base = base_url.rstrip("/")
+    index_path = out_dir / INDEX_FILENAME
+    with index_path.open("w", encoding="utf-8") as f:
+        f.write(f'<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="{SITEMAP_NS}">\n')
+        for path, lastmod in writer.chunks:
+            f.write(f"  <sitemap><loc>{_escape(f'{base}/{path.name}')}</loc>")
+            if lastmod:
+                f.write(f"<lastmod>{_escape(lastmod)}</lastmod>")
+            f.write("</sitemap>\n")
+        f.write("</sitemapindex>\n")
+    _gzip_copy(index_path)
+    return index_path
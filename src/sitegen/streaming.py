@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+# Jinja's generate() yields one small string per template output node;
+# coalescing them keeps socket sends and file writes to a sensible size.
+STREAM_CHUNK_CHARS = 8192
+
+
+def json_array_chunks(items: Iterable[Any]) -> Iterator[str]:
+    """JSON array of items, one element per chunk, so large lists are never encoded as a single string."""
+    yield "["
+    for i, item in enumerate(items):
+        yield ("," if i else "") + json.dumps(item, ensure_ascii=False)
+    yield "]"
+
+
+def coalesce(chunks: Iterable[str], size: int = STREAM_CHUNK_CHARS) -> Iterator[str]:
+    """Join consecutive chunks until at least size characters are buffered."""
+    buffer: list[str] = []
+    buffered = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= size:
+            yield "".join(buffer)
+            buffer.clear()
+            buffered = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def write_chunks(path: Path, chunks: Iterable[str]) -> int:
+    """
+    Write chunks to path as they are produced; returns the number of bytes written.
+
+    Output goes to a sibling temporary file that replaces path at the end, so
+    readers never see a half-written page.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    written = 0
+    try:
+        with tmp.open("wb") as f:
+            for chunk in coalesce(chunks):
+                data = chunk.encode("utf-8")
+                f.write(data)
+                written += len(data)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return written
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from src.sitegen.dates import DayRange, get_day_ranges
+from src.sitegen.i18n import messages
+
+# Top-level names a variant prefix must not shadow.
+RESERVED_PREFIXES = frozenset({"yesterday", "today", "tomorrow", "assets"})
+_PREFIX_RE = re.compile(r"[a-z0-9][a-z0-9-]*")
+
+
+@dataclass(frozen=True)
+class Variant:
+    """One rendering of the site: pages under /{prefix}/ (or / when prefix is empty) in tz_name and locale."""
+
+    prefix: str
+    tz_name: str
+    locale: str
+
+    def page(self, path: str) -> str:
+        return f"{self.prefix}/{path}" if self.prefix else path
+
+    @property
+    def root(self) -> str:
+        return f"/{self.prefix}/" if self.prefix else "/"
+
+
+def parse_variants(raw: str) -> tuple[Variant, ...]:
+    """
+    Parse SITE_VARIANTS: comma-separated prefix:tz_name:locale entries.
+
+    An empty prefix renders at the site root, e.g.
+    ":Europe/Moscow:ru,en:America/New_York:en" builds /today/ for Moscow in
+    Russian and /en/today/ for New York in English.
+    """
+    variants: list[Variant] = []
+    for entry in (part.strip() for part in raw.split(",")):
+        if not entry:
+            continue
+        fields = entry.split(":")
+        if len(fields) != 3:
+            raise ValueError(f"Invalid variant {entry!r}: expected prefix:tz_name:locale")
+        prefix, tz_name, locale = (field.strip() for field in fields)
+        prefix = prefix.strip("/").lower()
+        if prefix and (not _PREFIX_RE.fullmatch(prefix) or prefix in RESERVED_PREFIXES):
+            raise ValueError(f"Invalid variant prefix: {prefix!r}")
+        try:
+            ZoneInfo(tz_name)
+        except (ValueError, ZoneInfoNotFoundError):
+            raise ValueError(f"Unknown time zone in variant {entry!r}: {tz_name!r}") from None
+        messages(locale)
+        variants.append(Variant(prefix=prefix, tz_name=tz_name, locale=locale))
+    prefixes = [v.prefix for v in variants]
+    if len(set(prefixes)) != len(prefixes):
+        raise ValueError("Variant prefixes must be unique")
+    return tuple(variants)
+
+
+def plan_ranges(variants: tuple[Variant, ...], day_mode: str, now_utc: datetime) -> list[tuple[Variant, DayRange]]:
+    """Every (variant, day range) page of one build, computed against the same instant."""
+    return [(variant, dr) for variant in variants for dr in get_day_ranges(day_mode, variant.tz_name, now_utc=now_utc)]
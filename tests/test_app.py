@@ -0,0 +1,176 @@
+import importlib
+import threading
+import time
+
+import pytest
+
+from src.sitegen import cache
+from src.sitegen.cache_backends import FileCacheBackend
+from src.sitegen.image_proxy import ImageProxy, ImageStore
+
+
+@pytest.fixture(scope="module")
+def web(tmp_path_factory):
+    # app.py reads its configuration at import time; keep it off the real .cache.
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("PANDASCORE_TOKEN", "test-token")
+        mp.setenv("PANDASCORE_BASE_URL", "https://api.test")
+        mp.setenv("APP_PREFETCH", "0")
+        mp.setenv("HISTORY_ENABLED", "0")
+        mp.setenv("APP_IMAGE_CACHE_DIR", str(tmp_path_factory.mktemp("img")))
+        yield importlib.import_module("app")
+
+
+class _Upstream:
+    """Stands in for PandaScoreClient; every fetch_day() returns the current version."""
+
+    def __init__(self):
+        self.version = 1
+        self.calls = 0
+
+    def fetch_day(self, day):
+        self.calls += 1
+        return [
+            {
+                "id": 1,
+                "status": "running",
+                "begin_at": f"{day.isoformat()}T12:00:00Z",
+                "league": {"name": f"League v{self.version}"},
+                "opponents": [
+                    {"opponent": {"name": "Alpha", "image_url": "https://img.test/alpha.png"}},
+                    {"opponent": {"name": "Beta", "image_url": "https://img.test/beta.png"}},
+                ],
+                "results": [{"score": self.version}, {"score": 0}],
+            }
+        ]
+
+
+class _Clock:
+    def __init__(self):
+        self.now = time.time()
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def upstream(web, monkeypatch, tmp_path):
+    cache.set_backend(FileCacheBackend(tmp_path / "http"))
+    cache.clear_memory_cache()
+    stub = _Upstream()
+    monkeypatch.setattr(web, "get_client", lambda _token: stub)
+    yield stub
+    cache.set_backend(None)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(cache.time, "time", clock)
+    return clock
+
+
+def test_prefetch_renders_the_data_it_fetched(web, upstream, clock):
+    web.prefetch_page("today")
+    key = ("today", web.get_day_range_by_slug("today").start_dt_utc.isoformat())
+    assert "League v1" in web._RENDERED_PAGES[key]
+
+    # Past the prefetch TTL but well inside the stale window request handlers use.
+    clock.now += web._prefetch_max_age() + 1
+    upstream.version = 2
+    web.prefetch_page("today")
+    assert upstream.calls == 2
+    assert "League v2" in web._RENDERED_PAGES[key]
+
+
+def test_poll_publishes_the_data_fetched_in_that_poll(web, upstream, clock, monkeypatch):
+    monkeypatch.setattr(web, "LIVE_FEED", web.LiveFeed())
+    web.poll_live()
+    assert web.LIVE_FEED.snapshot()["matches"]["1"]["score_str"] == "1–0"
+
+    clock.now += web.APP_LIVE_POLL_SECONDS
+    upstream.version = 2
+    web.poll_live()
+    assert upstream.calls == 2
+    assert web.LIVE_FEED.snapshot()["matches"]["1"]["score_str"] == "2–0"
+
+
+@pytest.fixture
+def live(web, monkeypatch):
+    feed = web.LiveFeed()
+    monkeypatch.setattr(web, "LIVE_FEED", feed)
+    monkeypatch.setattr(web, "start_live_poller", lambda: None)
+    monkeypatch.setattr(web, "APP_LIVE_STREAM_SECONDS", 0.2)
+    monkeypatch.setattr(web, "APP_LIVE_HEARTBEAT_SECONDS", 0.05)
+    monkeypatch.setattr(web, "_LIVE_STREAM_SLOTS", threading.BoundedSemaphore(1))
+    return feed
+
+
+def test_live_stream_starts_with_a_snapshot_and_ends_after_its_lifetime(web, live):
+    live.publish([{"id": 7, "status": "running", "score_str": "1–0"}])
+
+    body = web.app.test_client().get("/today/live").get_data(as_text=True)
+    assert body.startswith("retry: 5000\n\n")
+    assert "event: snapshot" in body
+    assert '"7":{"status":"running"' in body
+
+
+def test_live_stream_resumes_after_a_seq(web, live):
+    live.publish([{"id": 7, "status": "running", "score_str": "1–0"}])
+    live.publish([{"id": 7, "status": "running", "score_str": "2–0"}])
+
+    body = web.app.test_client().get("/today/live?after=1").get_data(as_text=True)
+    assert "event: snapshot" not in body
+    assert "id: 2\nevent: delta" in body
+    assert '"score_str":"2–0"' in body
+
+
+def test_live_streams_are_capped(web, live):
+    client = web.app.test_client()
+    first = client.get("/today/live", buffered=False)
+    assert first.status_code == 200
+
+    busy = client.get("/today/live")
+    assert busy.status_code == 503
+    assert busy.headers["Retry-After"] == str(web.APP_LIVE_BUSY_RETRY_SECONDS)
+    assert busy.get_data(as_text=True).startswith("retry: ")
+
+    # Closing the open stream frees its slot.
+    first.close()
+    assert client.get("/today/live").status_code == 200
+
+
+@pytest.fixture
+def images(web, monkeypatch, tmp_path):
+    fetched = []
+
+    def fetch(url):
+        fetched.append(url)
+        return b"png-bytes", "image/png"
+
+    monkeypatch.setattr(web, "_IMAGE_PROXY", ImageProxy(ImageStore(tmp_path / "img", 1 << 20), fetch))
+    return fetched
+
+
+def test_image_route_rejects_unknown_digests(web, images):
+    client = web.app.test_client()
+    assert client.get("/img/abc").status_code == 404
+    assert client.get("/img/" + "0" * 32).status_code == 404
+    assert images == []
+
+
+def test_image_route_serves_registered_images_with_validators(web, images):
+    path = web.image_url("https://img.test/logo.png")
+    client = web.app.test_client()
+
+    response = client.get(path)
+    assert response.status_code == 200
+    assert response.data == b"png-bytes"
+    assert response.mimetype == "image/png"
+    assert response.headers["Cache-Control"] == f"public, max-age={web.APP_IMAGE_MAX_AGE_SECONDS}"
+    etag = response.headers["ETag"]
+
+    revalidated = client.get(path, headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.data == b""
+    assert images == ["https://img.test/logo.png"]
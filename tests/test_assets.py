@@ -0,0 +1,48 @@
+from src.sitegen.assets import (
+    MANIFEST_FILENAME,
+    asset_url_function,
+    collect_assets,
+    load_manifest,
+    minify_css,
+    write_assets,
+)
+
+
+def test_minify_css_keeps_rules():
+    css = "\ufeff/* theme */\n.a > b,\n.c {\n  color: red;\n  margin: 0 auto;\n}\n.d :hover { x: y }\n"
+
+    assert minify_css(css) == ".a>b,.c{color:red;margin:0 auto}.d :hover{x:y}\n"
+
+
+def test_hashed_names_follow_content(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "style.css").write_text("a { color: red; }", encoding="utf-8")
+    first = collect_assets(src)["style.css"].hashed_name
+
+    (src / "style.css").write_text("a {\n  color: red;\n}\n", encoding="utf-8")
+    assert collect_assets(src)["style.css"].hashed_name == first
+    assert collect_assets(src, minify=False)["style.css"].hashed_name != first
+
+    (src / "style.css").write_text("a { color: blue; }", encoding="utf-8")
+    assert collect_assets(src)["style.css"].hashed_name != first
+
+
+def test_write_assets_keeps_previous_build_only(tmp_path):
+    src, out = tmp_path / "src", tmp_path / "out"
+    src.mkdir()
+    names = []
+    for color in ("red", "green", "blue"):
+        (src / "style.css").write_text(f"a{{color:{color}}}", encoding="utf-8")
+        manifest = write_assets(collect_assets(src), out)
+        names.append(manifest["style.css"])
+
+    assert load_manifest(out) == {"style.css": names[-1]}
+    assert sorted(p.name for p in out.iterdir()) == sorted([MANIFEST_FILENAME, *names[1:]])
+
+
+def test_asset_url_falls_back_to_plain_name():
+    asset_url = asset_url_function({"style.css": "style.0123456789.css"}, "/assets")
+
+    assert asset_url("style.css") == "/assets/style.0123456789.css"
+    assert asset_url("app.js") == "/assets/app.js"
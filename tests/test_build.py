@@ -0,0 +1,83 @@
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+
+from src.sitegen.build import BuildConfig, _build_page, create_context, save_state, site_variants
+from src.sitegen.dates import get_day_ranges
+from src.sitegen.normalize import normalize_match
+
+NOW = datetime(2026, 3, 1, 12, tzinfo=timezone.utc)
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _config(tmp_path):
+    template_dir = tmp_path / "templates"
+    shutil.copytree(REPO_ROOT / "src" / "templates", template_dir)
+    dist_dir = tmp_path / "dist"
+    return BuildConfig(
+        site_url="https://example.test",
+        pandascore_token="token",
+        pandascore_base_url="https://api.test",
+        day_mode="utc",
+        tz_name="UTC",
+        cache_ttl_seconds=120,
+        dist_dir=dist_dir,
+        template_dir=template_dir,
+        template_name="day.html.j2",
+        assets_src_dir=tmp_path / "assets",
+        assets_out_dir=dist_dir / "assets",
+        assets_img_out_dir=dist_dir / "assets" / "img",
+        org_name="Esports Matches",
+        download_images=False,
+        state_path=tmp_path / "state.json",
+        report_path=tmp_path / "report.json",
+    )
+
+
+def _build_today(cfg):
+    ctx = create_context(cfg)
+    dr = get_day_ranges("utc", "UTC", now_utc=NOW)[1]
+    match = normalize_match(
+        {"id": 1, "status": "not_started", "begin_at": "2026-03-01T15:00:00Z", "videogame": {"name": "Dota 2"}}
+    )
+    rendered = _build_page(ctx, site_variants(cfg)[0], dr, {dr.start_dt_utc.date(): ([match], True)})
+    save_state(ctx)
+    return rendered
+
+
+def test_unchanged_page_is_skipped_only_with_all_outputs(tmp_path):
+    cfg = _config(tmp_path)
+    assert _build_today(cfg)
+    assert not _build_today(cfg)
+
+    (cfg.dist_dir / "today" / "dota-2" / "search.json").unlink()
+    assert _build_today(cfg)
+    assert (cfg.dist_dir / "today" / "dota-2" / "search.json").exists()
+
+
+def test_template_change_rerenders(tmp_path):
+    cfg = _config(tmp_path)
+    assert _build_today(cfg)
+    template = cfg.template_dir / "day.html.j2"
+    template.write_text(template.read_text(encoding="utf-8") + "\n<!-- v2 -->\n", encoding="utf-8")
+
+    assert _build_today(cfg)
+    assert "<!-- v2 -->" in (cfg.dist_dir / "today" / "index.html").read_text(encoding="utf-8")
+
+
+def test_page_json_carries_only_rendered_fields(tmp_path):
+    cfg = _config(tmp_path)
+    _build_today(cfg)
+    html = (cfg.dist_dir / "today" / "index.html").read_text(encoding="utf-8")
+
+    assert '"game_name": "Dota 2"' in html
+    assert '"status_ru"' not in html and '"game_slug"' not in html
+
+
+def test_default_variant_keeps_the_baseline_seo_text(tmp_path):
+    cfg = _config(tmp_path)
+    _build_today(cfg)
+
+    html = (cfg.dist_dir / "today" / "index.html").read_text(encoding="utf-8")
+    assert "<title>Сегодня: киберспортивные матчи</title>" in html
+    assert '<meta name="description" content="Расписание и результаты киберспортивных матчей за сегодня." />' in html
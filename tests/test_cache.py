@@ -0,0 +1,126 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.sitegen import cache
+from src.sitegen.cache_backends import FileCacheBackend
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path):
+    cache.set_backend(FileCacheBackend(tmp_path / "http"))
+    yield
+    cache.set_backend(None)
+
+
+def test_second_call_within_ttl_is_cached():
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return [{"id": 1}]
+
+    first = cache.get_or_fetch("https://api.test/m", None, 60, fetch)
+    second = cache.get_or_fetch("https://api.test/m", None, 60, fetch)
+
+    assert first == ([{"id": 1}], False)
+    assert second == ([{"id": 1}], True)
+    assert len(calls) == 1
+
+
+def test_on_refresh_sees_previous_data_and_is_stored_in_meta():
+    seen = []
+
+    def on_refresh(previous, fresh):
+        seen.append((previous, fresh))
+        return {"count": len(fresh)}
+
+    cache.get_or_fetch("https://api.test/m", None, 0, lambda: [1], on_refresh=on_refresh)
+    cache.clear_memory_cache()
+    cache.get_or_fetch("https://api.test/m", None, 0, lambda: [1, 2], on_refresh=on_refresh)
+
+    assert seen == [(None, [1]), ([1], [1, 2])]
+    assert cache.read_meta("https://api.test/m", None)["refresh"] == {"count": 2}
+
+
+def test_concurrent_misses_share_one_fetch():
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(timeout=5)
+        return ["fresh"]
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_fetch("https://api.test/m", None, 60, fetch)))
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    while not calls:
+        time.sleep(0.001)
+    release.set()
+    for t in threads:
+        t.join(timeout=5)
+
+    assert len(calls) == 1
+    assert [data for data, _ in results] == [["fresh"]] * 5
+
+
+def test_stale_entry_served_while_refreshing_in_background():
+    cache.get_or_fetch("https://api.test/m", None, 0, lambda: ["old"])
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        got = cache.get_or_fetch(
+            "https://api.test/m",
+            None,
+            0,
+            lambda: ["new"],
+            stale_ttl_seconds=3600,
+            executor=pool,
+        )
+    # Pool shutdown waits for the refresh to finish.
+    cache.clear_memory_cache()
+
+    assert got == (["old"], True)
+    assert cache.get_or_fetch("https://api.test/m", None, 60, lambda: ["unused"]) == (["new"], True)
+
+
+def test_key_ignores_param_order_and_authorization():
+    a = cache._build_cache_key(
+        "https://API.test/matches?sort=begin_at&filter[begin_at]=2026-02-20",
+        {"Authorization": "Bearer one", "Accept": "application/json"},
+    )
+    b = cache._build_cache_key(
+        "https://api.test/matches?filter%5Bbegin_at%5D=2026-02-20&sort=begin_at",
+        {"accept": "application/json", "authorization": "Bearer two"},
+    )
+
+    assert a == b
+    assert a != cache._build_cache_key("https://api.test/matches?sort=begin_at", None)
+
+
+def test_semantic_key_shares_entry_across_urls():
+    cache.get_or_fetch("https://api.test/a", None, 60, lambda: ["day"], cache_key="matches:2026-02-20")
+
+    got = cache.get_or_fetch("https://api.test/b", None, 60, lambda: ["other"], cache_key="matches:2026-02-20")
+
+    assert got == (["day"], True)
+
+
+def test_stale_if_error_serves_expired_entry():
+    cache.get_or_fetch("https://api.test/m", None, 0, lambda: ["old"])
+    cache.clear_memory_cache()
+
+    def fail():
+        raise ConnectionError("down")
+
+    assert cache.get_or_fetch("https://api.test/m", None, 0, fail, stale_if_error=True) == (["old"], True)
+    with pytest.raises(ConnectionError):
+        cache.get_or_fetch("https://api.test/m", None, 0, fail)
+    with pytest.raises(ConnectionError):
+        cache.get_or_fetch("https://api.test/other", None, 0, fail, stale_if_error=True)
@@ -0,0 +1,116 @@
+import socket
+import sqlite3
+import threading
+
+import pytest
+
+from src.sitegen.cache_backends import (
+    CacheBackend,
+    FileCacheBackend,
+    RedisCacheBackend,
+    SQLiteCacheBackend,
+    backend_from_env,
+)
+
+
+class _FakeRedisServer:
+    """Tiny RESP server supporting GET, SET (with EX) and MGET."""
+
+    def __init__(self):
+        self.store = {}
+        self.sock = socket.socket()
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen()
+        self.port = self.sock.getsockname()[1]
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn):
+        reader = conn.makefile("rb")
+        while True:
+            header = reader.readline()
+            if not header:
+                return
+            args = []
+            for _ in range(int(header[1:])):
+                size = int(reader.readline()[1:])
+                args.append(reader.read(size + 2)[:-2])
+            conn.sendall(self._dispatch(args))
+
+    def _bulk(self, value):
+        return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def _dispatch(self, args):
+        cmd = args[0].upper()
+        if cmd == b"SET":
+            self.store[args[1]] = args[2]
+            return b"+OK\r\n"
+        if cmd == b"GET":
+            return self._bulk(self.store.get(args[1]))
+        if cmd == b"MGET":
+            return b"*%d\r\n" % (len(args) - 1) + b"".join(self._bulk(self.store.get(k)) for k in args[1:])
+        return b"-ERR unknown command\r\n"
+
+    def close(self):
+        self.sock.close()
+
+
+def _roundtrip(backend):
+    assert backend.get("k") is None
+    assert backend.get_meta("k") is None
+
+    backend.set("k", {"saved_at": 1.5}, [{"id": 1, "name": "Команда"}])
+
+    assert backend.get("k") == ({"saved_at": 1.5}, [{"id": 1, "name": "Команда"}])
+    assert backend.get_meta("k") == {"saved_at": 1.5}
+
+
+def test_file_backend_roundtrip(tmp_path):
+    _roundtrip(FileCacheBackend(tmp_path))
+
+
+def test_sqlite_backend_is_shared_and_uses_wal(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    writer = SQLiteCacheBackend(path)
+    _roundtrip(writer)
+
+    reader = SQLiteCacheBackend(path)
+
+    assert reader.get_meta("k") == {"saved_at": 1.5}
+    assert sqlite3.connect(path).execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_redis_backend_roundtrip_against_fake_server():
+    server = _FakeRedisServer()
+    try:
+        backend = RedisCacheBackend(f"redis://127.0.0.1:{server.port}/0", prefix="t:")
+        _roundtrip(backend)
+        assert b"t:k:data" in server.store
+    finally:
+        server.close()
+
+
+def test_backend_from_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("CACHE_BACKEND", "sqlite")
+    monkeypatch.setenv("CACHE_SQLITE_PATH", str(tmp_path / "c.sqlite3"))
+    assert isinstance(backend_from_env(), SQLiteCacheBackend)
+
+    monkeypatch.setenv("CACHE_BACKEND", "memcached")
+    with pytest.raises(RuntimeError):
+        backend_from_env()
+
+
+def test_backend_base_requires_get_and_set():
+    class Incomplete(CacheBackend):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,137 @@
+import time
+
+import pytest
+import requests
+
+from src.sitegen import circuit
+from src.sitegen.circuit import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitConfig, CircuitOpenError
+from src.sitegen.images import download_image
+from src.sitegen.pandascore import PandaScoreClient
+
+
+def _breaker(open_seconds=60.0):
+    return CircuitBreaker("api.test", CircuitConfig(window=10, min_calls=4, failure_rate=0.5, open_seconds=open_seconds))
+
+
+def _call(breaker, success):
+    breaker.before_call()
+    breaker.record(success)
+
+
+def test_opens_once_failure_rate_is_reached():
+    breaker = _breaker()
+    for success in (True, False, True):
+        _call(breaker, success)
+    assert breaker.state == CLOSED  # below min_calls
+
+    _call(breaker, False)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError) as excinfo:
+        breaker.before_call()
+    assert excinfo.value.host == "api.test"
+    assert excinfo.value.retry_in > 0
+
+
+def test_mostly_successful_calls_keep_it_closed():
+    breaker = _breaker()
+    for _ in range(5):
+        _call(breaker, True)
+        _call(breaker, True)
+        _call(breaker, False)
+    assert breaker.state == CLOSED
+
+
+def test_half_open_lets_one_probe_through():
+    breaker = _breaker(open_seconds=0.02)
+    for _ in range(4):
+        _call(breaker, False)
+    time.sleep(0.03)
+
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # the probe is still in flight
+    breaker.record(True)
+    assert breaker.state == CLOSED
+    breaker.before_call()
+
+
+def test_failed_probe_reopens():
+    breaker = _breaker(open_seconds=0.02)
+    for _ in range(4):
+        _call(breaker, False)
+    time.sleep(0.03)
+
+    _call(breaker, False)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+class _DownResponse:
+    status_code = 503
+    headers = {}
+    content = b""
+
+    def raise_for_status(self):
+        raise requests.HTTPError("HTTP 503")
+
+
+class _DownSession:
+    def __init__(self):
+        self.calls = 0
+
+    def request(self, method, url, timeout=None, **kwargs):
+        self.calls += 1
+        return _DownResponse()
+
+    def get(self, url, timeout=None):
+        return self.request("GET", url, timeout=timeout)
+
+
+@pytest.fixture
+def tripping_circuit(monkeypatch):
+    # A single failure opens the circuit; any sleep would be a retry the breaker should have cut short.
+    monkeypatch.setattr(circuit, "_config", CircuitConfig(window=4, min_calls=1, failure_rate=0.5, open_seconds=60))
+    sleeps = []
+    monkeypatch.setattr(time, "sleep", sleeps.append)
+    circuit.reset()
+    yield sleeps
+    circuit.reset()
+
+
+def test_client_stops_retrying_once_the_circuit_opens(tripping_circuit):
+    session = _DownSession()
+    client = PandaScoreClient("token", base_url="https://api.test")
+    client.session = session
+
+    with pytest.raises(requests.HTTPError):
+        client.fetch_all_pages("/matches", {})
+    assert session.calls == 1
+    assert tripping_circuit == []
+
+    with pytest.raises(CircuitOpenError):
+        client.fetch_all_pages("/matches", {})
+    assert session.calls == 1
+
+
+def test_download_image_skips_once_the_circuit_opens(tripping_circuit, monkeypatch, tmp_path):
+    session = _DownSession()
+    monkeypatch.setattr(requests, "get", session.get)
+
+    assert download_image("https://img.test/a.png", tmp_path / "a") is None
+    assert session.calls == 1
+    assert tripping_circuit == []
+
+    assert download_image("https://img.test/b.png", tmp_path / "b") is None
+    assert session.calls == 1
+
+
+def test_invalid_env_falls_back_to_defaults(monkeypatch):
+    monkeypatch.setenv("CIRCUIT_WINDOW", "lots")
+    monkeypatch.setattr(circuit, "_config", None)
+    circuit.reset()
+    try:
+        assert circuit.breaker_for("api.test").config == CircuitConfig()
+    finally:
+        circuit.reset()
@@ -1,8 +1,8 @@
-﻿from datetime import datetime, timezone
+﻿from datetime import date, datetime, timezone
 
 import pytest
 
-from src.sitegen.dates import get_day_ranges
+from src.sitegen.dates import day_range_for_date, get_day_ranges
 
 
 def _by_slug(items):
@@ -33,3 +33,11 @@ def test_get_day_ranges_local_mode_fixed_now():
 def test_get_day_ranges_invalid_mode():
     with pytest.raises(ValueError):
         get_day_ranges("bad", "UTC", now_utc=datetime(2026, 2, 20, tzinfo=timezone.utc))
+
+
+def test_day_range_for_date_local_mode():
+    got = day_range_for_date(date(2026, 2, 20), "local", "Europe/Moscow", slug="archive/2026-02-20", label_ru="Архив")
+
+    assert got.start_dt_utc.isoformat() == "2026-02-19T21:00:00+00:00"
+    assert got.end_dt_utc.isoformat() == "2026-02-20T21:00:00+00:00"
+    assert got.date_str_display == "2026-02-20"
@@ -0,0 +1,50 @@
+from src.sitegen.diff import diff_matches
+
+
+def _m(match_id, **kw):
+    base = {
+        "id": match_id,
+        "title": f"Match {match_id}",
+        "status": "not_started",
+        "score_str": "VS",
+        "begin_at": "2026-02-20T10:00:00Z",
+        "end_at": None,
+        "is_rescheduled": False,
+        "original_scheduled_at": None,
+        "stream_url": "",
+    }
+    base.update(kw)
+    return base
+
+
+def test_identical_sets_in_any_order_are_empty():
+    old = [_m(1), _m(2)]
+    new = [_m(2), _m(1)]
+
+    assert diff_matches(old, new).is_empty
+
+
+def test_added_removed_and_changed_fields():
+    old = [_m(1), _m(2), _m(3)]
+    new = [
+        _m(1, status="running", score_str="1–0"),
+        _m(3, begin_at="2026-02-20T12:00:00Z", is_rescheduled=True),
+        _m(4),
+    ]
+
+    got = diff_matches(old, new)
+
+    assert got.added == [4]
+    assert got.removed == [2]
+    by_id = {c.id: c for c in got.changed}
+    assert by_id[1].fields == {"status": ("not_started", "running"), "score_str": ("VS", "1–0")}
+    assert not by_id[1].rescheduled
+    assert by_id[3].rescheduled
+
+
+def test_untracked_change_reported_as_details():
+    got = diff_matches([_m(1)], [_m(1, stream_url="https://twitch.tv/x")])
+
+    assert not got.is_empty
+    assert list(got.changed[0].fields) == ["details"]
+    assert got.summary()["changed"][0]["id"] == 1
@@ -0,0 +1,146 @@
+import os
+import time
+from datetime import date, datetime, timezone
+
+from src.sitegen import history
+from src.sitegen.history import HistoryStore, day_is_settled, may_be_final
+
+DAY = date(2026, 3, 1)
+
+
+def _match(match_id, hour, status="finished", score="1–0", day=DAY):
+    return {
+        "id": match_id,
+        "status": status,
+        "score_str": score,
+        "begin_at": f"{day.isoformat()}T{hour:02d}:00:00Z",
+    }
+
+
+def _age_segments(directory):
+    old = time.time() - history.COMPACT_QUIET_SECONDS - 1
+    for path in directory.glob("*.seg"):
+        os.utime(path, (old, old))
+
+
+def test_records_only_changes_and_replays_them(tmp_path):
+    store = HistoryStore(tmp_path)
+    assert store.day(DAY) is None
+
+    assert store.record_day(DAY, [_match(1, 12), _match(2, 10)])
+    size = (tmp_path / "00000001.seg").stat().st_size
+    # An unchanged refresh writes nothing.
+    assert not store.record_day(DAY, [_match(2, 10), _match(1, 12)])
+    assert (tmp_path / "00000001.seg").stat().st_size == size
+    assert store.record_day(DAY, [_match(1, 12, score="2–0"), _match(3, 15)])
+
+    reopened = HistoryStore(tmp_path)
+    assert [(m["id"], m["score_str"]) for m in reopened.day(DAY)] == [(1, "2–0"), (3, "1–0")]
+    assert reopened.days() == [DAY]
+
+
+def test_final_days_only_through_final_day(tmp_path):
+    store = HistoryStore(tmp_path)
+    store.record_day(DAY, [_match(1, 12)])
+    assert store.final_day(DAY) is None
+
+    assert store.record_day(DAY, [_match(1, 12)], final=True)
+    assert [m["id"] for m in store.final_day(DAY)] == [1]
+    # A later non-final record does not reopen the day.
+    store.record_day(DAY, [_match(1, 12, score="0–1")])
+    assert HistoryStore(tmp_path).final_day(DAY)[0]["score_str"] == "0–1"
+
+
+def test_matches_between_spans_days(tmp_path):
+    store = HistoryStore(tmp_path)
+    next_day = date(2026, 3, 2)
+    store.record_day(DAY, [_match(1, 20), _match(2, 22)])
+    store.record_day(next_day, [_match(3, 1, day=next_day), _match(4, 23, day=next_day)])
+
+    got = store.matches_between(
+        datetime(2026, 3, 1, 21, tzinfo=timezone.utc), datetime(2026, 3, 2, 21, tzinfo=timezone.utc)
+    )
+    assert [m["id"] for m in got] == [2, 3]
+
+
+def test_segments_roll_over_and_compact(tmp_path):
+    store = HistoryStore(tmp_path, segment_max_bytes=1)
+    for score in range(5):
+        store.record_day(DAY, [_match(1, 12, score=f"{score}–0"), _match(2, 14)])
+    store.record_day(date(2026, 3, 2), [], final=True)
+    assert len(list(tmp_path.glob("*.seg"))) == 6
+
+    _age_segments(tmp_path)
+    assert store.maybe_compact() == 5
+    assert sorted(p.name for p in tmp_path.glob("*.seg")) == ["00000005-1.seg", "00000006.seg"]
+
+    reopened = HistoryStore(tmp_path)
+    assert [m["score_str"] for m in reopened.day(DAY)] == ["4–0", "1–0"]
+    assert reopened.final_day(date(2026, 3, 2)) == []
+    # Writes after compaction still apply on top of the snapshot.
+    reopened.record_day(DAY, [_match(1, 12, score="9–0")])
+    assert HistoryStore(tmp_path).day(DAY)[0]["score_str"] == "9–0"
+
+
+def test_torn_tail_is_skipped(tmp_path):
+    store = HistoryStore(tmp_path)
+    store.record_day(DAY, [_match(1, 12)])
+    with (tmp_path / "00000001.seg").open("ab") as f:
+        f.write(b"MHS1\xff\xff")
+
+    reopened = HistoryStore(tmp_path)
+    assert [m["id"] for m in reopened.day(DAY)] == [1]
+    reopened.record_day(DAY, [_match(1, 12), _match(2, 13)])
+    assert (tmp_path / "00000002.seg").exists()
+    assert [m["id"] for m in HistoryStore(tmp_path).day(DAY)] == [1, 2]
+
+
+def test_day_is_settled():
+    settled = [_match(1, 12)]
+    running = [_match(1, 12, status="running")]
+    assert not day_is_settled(DAY, settled, datetime(2026, 3, 2, 3, tzinfo=timezone.utc))
+    assert day_is_settled(DAY, settled, datetime(2026, 3, 2, 7, tzinfo=timezone.utc))
+    assert not day_is_settled(DAY, running, datetime(2026, 3, 2, 7, tzinfo=timezone.utc))
+    assert not day_is_settled(DAY, [], datetime(2026, 3, 2, 7, tzinfo=timezone.utc))
+    assert day_is_settled(DAY, running, datetime(2026, 3, 5, tzinfo=timezone.utc))
+
+
+def test_may_be_final_waits_for_the_settle_period():
+    assert not may_be_final(DAY, datetime(2026, 3, 1, 23, tzinfo=timezone.utc))
+    assert not may_be_final(DAY, datetime(2026, 3, 2, 5, tzinfo=timezone.utc))
+    assert may_be_final(DAY, datetime(2026, 3, 2, 6, tzinfo=timezone.utc))
+
+
+def test_reads_rescan_at_most_every_refresh_interval(tmp_path):
+    writer = HistoryStore(tmp_path)
+    writer.record_day(DAY, [_match(1, 12)])
+    reader = HistoryStore(tmp_path, refresh_interval=3600)
+    assert [m["id"] for m in reader.day(DAY)] == [1]
+
+    writer.record_day(DAY, [_match(1, 12), _match(2, 13)])
+    assert [m["id"] for m in reader.day(DAY)] == [1]
+    # Writes always see every append, so the delta is taken against the latest state.
+    assert not reader.record_day(DAY, [_match(1, 12), _match(2, 13)])
+    assert [m["id"] for m in reader.day(DAY)] == [1, 2]
+
+
+def test_other_format_version_is_not_final(tmp_path, monkeypatch):
+    store = HistoryStore(tmp_path, segment_max_bytes=1)
+    with monkeypatch.context() as m:
+        m.setattr(history, "FORMAT_VERSION", 0)
+        store.record_day(DAY, [_match(1, 12)], final=True)
+    store.record_day(date(2026, 3, 2), [], final=True)
+    store.record_day(date(2026, 3, 3), [], final=True)
+
+    assert store.final_day(DAY) is None
+    assert [m["id"] for m in store.day(DAY)] == [1]
+    # Compaction keeps the day outdated rather than upgrading it.
+    _age_segments(tmp_path)
+    assert store.compact() == 2
+    reopened = HistoryStore(tmp_path)
+    assert reopened.final_day(DAY) is None
+    assert reopened.final_day(date(2026, 3, 2)) == []
+
+    # The next record rewrites the day as a snapshot in the current version.
+    assert store.record_day(DAY, [_match(1, 12)], final=True)
+    assert [m["id"] for m in HistoryStore(tmp_path).final_day(DAY)] == [1]
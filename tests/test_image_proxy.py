@@ -0,0 +1,108 @@
+import os
+import threading
+import time
+
+from src.sitegen.image_proxy import ImageProxy, ImageStore, StoredImage, image_digest
+
+
+def _image(size):
+    return StoredImage(content=b"x" * size, content_type="image/png", etag='"e"')
+
+
+def test_store_evicts_least_recently_used(tmp_path):
+    store = ImageStore(tmp_path, max_bytes=250)
+    for name in ("a", "b"):
+        store.put(name, f"https://cdn/{name}.png", _image(100))
+    assert store.get("a") is not None  # "b" is now the oldest
+    store.put("c", "https://cdn/c.png", _image(100))
+
+    assert store.get("b") is None
+    assert store.get("a").content == b"x" * 100
+    assert store.total_bytes == 200
+    # A new store over the same directory sees the surviving entries.
+    assert ImageStore(tmp_path, max_bytes=250).get("c") is not None
+
+
+def test_concurrent_misses_share_one_fetch(tmp_path):
+    calls = []
+
+    def fetch(url):
+        calls.append(url)
+        time.sleep(0.05)
+        return b"png", "image/png"
+
+    proxy = ImageProxy(ImageStore(tmp_path, max_bytes=1 << 20), fetch)
+    digest = proxy.register("https://cdn/logo.png")
+    assert digest == image_digest("https://cdn/logo.png")
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(proxy.get(digest))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ["https://cdn/logo.png"]
+    assert {r.content for r in results} == {b"png"}
+    assert proxy.get(digest).etag == results[0].etag
+
+
+def test_unknown_and_failed_digests(tmp_path):
+    calls = []
+
+    def fetch(url):
+        calls.append(url)
+        raise OSError("boom")
+
+    proxy = ImageProxy(ImageStore(tmp_path, max_bytes=1 << 20), fetch)
+    assert proxy.get(image_digest("https://never/registered.png")) is None
+
+    digest = proxy.register("https://cdn/broken.png")
+    assert proxy.get(digest) is None
+    assert proxy.get(digest) is None
+    assert len(calls) == 1
+
+
+def test_registration_is_shared_through_the_store(tmp_path):
+    fetched = []
+
+    def fetch(url):
+        fetched.append(url)
+        return b"png", "image/png"
+
+    # Two workers over one directory: the page is rendered by one, the image requested from the other.
+    digest = ImageProxy(ImageStore(tmp_path, max_bytes=1 << 20), fetch).register("https://cdn/logo.png")
+    other = ImageProxy(ImageStore(tmp_path, max_bytes=1 << 20), fetch)
+
+    assert other.get(digest).content == b"png"
+    assert fetched == ["https://cdn/logo.png"]
+
+
+def test_size_cap_spans_stores_sharing_a_directory(tmp_path):
+    first = ImageStore(tmp_path, max_bytes=250)
+    second = ImageStore(tmp_path, max_bytes=250)
+    first.put("a", "https://cdn/a.png", _image(100))
+    second.put("b", "https://cdn/b.png", _image(100))
+    first.put("c", "https://cdn/c.png", _image(100))
+
+    assert second.total_bytes == 200
+    assert second.get("a") is None
+
+
+def test_old_registrations_without_an_image_are_pruned(tmp_path):
+    store = ImageStore(tmp_path, max_bytes=250, registration_max_age=86400)
+    for name in ("kept", "cached", "recent"):
+        store.register(name, f"https://cdn/{name}.png")
+    store.put("cached", "https://cdn/cached.png", _image(10))
+    old = time.time() - 2 * 86400
+    for name in ("kept", "cached"):
+        os.utime(tmp_path / f"{name}.url", (old, old))
+    # Still rendered: renewing an old registration keeps it.
+    store.register("kept", "https://cdn/kept.png")
+    os.utime(tmp_path / "recent.url", (old, old))
+
+    assert store.prune_registrations() == 1
+    assert store.registered_url("recent") is None
+    assert store.registered_url("kept") == "https://cdn/kept.png"
+    # Registrations of cached images stay, whatever their age.
+    assert store.registered_url("cached") == "https://cdn/cached.png"
@@ -0,0 +1,57 @@
+import pytest
+
+from src.sitegen.index import MatchIndex
+from src.sitegen.normalize import normalize_match
+
+
+def _match(match_id, game, game_slug, league, teams, status="not_started"):
+    return normalize_match(
+        {
+            "id": match_id,
+            "status": status,
+            "videogame": {"name": game, "slug": game_slug},
+            "league": {"name": league, "slug": league.lower().replace(" ", "-")},
+            "tournament": {"name": "Playoffs"},
+            "opponents": [
+                {"opponent": {"name": name, "acronym": acronym, "slug": name.lower().replace(" ", "-")}}
+                for name, acronym in teams
+            ],
+        }
+    )
+
+
+MATCHES = [
+    _match(1, "Counter-Strike", "cs-go", "ESL Pro League", [("Natus Vincere", "NAVI"), ("FaZe Clan", "FaZe")]),
+    _match(2, "Dota 2", "dota-2", "DreamLeague", [("Team Spirit", "TS"), ("Natus Vincere", "NAVI")], "finished"),
+    _match(3, "Counter-Strike", "cs-go", "BLAST Premier", [("Vitality", "VIT"), ("G2 Esports", "G2")], "finished"),
+]
+
+
+def test_query_intersects_facets_and_resolves_aliases():
+    index = MatchIndex.build(MATCHES)
+
+    assert [m["id"] for m in index.query(game="cs2")] == [1, 3]
+    assert [m["id"] for m in index.query(game="cs2", team="navi")] == [1]
+    assert [m["id"] for m in index.query(team="natus-vincere")] == [1, 2]
+    assert [m["id"] for m in index.query(status="finished", league="BLAST Premier")] == [3]
+
+
+def test_query_unions_comma_separated_values_and_keeps_order():
+    index = MatchIndex.build(MATCHES)
+
+    assert [m["id"] for m in index.query(game="dota-2,cs-go")] == [1, 2, 3]
+    assert [m["id"] for m in index.query(game=None, team="")] == [1, 2, 3]
+    assert index.query(team="nobody") == []
+
+
+def test_facet_counts_each_match_once():
+    index = MatchIndex.build(MATCHES)
+
+    assert index.facet("game") == [("cs-go", "Counter-Strike", 2), ("dota-2", "Dota 2", 1)]
+    teams = dict((key, count) for key, _label, count in index.facet("team"))
+    assert teams["natus-vincere"] == 2
+
+
+def test_unknown_facet_is_rejected():
+    with pytest.raises(ValueError):
+        MatchIndex.build(MATCHES).query(region="eu")
@@ -0,0 +1,33 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _modules_after_import(module: str) -> set[str]:
+    code = f"import sys, json, {module}; print(json.dumps(sorted(sys.modules)))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    return set(json.loads(result.stdout))
+
+
+@pytest.mark.parametrize("module", ["src.sitegen.build", "src.sitegen.daemon"])
+def test_build_entry_points_defer_optional_subsystems(module: str) -> None:
+    loaded = _modules_after_import(module)
+
+    for lazy in ("requests", "jinja2", "dotenv", "src.sitegen.images", "sqlite3", "cProfile"):
+        assert lazy not in loaded
+
+
+def test_client_creates_session_on_first_use() -> None:
+    from src.sitegen.pandascore import PandaScoreClient
+
+    client = PandaScoreClient("token", base_url="https://api.test")
+    assert client._session is None
+
+    session = client.session
+    assert session is client.session
+    assert session.headers["Authorization"] == "Bearer token"
@@ -0,0 +1,52 @@
+import threading
+
+from src.sitegen.live import LiveFeed, sse_message
+
+
+def _match(match_id, status, score="0 : 0"):
+    return {"id": match_id, "status": status, "status_ru": status, "score_str": score, "end_at": None, "title": "x"}
+
+
+def test_first_publish_emits_running_matches_only():
+    feed = LiveFeed()
+    event = feed.publish([_match(1, "running"), _match(2, "not_started")])
+
+    assert event["seq"] == 1
+    assert set(event["matches"]) == {"1"}
+
+
+def test_delta_contains_only_changed_fields_of_running_matches():
+    feed = LiveFeed()
+    feed.publish([_match(1, "running"), _match(2, "not_started")])
+
+    assert feed.publish([_match(1, "running"), _match(2, "not_started")]) is None
+    event = feed.publish([_match(1, "running", "1 : 0"), _match(2, "not_started")])
+    assert event["matches"] == {"1": {"score_str": "1 : 0"}}
+
+    event = feed.publish([_match(1, "finished", "2 : 0"), _match(2, "not_started")])
+    assert event["matches"]["1"]["status"] == "finished"
+    assert feed.snapshot()["matches"] == {}
+
+
+def test_wait_times_out_and_wakes_on_publish():
+    feed = LiveFeed()
+    feed.publish([_match(1, "running")])
+    assert feed.wait(1, timeout=0.01) == []
+
+    timer = threading.Timer(0.05, feed.publish, args=([_match(1, "running", "0 : 1")],))
+    timer.start()
+    events = feed.wait(1, timeout=5)
+    timer.join()
+    assert [e["seq"] for e in events] == [2]
+
+
+def test_wait_returns_snapshot_when_history_is_lost():
+    feed = LiveFeed(history=1)
+    for score in ("1 : 0", "2 : 0", "3 : 0"):
+        feed.publish([_match(1, "running", score)])
+
+    events = feed.wait(0, timeout=0)
+    assert events[0]["snapshot"] is True
+    assert events[0]["matches"]["1"]["score_str"] == "3 : 0"
+    assert feed.wait(99, timeout=0)[0]["snapshot"] is True
+    assert sse_message(events[0]).startswith("id: 3\nevent: snapshot\ndata: ")
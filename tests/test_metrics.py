@@ -0,0 +1,32 @@
+from src.sitegen.metrics import MetricsRegistry
+
+
+def test_counters_and_summaries_by_labels():
+    registry = MetricsRegistry()
+
+    registry.inc("sitegen_cache_requests_total", tier="memory", result="hit")
+    registry.inc("sitegen_cache_requests_total", tier="memory", result="hit")
+    registry.observe("sitegen_render_bytes", 100, page="today")
+    registry.observe("sitegen_render_bytes", 300, page="today")
+
+    snap = registry.snapshot()
+    assert snap["counters"]["sitegen_cache_requests_total"] == [
+        {"labels": {"result": "hit", "tier": "memory"}, "value": 2.0}
+    ]
+    assert snap["summaries"]["sitegen_render_bytes"] == [
+        {"labels": {"page": "today"}, "count": 2, "sum": 400, "max": 300}
+    ]
+
+
+def test_prometheus_text_format():
+    registry = MetricsRegistry()
+    registry.inc("sitegen_http_retries_total", host="api.test")
+    with registry.timer("sitegen_render_seconds", page='a"b'):
+        pass
+
+    text = registry.render_prometheus()
+
+    assert "# TYPE sitegen_http_retries_total counter" in text
+    assert 'sitegen_http_retries_total{host="api.test"} 1' in text
+    assert 'sitegen_render_seconds_count{page="a\\"b"} 1' in text
+    assert text.endswith("\n")
@@ -0,0 +1,68 @@
+import threading
+
+from src.sitegen.pandascore import PandaScoreClient
+
+
+class _FakeResponse:
+    def __init__(self, payload, headers=None, status_code=200):
+        self._payload = payload
+        self.headers = headers or {}
+        self.status_code = status_code
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        pass
+
+
+class _FakeSession:
+    def __init__(self, pages, headers):
+        self.pages = pages
+        self.headers_for = headers
+        self.requested = []
+        self._lock = threading.Lock()
+
+    def request(self, method, url, timeout=None, params=None):
+        number = params["page[number]"]
+        with self._lock:
+            self.requested.append(number)
+        return _FakeResponse(self.pages[number - 1], self.headers_for(number))
+
+
+def _client(session):
+    client = PandaScoreClient("token", base_url="https://api.test", max_workers=3)
+    client.session = session
+    return client
+
+
+def test_fan_out_uses_total_header():
+    pages = [[{"id": 1}, {"id": 2}], [{"id": 3}, {"id": 4}], [{"id": 5}]]
+    session = _FakeSession(pages, lambda n: {"X-Total": "250", "X-Per-Page": "100"})
+
+    items, count = _client(session).fetch_all_pages("matches", {"filter[begin_at]": "2026-02-20"})
+
+    assert [m["id"] for m in items] == [1, 2, 3, 4, 5]
+    assert count == 3
+    assert sorted(session.requested) == [1, 2, 3]
+
+
+def test_fan_out_uses_last_link():
+    pages = [[{"id": 1}], [{"id": 2}]]
+    link = '<https://api.test/matches?page%5Bnumber%5D=2&page%5Bsize%5D=100>; rel="last"'
+    session = _FakeSession(pages, lambda n: {"Link": link})
+
+    items, count = _client(session).fetch_all_pages("matches", {})
+
+    assert [m["id"] for m in items] == [1, 2]
+    assert count == 2
+
+
+def test_sequential_fallback_follows_next_link():
+    pages = [[{"id": 1}], [{"id": 2}], []]
+    session = _FakeSession(pages, lambda n: {"Link": '<https://api.test/m?page=x>; rel="next"'})
+
+    items, count = _client(session).fetch_all_pages("matches", {})
+
+    assert [m["id"] for m in items] == [1, 2]
+    assert count == 3
@@ -0,0 +1,24 @@
+from src.sitegen.prefetch import Prefetcher
+from src.sitegen.schedule import RefreshSchedule
+
+
+def test_run_pending_refreshes_due_keys_and_survives_errors():
+    calls = []
+    ticks = []
+
+    def refresh(key):
+        calls.append(key)
+        if key == "today":
+            raise RuntimeError("upstream down")
+
+    prefetcher = Prefetcher(
+        RefreshSchedule({"today": 60, "tomorrow": 60}),
+        refresh=refresh,
+        on_tick=lambda: ticks.append(1),
+    )
+
+    prefetcher.run_pending()
+    prefetcher.run_pending()
+
+    assert sorted(calls) == ["today", "tomorrow"]
+    assert ticks == [1, 1]
@@ -0,0 +1,47 @@
+from pathlib import Path
+
+import pytest
+
+from src.sitegen import profiling
+
+
+@pytest.fixture(autouse=True)
+def _reset_profiling():
+    yield
+    profiling.configure("")
+
+
+def _work() -> int:
+    return sum(len(str(i)) for i in range(20000))
+
+
+def test_section_is_noop_when_disabled(tmp_path: Path) -> None:
+    profiling.configure("", directory=tmp_path)
+
+    with profiling.section("noop"):
+        _work()
+
+    assert list(tmp_path.iterdir()) == []
+    assert profiling.section("a") is profiling.section("b")
+
+
+def test_section_writes_pstats_collapsed_and_allocations(tmp_path: Path) -> None:
+    profiling.configure("all", directory=tmp_path)
+
+    with profiling.section("build.render.today"):
+        _work()
+
+    names = sorted(p.name.split("-", 1)[1] for p in tmp_path.iterdir())
+    assert names == ["build.render.today.alloc.txt", "build.render.today.collapsed", "build.render.today.pstats"]
+
+    collapsed = next(tmp_path.glob("*.collapsed")).read_text(encoding="utf-8").splitlines()
+    assert collapsed
+    assert any("_work" in line for line in collapsed)
+    for line in collapsed:
+        stack, value = line.rsplit(" ", 1)
+        assert stack and int(value) > 0
+
+
+def test_configure_rejects_unknown_modes() -> None:
+    with pytest.raises(ValueError):
+        profiling.configure("cpu,gpu")
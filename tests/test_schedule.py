@@ -0,0 +1,29 @@
+import pytest
+
+from src.sitegen.schedule import RefreshSchedule
+
+
+def test_keys_follow_their_own_interval():
+    schedule = RefreshSchedule({"today": 60, "tomorrow": 900})
+
+    assert sorted(schedule.due(now=0)) == ["today", "tomorrow"]
+    schedule.mark_done("today", now=0)
+    schedule.mark_done("tomorrow", now=0)
+
+    assert schedule.due(now=59) == []
+    assert schedule.due(now=60) == ["today"]
+    assert schedule.seconds_until_next(now=30) == 30
+
+
+def test_force_makes_key_due_immediately():
+    schedule = RefreshSchedule({"today": 60})
+    schedule.mark_done("today", now=100)
+
+    schedule.force("today")
+
+    assert schedule.due(now=101) == ["today"]
+
+
+def test_non_positive_interval_rejected():
+    with pytest.raises(ValueError):
+        RefreshSchedule({"today": 0})
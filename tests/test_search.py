@@ -0,0 +1,40 @@
+from src.sitegen.search import build_search_index, search
+
+
+MATCHES = [
+    {
+        "id": 1,
+        "title": "Grand final: NAVI vs FaZe",
+        "game_name": "Counter-Strike",
+        "league_name": "ESL Pro League",
+        "tournament_name": "Playoffs",
+        "teams": [{"name": "Natus Vincere", "acronym": "NAVI"}, {"name": "FaZe Clan", "acronym": "FaZe"}],
+    },
+    {
+        "id": 2,
+        "title": "Spirit vs NAVI",
+        "game_name": "Dota 2",
+        "league_name": "DreamLeague",
+        "tournament_name": "Playoffs",
+        "teams": [{"name": "Team Spirit", "acronym": "TS"}, {"name": "Natus Vincere", "acronym": "NAVI"}],
+    },
+]
+
+
+def test_index_interns_shared_names():
+    index = build_search_index(MATCHES)
+
+    assert index["ids"] == [1, 2]
+    assert index["terms"] == sorted(index["terms"])
+    assert index["terms"].count("natus vincere") == 1
+    assert index["postings"][index["terms"].index("natus vincere")] == [0, 1]
+    assert index["postings"][index["terms"].index("playoffs")] == [0, 1]
+
+
+def test_search_matches_substrings_and_intersects_words():
+    index = build_search_index(MATCHES)
+
+    assert search(index, "vinc") == [1, 2]
+    assert search(index, "natus dota") == [2]
+    assert search(index, "  ") == [1, 2]
+    assert search(index, "valorant") == []
@@ -0,0 +1,52 @@
+import gzip
+
+import pytest
+
+from src.sitegen.sitemap import SitemapUrl, write_sitemaps
+
+
+def test_single_chunk_with_lastmod_and_gzip(tmp_path):
+    urls = [
+        SitemapUrl("https://x.test/today/", "2026-02-20T10:00:00+00:00"),
+        SitemapUrl("https://x.test/a&b/"),
+    ]
+
+    index = write_sitemaps(tmp_path, "https://x.test/", urls)
+
+    chunk = (tmp_path / "sitemap-1.xml").read_text(encoding="utf-8")
+    assert "<lastmod>2026-02-20T10:00:00+00:00</lastmod>" in chunk
+    assert "https://x.test/a&amp;b/" in chunk
+    assert gzip.decompress((tmp_path / "sitemap-1.xml.gz").read_bytes()).decode("utf-8") == chunk
+    index_xml = index.read_text(encoding="utf-8")
+    assert "<loc>https://x.test/sitemap-1.xml</loc><lastmod>2026-02-20T10:00:00+00:00</lastmod>" in index_xml
+    assert (tmp_path / "sitemap_index.xml.gz").exists()
+
+
+def test_splits_by_count_and_removes_stale_chunks(tmp_path):
+    urls = [SitemapUrl(f"https://x.test/p{i}/") for i in range(5)]
+    write_sitemaps(tmp_path, "https://x.test", urls, max_urls=2)
+    assert sorted(p.name for p in tmp_path.glob("sitemap-*.xml")) == ["sitemap-1.xml", "sitemap-2.xml", "sitemap-3.xml"]
+
+    write_sitemaps(tmp_path, "https://x.test", urls[:3], max_urls=2)
+
+    assert sorted(p.name for p in tmp_path.glob("sitemap-*.xml*")) == [
+        "sitemap-1.xml",
+        "sitemap-1.xml.gz",
+        "sitemap-2.xml",
+        "sitemap-2.xml.gz",
+    ]
+
+
+def test_splits_by_size(tmp_path):
+    urls = [SitemapUrl(f"https://x.test/{'p' * 50}{i}/") for i in range(4)]
+
+    write_sitemaps(tmp_path, "https://x.test", urls, max_bytes=300)
+
+    chunks = sorted(tmp_path.glob("sitemap-*.xml"))
+    assert len(chunks) > 1
+    assert all(len(p.read_bytes()) <= 300 for p in chunks)
+
+
+def test_rejects_unusable_limits(tmp_path):
+    with pytest.raises(ValueError):
+        write_sitemaps(tmp_path, "https://x.test", [], max_urls=0)
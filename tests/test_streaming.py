@@ -0,0 +1,34 @@
+import json
+
+import pytest
+
+from src.sitegen.streaming import coalesce, json_array_chunks, write_chunks
+
+
+def test_json_array_chunks_matches_json_dumps():
+    items = [{"id": 1, "title": "Спирит"}, {"id": 2}]
+    chunks = list(json_array_chunks(items))
+
+    assert len(chunks) == len(items) + 2
+    assert json.loads("".join(chunks)) == items
+    assert "".join(json_array_chunks([])) == "[]"
+
+
+def test_coalesce_groups_small_chunks():
+    assert list(coalesce(["ab", "cd", "e"], size=4)) == ["abcd", "e"]
+    assert list(coalesce([], size=4)) == []
+
+
+def test_write_chunks_replaces_file_only_when_complete(tmp_path):
+    out = tmp_path / "page" / "index.html"
+    assert write_chunks(out, ["<p>", "ё", "</p>"]) == len("<p>ё</p>".encode("utf-8"))
+    assert out.read_text(encoding="utf-8") == "<p>ё</p>"
+
+    def failing():
+        yield "<p>new"
+        raise RuntimeError("template error")
+
+    with pytest.raises(RuntimeError):
+        write_chunks(out, failing())
+    assert out.read_text(encoding="utf-8") == "<p>ё</p>"
+    assert sorted(p.name for p in out.parent.iterdir()) == ["index.html"]
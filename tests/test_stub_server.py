@@ -0,0 +1,33 @@
+from datetime import date
+
+from benchmarks.fixtures import rebase_to_day
+from benchmarks.stub_server import StubConfig, StubPandaScoreServer
+from src.sitegen.pandascore import PandaScoreClient
+
+
+def _source(day: date) -> list[dict]:
+    return rebase_to_day(
+        [{"id": i, "status": "finished", "begin_at": f"2020-01-01T{i % 24:02d}:00:00Z"} for i in range(250)],
+        day,
+    )
+
+
+def test_client_pages_through_stub_with_rate_limits() -> None:
+    config = StubConfig(rate_limit_every=2, retry_after_seconds=0)
+    with StubPandaScoreServer(_source, config) as server:
+        client = PandaScoreClient("token", base_url=server.base_url)
+        items = client.fetch_day(date(2026, 2, 20))
+
+    assert sorted(m["id"] for m in items) == list(range(250))
+    assert all(m["begin_at"].startswith("2026-02-20T") for m in items)
+    assert server.rate_limited_count > 0
+
+
+def test_client_follows_next_links_without_total_header() -> None:
+    config = StubConfig(send_total_header=False)
+    with StubPandaScoreServer(_source, config) as server:
+        client = PandaScoreClient("token", base_url=server.base_url)
+        items = client.fetch_day(date(2026, 2, 20))
+
+    assert len(items) == 250
+    assert server.request_count == 3
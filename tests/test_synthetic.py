@@ -0,0 +1,34 @@
+from datetime import date
+
+from benchmarks.synthetic import SyntheticDaySource, generate_day, iter_archive
+from src.sitegen.normalize import normalize_match
+
+
+def test_generate_day_is_deterministic_and_sorted() -> None:
+    first = generate_day(date(2026, 2, 20), 200)
+    second = generate_day(date(2026, 2, 20), 200)
+
+    assert first == second
+    assert [m["begin_at"] for m in first] == sorted(m["begin_at"] for m in first)
+    assert all(m["begin_at"].startswith("2026-02-20T") for m in first)
+    assert len({m["id"] for m in first}) == 200
+
+
+def test_archive_spreads_matches_over_days_with_shared_teams() -> None:
+    matches = list(iter_archive(1001, 7, date(2026, 1, 1)))
+
+    assert len(matches) == 1001
+    assert len({m["id"] for m in matches}) == 1001
+    assert len({m["begin_at"][:10] for m in matches}) == 7
+    team_ids = {o["opponent"]["id"] for m in matches for o in m["opponents"]}
+    assert len(team_ids) < 2 * len(matches)
+
+
+def test_synthetic_matches_normalize() -> None:
+    match = SyntheticDaySource(5)(date(2026, 2, 20))[0]
+    normalized = normalize_match(match)
+
+    assert normalized["id"] == match["id"]
+    assert len(normalized["teams"]) == 2
+    assert normalized["league_name"] == match["league"]["name"]
+    assert normalized["stream_url"].startswith("https://")
@@ -0,0 +1,45 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from src.sitegen.variants import Variant, parse_variants, plan_ranges
+
+
+def test_parse_variants_with_root_and_prefixed():
+    variants = parse_variants(":Europe/Moscow:ru, en:America/New_York:en")
+
+    assert variants == (
+        Variant(prefix="", tz_name="Europe/Moscow", locale="ru"),
+        Variant(prefix="en", tz_name="America/New_York", locale="en"),
+    )
+    assert variants[0].page("today") == "today"
+    assert variants[1].page("today/cs-go") == "en/today/cs-go"
+    assert variants[1].root == "/en/"
+    assert parse_variants("") == ()
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        "en:America/New_York",
+        "today:UTC:en",
+        "en:Mars/Olympus:en",
+        "en:UTC:xx",
+        "en:UTC:en,en:Asia/Tokyo:en",
+    ],
+)
+def test_parse_variants_rejects_invalid(raw):
+    with pytest.raises(ValueError):
+        parse_variants(raw)
+
+
+def test_plan_ranges_shares_one_instant_across_time_zones():
+    now = datetime(2026, 2, 20, 22, 30, tzinfo=timezone.utc)
+    variants = parse_variants(":Europe/Moscow:ru,us:America/New_York:en")
+
+    plan = {(v.prefix, dr.slug): dr for v, dr in plan_ranges(variants, "local", now)}
+
+    # Already the 21st in Moscow, still the 20th in New York.
+    assert plan[("", "today")].date_str_display == "2026-02-21"
+    assert plan[("us", "today")].date_str_display == "2026-02-20"
+    assert len(plan) == 6